@@ -0,0 +1,164 @@
+# balance_main.py
+"""
+밸런스 스윕: 봇 대 봇 헤드리스 매치를 프로세스 풀에서 대량으로 돌려
+매치별 결과를 CSV로 흘려 쓰고 코어당 처리량을 출력한다.
+
+    python balance_main.py --sweep hit_chance=0.3,0.4,0.5 --sweep capture_time=6,8 \
+        --repeats 50 --minutes 5 --workers 8 --out balance.csv
+
+--sweep 항목은 game.balance.Balance 의 필드 이름(가격/명중률/금광 금액/점령 시간 등).
+승패: 핀포인트를 잃은 쪽이 지고, 둘 다 살아 있으면 시작 때보다 늘린 타일 수로 가린다
+(시작 영토가 진영마다 달라 끝난 뒤 타일 수를 그대로 비교하면 맵 분할만 재게 된다).
+봇도 seed로 정해지므로 한 판을 다시 보려면 결과 행의 seed와 밸런스 값으로
+play_match를 다시 부르면 된다 (리플레이 파일은 남기지 않는다).
+"""
+import argparse
+import csv
+import itertools
+import os
+import time
+from multiprocessing import Pool
+
+from game.balance import Balance, DEFAULT_BALANCE
+from game.bots import ScriptedBot
+from game.match import Match, SIDES
+
+TICK_RATE = 20           # server_main.py 와 같은 고정 스텝
+THINK_INTERVAL = 1.0     # 봇이 명령을 내리는 주기(초)
+
+RESULT_FIELDS = [
+    "match", "seed", "ticks", "winner",
+    "ally_tiles", "enemy_tiles", "ally_gain", "enemy_gain", "ally_pinpoint", "enemy_pinpoint", "ally_money", "enemy_money",
+    "ally_soldiers", "enemy_soldiers", "ally_setpoints", "enemy_setpoints",
+    "wall_ms",
+]
+
+
+def count_tiles(game):
+    tiles = {side: 0 for side in SIDES}
+    for t in game.map.tiles.values():
+        tiles[t.owner] += 1
+    return tiles
+
+
+def play_match(job):
+    """job = (번호, seed, 밸런스 덮어쓰기, 시뮬레이션 초, 틱레이트, 맵 크기) → 결과 행."""
+    idx, seed, overrides, sim_seconds, tick_rate, map_size = job
+    t0 = time.perf_counter()
+    match = Match(match_id=idx, map_size=map_size, seed=seed,
+                  balance=DEFAULT_BALANCE.with_overrides(**overrides))
+    start_tiles = count_tiles(match.game)
+    bots = [ScriptedBot(side, seed=f"{seed}:{side}") for side in SIDES]
+    dt = 1.0 / tick_rate
+    think_every = max(1, round(THINK_INTERVAL * tick_rate))
+    ticks = int(sim_seconds * tick_rate)
+    for tick in range(ticks):
+        if tick % think_every == 0:
+            for bot in bots:
+                match.inputs.extend((bot.side, cmd) for cmd in bot.think(match))
+        match.step(dt)
+
+    game = match.game
+    tiles = count_tiles(game)
+    gain = {side: tiles[side] - start_tiles[side] for side in SIDES}
+    index = game.map.unit_index
+    alive = {side: index.count(side, "Pinpoint") > 0 for side in SIDES}
+    row = {"match": idx, "seed": seed, **overrides, "ticks": ticks}
+    if alive["ally"] != alive["enemy"]:
+        row["winner"] = "ally" if alive["ally"] else "enemy"
+    else:
+        row["winner"] = ("draw" if gain["ally"] == gain["enemy"]
+                         else max(SIDES, key=gain.get))
+    for side in SIDES:
+        row[f"{side}_tiles"] = tiles[side]
+        row[f"{side}_gain"] = gain[side]
+        row[f"{side}_pinpoint"] = int(alive[side])
+        row[f"{side}_money"] = game.players[side].money
+        row[f"{side}_soldiers"] = index.count(side, "Soldier")
+        row[f"{side}_setpoints"] = index.count(side, "Setpoint")
+    row["wall_ms"] = round((time.perf_counter() - t0) * 1000, 2)
+    return row
+
+
+def parse_sweep(specs):
+    """['hit_chance=0.3,0.4', ...] → [{'hit_chance': 0.3}, {'hit_chance': 0.4}, ...] (곱집합)."""
+    axes = []
+    for spec in specs:
+        name, _, values = spec.partition("=")
+        name = name.strip()
+        axes.append([(name, Balance.parse_value(name, v)) for v in values.split(",") if v.strip()])
+    return [dict(combo) for combo in itertools.product(*axes)]
+
+
+def make_jobs(configs, repeats, sim_seconds, tick_rate, map_size, base_seed):
+    idx = 0
+    for overrides in configs:
+        for _ in range(repeats):
+            yield (idx, base_seed + idx, overrides, sim_seconds, tick_rate, map_size)
+            idx += 1
+
+
+def run_sweep(configs, repeats, sim_seconds, out_path, workers=None, tick_rate=TICK_RATE,
+              map_size=6, base_seed=0):
+    workers = workers or os.cpu_count() or 1
+    sweep_keys = sorted({k for c in configs for k in c})
+    jobs = make_jobs(configs, repeats, sim_seconds, tick_rate, map_size, base_seed)
+    total = len(configs) * repeats
+
+    summary = {}   # 설정 → [승 ally, 승 enemy, 무, 매치 수]
+    t0 = time.perf_counter()
+    with open(out_path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=RESULT_FIELDS[:2] + sweep_keys + RESULT_FIELDS[2:])
+        writer.writeheader()
+        if workers == 1:
+            rows = map(play_match, jobs)
+            pool = None
+        else:
+            pool = Pool(workers)
+            rows = pool.imap_unordered(play_match, jobs, chunksize=4)
+        try:
+            for done, row in enumerate(rows, 1):
+                writer.writerow(row)
+                f.flush()
+                key = tuple((k, row.get(k)) for k in sweep_keys)
+                s = summary.setdefault(key, [0, 0, 0, 0])
+                s[{"ally": 0, "enemy": 1}.get(row["winner"], 2)] += 1
+                s[3] += 1
+                if done % 100 == 0:
+                    print(f"[BALANCE] {done}/{total}")
+        finally:
+            if pool is not None:
+                pool.close()
+                pool.join()
+    wall = time.perf_counter() - t0
+
+    rate = total / wall if wall > 0 else float("inf")
+    print(f"[BALANCE] matches={total} workers={workers} wall={wall:.1f}s "
+          f"matches/s={rate:.2f} matches/s/core={rate / workers:.2f} "
+          f"sim_speed=x{total * sim_seconds / wall / workers:.0f}/core")
+    for key, (a, e, d, n) in sorted(summary.items()):
+        label = " ".join(f"{k}={v}" for k, v in key) or "default"
+        print(f"  {label}: ally {a / n:.0%} / enemy {e / n:.0%} / draw {d / n:.0%} (n={n})")
+    return summary
+
+
+def main():
+    ap = argparse.ArgumentParser(description="봇 대 봇 밸런스 스윕")
+    ap.add_argument("--sweep", action="append", default=[], metavar="FIELD=V1,V2,...",
+                    help="game.balance.Balance 필드와 값 목록 (여러 번 지정하면 곱집합)")
+    ap.add_argument("--repeats", type=int, default=20, help="설정마다 돌릴 매치 수")
+    ap.add_argument("--minutes", type=float, default=5.0, help="매치당 시뮬레이션 시간(분)")
+    ap.add_argument("--workers", type=int, default=None, help="프로세스 수 (기본: CPU 수)")
+    ap.add_argument("--tick-rate", type=int, default=TICK_RATE)
+    ap.add_argument("--map-size", type=int, default=6)
+    ap.add_argument("--seed", type=int, default=0, help="첫 매치 seed (이후 +1씩)")
+    ap.add_argument("--out", default="balance.csv")
+    args = ap.parse_args()
+
+    configs = parse_sweep(args.sweep)
+    run_sweep(configs, args.repeats, args.minutes * 60, args.out, args.workers,
+              args.tick_rate, args.map_size, args.seed)
+
+
+if __name__ == "__main__":
+    main()
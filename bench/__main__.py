@@ -0,0 +1,311 @@
+# bench/__main__.py
+"""
+헤드리스 벤치마크 모음. 결과는 JSON으로 저장해 커밋 사이에 비교한다.
+  python -m bench [--suites tick bfs fire map codec render] [--radii 6 20 50 100]
+                  [--densities 0.05 0.2] [--out bench.json] [--compare old.json]
+
+  tick    Game.update_systems 초당 틱 수 (dt=0.05, 셋포인트 포함),
+          Game.moves.update 초당 틱 수 (아군 병 전부가 무작위 적 타일로 동시 진격)
+  bfs     rules.bfs_path / Game.paths A*(캐시 미스) / D* Lite 재계획 지연 (빈 타일 쌍 무작위)
+  fire    셋포인트 10/100/1000개 한 번 포격(Game.fire.volley) 지연 (피해 0으로 배치 고정)
+  map     HexMap / CompactHexMap 생성 시간
+  codec   pickle / JSON / net_codec 바이너리 인코딩·디코딩 (bench.codec)
+  render  세 프런트엔드 오프스크린 프레임 시간 (bench.render)
+
+각 결과 행은 (suite, case, radius, density)로 식별되며 --compare는 같은 키끼리
+주요 지표의 비율(새/이전)을 출력한다.
+"""
+import argparse
+import json
+import platform
+import random
+import subprocess
+import time
+
+from bench.codec import populate
+from game.balance import DEFAULT_BALANCE
+from game.compact_map import CompactHexMap
+from game.game_logic import Game
+from game.hex_map import HexMap
+from game.pathfinding import PathService
+from game.rules import bfs_path
+from game.unit import create_setpoint, create_soldier
+
+SUITES = ("tick", "bfs", "fire", "map", "codec", "render")
+DT = 0.05                  # server_main.py TICK_RATE=20 과 같은 틱 간격
+SETPOINT_SHARE = 0.1       # 배치한 유닛 중 셋포인트 비율 (포격 경로 포함)
+FIRE_BATTERIES = (10, 100, 1000)
+
+# 결과 비교에 쓰는 지표와 방향 (True = 클수록 좋음)
+METRICS = {
+    "ticks_per_s": True,
+    "p50_ms": False,
+    "build_ms": False,
+    "encode_ms": False,
+    "decode_ms": False,
+}
+
+
+def _pct(sorted_values, p):
+    return sorted_values[min(len(sorted_values) - 1, int(len(sorted_values) * p / 100))]
+
+
+def _latency_row(times):
+    times = sorted(times)
+    return {
+        "n": len(times),
+        "p50_ms": round(_pct(times, 50) * 1000, 4),
+        "p95_ms": round(_pct(times, 95) * 1000, 4),
+        "max_ms": round(times[-1] * 1000, 4),
+    }
+
+
+def make_game(radius, density, seed=0):
+    """시드 고정 게임 + 병(density) 배치, 그중 일부를 셋포인트로 바꾼다."""
+    game = populate(Game(map_size=radius, seed=seed), density, seed)
+    rng = random.Random(seed)
+    for t in list(game.map.unit_index.tiles_of_name("Soldier")):
+        if rng.random() < SETPOINT_SHARE:
+            owner = t.unit.owner
+            t.remove_unit()
+            t.place_unit(create_setpoint(owner))
+    return game
+
+
+# -------------------------------------------------
+# suites
+# -------------------------------------------------
+def bench_tick(radius, density, seconds=1.0, seed=0):
+    game = make_game(radius, density, seed)
+    for _ in range(20):                 # 예열 (첫 채굴 예약 등)
+        game.update_systems(DT)
+    ticks = 0
+    t0 = time.perf_counter()
+    deadline = t0 + seconds
+    while True:
+        for _ in range(20):
+            game.update_systems(DT)
+        ticks += 20
+        now = time.perf_counter()
+        if now >= deadline:
+            break
+    wall = now - t0
+    rows = [{"case": "update_systems", "ticks": ticks,
+             "ticks_per_s": round(ticks / wall, 1),
+             "us_per_tick": round(wall / ticks * 1e6, 2)}]
+
+    game = make_game(radius, density, seed)
+    rng = random.Random(seed)
+    targets = [t for t in game.map.tiles.values() if t.owner == "enemy" and t.unit is None]
+    for t in list(game.map.unit_index.tiles_of_name("Soldier")):
+        if t.unit.owner == "ally" and targets:
+            path = game.paths.find_path(t, targets.pop(rng.randrange(len(targets))))
+            if path:
+                game.moves.start(t.unit, path)
+    marching = len(game.moves)
+    ticks = 0
+    t0 = time.perf_counter()
+    while True:
+        game.moves.update(DT)
+        ticks += 1
+        now = time.perf_counter()
+        if now >= t0 + seconds or not game.moves:
+            break
+    wall = now - t0
+    rows.append({"case": "moves", "marching": marching, "ticks": ticks,
+                 "ticks_per_s": round(ticks / wall, 1),
+                 "us_per_tick": round(wall / ticks * 1e6, 2)})
+    return rows
+
+
+def bench_bfs(radius, density, queries=50, seed=0):
+    game = make_game(radius, density, seed)
+    rng = random.Random(seed)
+    empty = [t for t in game.map.tiles.values() if t.unit is None]
+    pairs = [rng.sample(empty, 2) for _ in range(queries)]
+    paths = PathService(game.map, cache_size=0)     # 매 요청 캐시 미스
+
+    def timed(fn, *args):
+        t0 = time.perf_counter()
+        out = fn(*args)
+        return out, time.perf_counter() - t0
+
+    def replan(a, b):
+        # 경로 중간 칸을 막은 뒤 우회 경로 재계획 (계획 생성 시간은 제외)
+        path = paths.find_path(a, b)
+        if path is None or len(path) < 4:
+            return timed(paths.find_path, a, b)
+        planner = paths.replanner(a, b)
+        block = path[len(path) // 2]
+        block.place_unit(create_soldier("enemy"))
+        try:
+            return timed(planner.path_from, a)
+        finally:
+            block.remove_unit()
+
+    rows = []
+    for case, fn in (("bfs_path", lambda a, b: timed(bfs_path, game, a, b)),
+                     ("astar", lambda a, b: timed(paths.find_path, a, b)),
+                     ("dstar_replan", replan)):
+        times = []
+        found = 0
+        for a, b in pairs:
+            path, elapsed = fn(a, b)
+            times.append(elapsed)
+            found += path is not None
+        rows.append({"case": case, **_latency_row(times), "found": found})
+    return rows
+
+
+def bench_fire(radius, density, volleys=20, seed=0):
+    # 피해 0: 병이 죽지 않으므로 매 포격의 조준 부하가 같다 (난수 소비/명중 처리는 그대로)
+    balance = DEFAULT_BALANCE.with_overrides(shot_damage=0)
+    rows = []
+    for n in FIRE_BATTERIES:
+        game = populate(Game(map_size=radius, seed=seed, balance=balance), density, seed)
+        rng = random.Random(seed)
+        empty = [t for t in game.map.tiles.values() if t.unit is None]
+        if len(empty) < n:
+            continue
+        for k, t in enumerate(rng.sample(empty, n)):
+            t.place_unit(create_setpoint("ally" if k % 2 else "enemy"))
+        times = []
+        hits = 0
+        for _ in range(volleys):
+            t0 = time.perf_counter()
+            hits += len(game.fire.volley())
+            times.append(time.perf_counter() - t0)
+        # 첫 포격은 사거리 마스크를 만드는 시간이 포함된다
+        rows.append({"case": f"volley_{n}", "first_ms": round(times[0] * 1000, 3),
+                     **_latency_row(times[1:]), "hits": hits})
+    return rows
+
+
+def bench_map(radius, density, repeat=3, seed=0):
+    rows = []
+    for name, cls in (("HexMap", HexMap), ("CompactHexMap", CompactHexMap)):
+        best = float("inf")
+        for i in range(repeat):
+            t0 = time.perf_counter()
+            m = cls(radius, rng=random.Random(seed + i))
+            best = min(best, time.perf_counter() - t0)
+        rows.append({"case": name, "tiles": len(m.tiles), "build_ms": round(best * 1000, 3)})
+    return rows
+
+
+def bench_codec(radius, density, repeat=5, seed=0):
+    from bench import codec
+    rows = []
+    for row in codec.run((radius,), repeat, density):
+        row.pop("radius")
+        row["encode_ms"] = round(row["encode_ms"], 4)
+        row["decode_ms"] = round(row["decode_ms"], 4)
+        rows.append({"case": row.pop("codec"), **row})
+    return rows
+
+
+def bench_render(radius, density, frames=None, seed=0):
+    from bench import render
+    # 큰 맵은 전체 다시 그리기가 프레임당 수백 ms라 프레임 수를 줄인다
+    frames = frames or (120 if radius <= 20 else 30)
+    rows = []
+    for name in render.RENDERERS:
+        game = make_game(radius, density, seed)
+        times = render.frame_times(name, game, frames)
+        rows.append({"case": name, "first_ms": round(times[0] * 1000, 3), **_latency_row(times[1:])})
+    return rows
+
+
+BENCHES = {
+    "tick": bench_tick,
+    "bfs": bench_bfs,
+    "fire": bench_fire,
+    "map": bench_map,
+    "codec": bench_codec,
+    "render": bench_render,
+}
+# 유닛 밀도와 무관한 항목은 밀도마다 반복하지 않는다
+DENSITY_FREE = {"map"}
+
+
+def run(suites=SUITES, radii=(6, 20, 50, 100), densities=(0.05, 0.2), log=print):
+    results = []
+    for suite in suites:
+        for radius in radii:
+            for density in ((None,) if suite in DENSITY_FREE else densities):
+                t0 = time.perf_counter()
+                for row in BENCHES[suite](radius, density):
+                    row = {"suite": suite, "radius": radius, "density": density, **row}
+                    results.append(row)
+                    log(_format(row))
+                log(f"  ({suite} r={radius} d={density}: {time.perf_counter() - t0:.1f}s)")
+    return results
+
+
+def _format(row):
+    skip = ("suite", "case", "radius", "density")
+    rest = " ".join(f"{k}={v}" for k, v in row.items() if k not in skip)
+    return f"[BENCH] {row['suite']:<6} {row['case']:<14} r={row['radius']:<3} d={row['density']} {rest}"
+
+
+def _key(row):
+    return row["suite"], row["case"], row["radius"], row["density"]
+
+
+def compare(old_results, new_results):
+    """같은 키의 행끼리 지표 비율(새/이전)을 출력. 나빠진 항목에는 '!'."""
+    old = {_key(r): r for r in old_results}
+    for row in new_results:
+        prev = old.get(_key(row))
+        if prev is None:
+            continue
+        for metric, higher_better in METRICS.items():
+            if metric in row and prev.get(metric):
+                ratio = row[metric] / prev[metric]
+                worse = ratio < 0.9 if higher_better else ratio > 1.1
+                print(f"{'!' if worse else ' '} {row['suite']} {row['case']} r={row['radius']} "
+                      f"d={row['density']} {metric}: {prev[metric]} → {row[metric]} (x{ratio:.2f})")
+
+
+def _git_commit():
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"],
+                             capture_output=True, text=True, timeout=10)
+        return out.stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def main():
+    ap = argparse.ArgumentParser(description="헤드리스 벤치마크 모음")
+    ap.add_argument("--suites", nargs="+", choices=SUITES, default=list(SUITES))
+    ap.add_argument("--radii", type=int, nargs="+", default=[6, 20, 50, 100])
+    ap.add_argument("--densities", type=float, nargs="+", default=[0.05, 0.2],
+                    help="병 유닛을 둘 타일 비율")
+    ap.add_argument("--out", default="bench.json", help="결과 JSON 경로")
+    ap.add_argument("--compare", metavar="OLD_JSON", help="이전 결과와 지표 비교")
+    args = ap.parse_args()
+
+    t0 = time.perf_counter()
+    results = run(args.suites, args.radii, args.densities)
+    doc = {
+        "meta": {
+            "commit": _git_commit(),
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "wall_s": round(time.perf_counter() - t0, 1),
+        },
+        "results": results,
+    }
+    with open(args.out, "w", encoding="utf-8") as f:
+        json.dump(doc, f, ensure_ascii=False, indent=1)
+    print(f"[BENCH] {len(results)} rows → {args.out}")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            compare(json.load(f)["results"], results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+# bench/codec.py
+"""
+상태 직렬화 비교: pickle vs JSON(state 레코드) vs net_codec 바이너리.
+  python -m bench.codec [--radii 6 20 50] [--repeat 20]
+"""
+import argparse
+import json
+import pickle
+import random
+import time
+
+from game.game_logic import Game
+from game.unit import create_soldier
+from net_codec import encode_game, decode_game, game_to_state
+
+
+def populate(game, density=0.1, seed=1):
+    """빈 타일 중 density 비율에 병 유닛을 흩어 놓는다."""
+    rng = random.Random(seed)
+    for t in game.map.tiles.values():
+        if t.unit is None and rng.random() < density:
+            t.place_unit(create_soldier(rng.choice(("ally", "enemy"))))
+    return game
+
+
+def _time(fn, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def run(radii=(6, 20, 50), repeat=20, density=0.1):
+    rows = []
+    for radius in radii:
+        game = populate(Game(map_size=radius), density)
+        codecs = {
+            "pickle": (lambda: pickle.dumps(game, protocol=pickle.HIGHEST_PROTOCOL), pickle.loads),
+            "json": (lambda: json.dumps(game_to_state(game), separators=(",", ":")).encode(), json.loads),
+            "binary": (lambda: encode_game(game), decode_game),
+        }
+        for name, (enc, dec) in codecs.items():
+            payload = enc()
+            rows.append({
+                "radius": radius,
+                "tiles": len(game.map.tiles),
+                "codec": name,
+                "bytes": len(payload),
+                "encode_ms": _time(enc, repeat) * 1000,
+                "decode_ms": _time(lambda: dec(payload), repeat) * 1000,
+            })
+    return rows
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument("--radii", type=int, nargs="+", default=[6, 20, 50])
+    ap.add_argument("--repeat", type=int, default=20)
+    ap.add_argument("--density", type=float, default=0.1)
+    args = ap.parse_args()
+
+    print(f"{'radius':>6} {'tiles':>6} {'codec':>7} {'bytes':>9} {'enc ms':>8} {'dec ms':>8}")
+    for row in run(args.radii, args.repeat, args.density):
+        print(f"{row['radius']:>6} {row['tiles']:>6} {row['codec']:>7} {row['bytes']:>9} "
+              f"{row['encode_ms']:>8.3f} {row['decode_ms']:>8.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,344 @@
+# bench/load.py
+"""
+헤드리스 봇 클라이언트 N개로 서버 부하 측정 (전부 localhost).
+  python -m bench.load [--clients 20 50 100 200] [--rate 1.0] [--seconds 10]
+                       [--mix purchase=3 place=3 move=3 recall=1] [--out load.json]
+
+단계마다 server_main.py --asyncio 를 새 프로세스로 띄우고 (서버 = 코어 1개),
+client_main과 같은 프로토콜(state/delta + ack)로 N개를 붙인다. 각 봇은 받은 state로
+자기 진영을 보고 purchase/place/move/recall 입력을 --rate(초당)로 섞어 보낸다.
+
+  입력→state 지연  입력 cmd에 seq를 붙이고, 서버가 그 입력을 적용한 뒤 보낸 state의
+                   input_seq(진영별 마지막 적용 번호)로 받은 시각까지를 잰다
+  바이트           봇이 보낸/받은 바이트 합
+  서버 틱          측정 구간 시작/끝에 stats 메시지로 받은 틱 수와 백분위수
+
+서버가 목표 틱 속도의 95% 이상을 내고 frame p99가 틱 간격 안이면 "유지"로 보고,
+유지된 가장 큰 N을 코어당 최대 동시 접속으로 보고한다.
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import time
+
+from net_common import decode_line, encode_json, read_line
+from net_delta import DeltaState
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_MIX = {"purchase": 3, "place": 3, "move": 3, "recall": 1}
+LATENCY_BUCKETS_MS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000)
+SUSTAIN_RATE = 0.95        # 목표 틱 속도 대비 이 비율 이상이면 유지
+CONNECT_SPACING = 0.005    # 접속 간격(초) (accept 큐 넘침 방지)
+
+
+# =========================================================
+# 지연 히스토그램
+# =========================================================
+class Histogram:
+    def __init__(self, bounds=LATENCY_BUCKETS_MS):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)     # 마지막 칸 = 최대 경계 초과
+        self.samples = []
+
+    def add(self, ms):
+        self.samples.append(ms)
+        for k, bound in enumerate(self.bounds):
+            if ms <= bound:
+                self.counts[k] += 1
+                return
+        self.counts[-1] += 1
+
+    def merge(self, other):
+        self.samples.extend(other.samples)
+        self.counts = [a + b for a, b in zip(self.counts, other.counts)]
+
+    def percentile(self, p):
+        if not self.samples:
+            return 0.0
+        data = sorted(self.samples)
+        return data[min(len(data) - 1, int(len(data) * p / 100))]
+
+    def row(self):
+        labels = [f"<={b}" for b in self.bounds] + [f">{self.bounds[-1]}"]
+        return {
+            "n": len(self.samples),
+            "p50_ms": round(self.percentile(50), 2),
+            "p95_ms": round(self.percentile(95), 2),
+            "p99_ms": round(self.percentile(99), 2),
+            "buckets": dict(zip(labels, self.counts)),
+        }
+
+
+# =========================================================
+# 봇 클라이언트
+# =========================================================
+class LoadBot:
+    """client_main 대역. 받은 state(DeltaState)만 보고 무작위 입력을 만든다."""
+
+    def __init__(self, rate, mix, seed):
+        self.rate = rate
+        self.kinds = list(mix)
+        self.weights = [mix[k] for k in self.kinds]
+        self.rng = random.Random(seed)
+        self.state = DeltaState()
+        self.side = None
+        self.seq = 0
+        self.sent_at = {}          # seq → 보낸 시각
+        self.latency = Histogram()
+        self.bytes_in = 0
+        self.bytes_out = 0
+        self.inputs = 0
+        self.states = 0
+        self.stats_replies = []
+        self.writer = None
+
+    def send(self, data):
+        msg = encode_json(data)
+        self.bytes_out += len(msg)
+        self.writer.write(msg)
+
+    # ---- 수신 ----
+    def on_message(self, data):
+        kind = data.get("type")
+        if kind == "hello":
+            self.side = data.get("side")
+        elif kind in ("state", "delta"):
+            self.states += 1
+            if not self.state.apply(data):
+                self.send({"type": "resync"})
+                return
+            self.send({"type": "ack", "version": self.state.version})
+            seq = data.get("input_seq")
+            if seq is not None and self.sent_at:
+                now = time.perf_counter()
+                for s in [s for s in self.sent_at if s <= seq]:
+                    self.latency.add((now - self.sent_at.pop(s)) * 1000)
+        elif kind == "stats":
+            self.stats_replies.append(data)
+
+    # ---- 입력 ----
+    def _own(self):
+        tiles = self.state.tiles.values()
+        mine = [t for t in tiles if t.get("owner") == self.side]
+        return tiles, mine
+
+    def make_cmd(self):
+        tiles, mine = self._own()
+        kind = self.rng.choices(self.kinds, self.weights)[0]
+        reserve = self.state.players.get(self.side, {}).get("reserve", {})
+        rng = self.rng
+        if kind == "place":
+            ready = [t for t, n in reserve.items() if n > 0]
+            empty = [t for t in mine if "unit" not in t]
+            if ready and empty:
+                t = rng.choice(empty)
+                return {"kind": "place", "unit_type": rng.choice(ready), "q": t["q"], "r": t["r"]}
+        elif kind == "move":
+            soldiers = [t for t in mine if t.get("unit", {}).get("name") == "Soldier"]
+            targets = [t for t in tiles if t.get("owner") not in (None, self.side) and "unit" not in t]
+            if soldiers and targets:
+                src = rng.choice(soldiers)
+                dst = min(rng.sample(targets, min(5, len(targets))),
+                          key=lambda t: abs(t["q"] - src["q"]) + abs(t["r"] - src["r"]))
+                return {"kind": "move", "from": [src["q"], src["r"]], "to": [dst["q"], dst["r"]]}
+        elif kind == "recall":
+            units = [t for t in mine if "unit" in t and not t["unit"].get("is_pinpoint")]
+            if units:
+                t = rng.choice(units)
+                return {"kind": "recall", "q": t["q"], "r": t["r"]}
+        return {"kind": "purchase", "unit_type": rng.choice(("soldier", "soldier", "soldier", "setpoint"))}
+
+    async def input_loop(self):
+        while True:
+            await asyncio.sleep(self.rng.expovariate(self.rate))
+            if self.side is None or self.state.version is None:
+                continue
+            self.seq += 1
+            cmd = self.make_cmd()
+            cmd["seq"] = self.seq
+            self.sent_at[self.seq] = time.perf_counter()
+            self.inputs += 1
+            self.send({"type": "input", "cmd": cmd})
+
+    async def run(self, port):
+        reader, self.writer = await asyncio.open_connection("127.0.0.1", port)
+        self.writer.get_extra_info("socket").setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        inputs = asyncio.create_task(self.input_loop())
+        try:
+            while True:
+                line = await read_line(reader)
+                if line is None:
+                    break
+                self.bytes_in += len(line)
+                data = decode_line(line)
+                if data is not None:
+                    self.on_message(data)
+        except (ConnectionError, OSError):
+            pass
+        finally:
+            inputs.cancel()
+            self.writer.close()
+
+
+# =========================================================
+# 서버 프로세스 / 단계 실행
+# =========================================================
+def _free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+async def _wait_port(port, timeout=10.0):
+    end = time.perf_counter() + timeout
+    while time.perf_counter() < end:
+        try:
+            _, w = await asyncio.open_connection("127.0.0.1", port)
+            w.close()
+            return
+        except OSError:
+            await asyncio.sleep(0.05)
+    raise RuntimeError(f"서버가 {port} 포트에서 응답하지 않습니다")
+
+
+async def _query_stats(bot, timeout=5.0):
+    n = len(bot.stats_replies)
+    bot.send({"type": "stats"})
+    end = time.perf_counter() + timeout
+    while len(bot.stats_replies) == n and time.perf_counter() < end:
+        await asyncio.sleep(0.01)
+    return bot.stats_replies[-1] if len(bot.stats_replies) > n else None
+
+
+async def _stage(port, n_clients, rate, mix, seconds, warmup):
+    bots = [LoadBot(rate, mix, seed=i) for i in range(n_clients)]
+    tasks = []
+    for bot in bots:
+        tasks.append(asyncio.create_task(bot.run(port)))
+        await asyncio.sleep(CONNECT_SPACING)
+    await asyncio.sleep(warmup)
+    for bot in bots:       # 워밍업 구간 측정치는 버린다
+        bot.latency = Histogram()
+        bot.bytes_in = bot.bytes_out = bot.inputs = bot.states = 0
+    cpu0 = time.process_time()
+    t0 = time.perf_counter()
+    start = await _query_stats(bots[0])
+    await asyncio.sleep(seconds)
+    end = await _query_stats(bots[0])
+    elapsed = time.perf_counter() - t0
+    cpu = time.process_time() - cpu0
+    for t in tasks:
+        t.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+    return bots, start, end, elapsed, cpu
+
+
+def run_stage(n_clients, rate=1.0, mix=None, seconds=10.0, warmup=2.0, map_size=6, fog=True):
+    port = _free_port()
+    cmd = [sys.executable, os.path.join(ROOT, "server_main.py"), "--asyncio",
+           "--port", str(port), "--map-size", str(map_size)]
+    if not fog:
+        cmd.append("--no-fog")
+    server = subprocess.Popen(cmd, cwd=ROOT, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        async def main():
+            await _wait_port(port)
+            return await _stage(port, n_clients, rate, mix or DEFAULT_MIX, seconds, warmup)
+        bots, start, end, elapsed, cpu = asyncio.run(main())
+    finally:
+        server.terminate()
+        server.wait()
+
+    latency = Histogram()
+    for bot in bots:
+        latency.merge(bot.latency)
+    row = {
+        "clients": n_clients,
+        "connected": sum(1 for b in bots if b.side is not None),
+        "rate": rate,
+        "seconds": round(elapsed, 2),
+        "inputs": sum(b.inputs for b in bots),
+        "states": sum(b.states for b in bots),
+        "bytes_in": sum(b.bytes_in for b in bots),
+        "bytes_out": sum(b.bytes_out for b in bots),
+        "latency": latency.row(),
+        "generator_cpu": round(cpu / elapsed, 2),    # 부하 생성기 자체 CPU 점유 (1.0 = 한 코어)
+    }
+    if start is not None and end is not None:
+        tick_rate = (end["frames"] - start["frames"]) / elapsed
+        row["server"] = {
+            "matches": end["matches"],
+            "ticks_per_s": round(tick_rate, 2),
+            "tick_rate": end["tick_rate"],
+            "match_tick_ms": end["match_tick_ms"],
+            "frame_ms": end["frame_ms"],
+        }
+        row["sustained"] = (tick_rate >= SUSTAIN_RATE * end["tick_rate"]
+                            and end["frame_ms"]["p99"] <= 1000.0 / end["tick_rate"])
+    else:
+        row["sustained"] = False
+    return row
+
+
+def _print_row(row):
+    lat = row["latency"]
+    srv = row.get("server", {})
+    kb = 1024
+    print(f"clients={row['clients']:4d} connected={row['connected']:4d} "
+          f"inputs={row['inputs']} states={row['states']} "
+          f"in={row['bytes_in'] / kb / row['seconds']:.0f}KB/s out={row['bytes_out'] / kb / row['seconds']:.1f}KB/s "
+          f"rtt p50={lat['p50_ms']}ms p95={lat['p95_ms']}ms p99={lat['p99_ms']}ms")
+    if srv:
+        print(f"  server ticks/s={srv['ticks_per_s']}/{srv['tick_rate']} matches={srv['matches']} "
+              f"frame p50={srv['frame_ms']['p50']}ms p99={srv['frame_ms']['p99']}ms "
+              f"match_tick p99={srv['match_tick_ms']['p99']}ms "
+              f"generator_cpu={row['generator_cpu']} {'유지' if row['sustained'] else '초과'}")
+    print(f"  rtt 분포: {lat['buckets']}")
+
+
+def _parse_mix(items):
+    mix = {}
+    for item in items:
+        kind, _, weight = item.partition("=")
+        if kind not in DEFAULT_MIX:
+            raise ValueError(f"알 수 없는 입력 종류: {kind}")
+        mix[kind] = float(weight or 1)
+    return mix
+
+
+def main():
+    ap = argparse.ArgumentParser(description="봇 클라이언트 N개로 서버 부하 측정")
+    ap.add_argument("--clients", type=int, nargs="+", default=[20, 50, 100, 200])
+    ap.add_argument("--rate", type=float, default=1.0, help="봇당 초당 입력 수")
+    ap.add_argument("--mix", nargs="+", default=None, help="입력 비율 (예: purchase=3 move=5)")
+    ap.add_argument("--seconds", type=float, default=10.0)
+    ap.add_argument("--warmup", type=float, default=2.0)
+    ap.add_argument("--map-size", type=int, default=6)
+    ap.add_argument("--no-fog", action="store_true")
+    ap.add_argument("--out", default=None, help="결과 JSON 저장 경로")
+    args = ap.parse_args()
+    mix = _parse_mix(args.mix) if args.mix else DEFAULT_MIX
+
+    rows = []
+    for n in args.clients:
+        row = run_stage(n, args.rate, mix, args.seconds, args.warmup, args.map_size, fog=not args.no_fog)
+        _print_row(row)
+        rows.append(row)
+    sustained = [r["clients"] for r in rows if r["sustained"]]
+    best = max(sustained) if sustained else 0
+    print(f"[LOAD] cpus={os.cpu_count()} 코어당 최대 유지 접속 = {best} "
+          f"(서버 1프로세스 = 1코어, 측정한 단계 {args.clients})")
+    if rows and rows[-1]["sustained"]:
+        print("[LOAD] 마지막 단계까지 유지됨 – 더 큰 --clients로 다시 재면 상한을 찾을 수 있다")
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump({"clients_per_core": best, "rows": rows}, f, ensure_ascii=False, indent=1)
+
+
+if __name__ == "__main__":
+    main()
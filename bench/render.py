@@ -0,0 +1,89 @@
+# bench/render.py
+"""
+세 프런트엔드의 오프스크린 프레임 시간 (SDL dummy 드라이버, 창 없음).
+  visual      visual_main.MapRenderer (정적 레이어 + 더티 렉트)
+  client      client.GameClient.draw_game/draw_hud (바이너리 스냅샷)
+  client_main client_main.draw_frame (state 딕셔너리)
+"""
+import os
+import time
+from collections import deque
+
+RENDERERS = ("visual", "client", "client_main")
+
+
+def _setup_visual(game):
+    import pygame
+    import visual_main as vm
+    from game.geometry import HexLayout
+
+    screen = pygame.display.set_mode((vm.SCREEN_WIDTH, vm.SCREEN_HEIGHT))
+    renderer = vm.MapRenderer(screen, HexLayout(vm.HEX_SIZE, vm.MAP_ORIGIN, radius=game.map.size),
+                              vm.load_korean_font(22), vm.load_korean_font(18))
+    tiles = list(game.map.tiles.values())
+    capture_states = {(t.q, t.r): {"owner": t.unit.owner, "remain": game.balance.capture_time}
+                      for t in game.map.unit_index.tiles_of_name("Soldier")
+                      if t.unit.owner != t.owner}
+    toasts = deque([(f"toast {i}", 0, i % 2 == 0) for i in range(6)], maxlen=6)
+
+    def frame(i):
+        for state in capture_states.values():
+            state["remain"] = max(0.0, state["remain"] - 1.0 / vm.FPS)
+        lines = [f"frame {i}", f"ALLY MONEY: {game.players['ally'].money}"]
+        renderer.draw(game, capture_states, tiles[i % len(tiles)], None, lines, toasts, vm.HUD_PANEL_SIZE)
+    return frame
+
+
+def _setup_client(game):
+    import pygame
+    import client
+    from net_codec import decode_game, encode_game
+
+    gc = client.GameClient()
+    gc.game = decode_game(encode_game(game))
+    tiles = list(gc.game.map.tiles.values())
+
+    def frame(i):
+        gc.selected_tile = tiles[i % len(tiles)]
+        gc.screen.fill(client.COLOR_BG)
+        gc.draw_game(1.0 / client.FPS)
+        gc.draw_hud()
+        gc.draw_info_overlay()
+        pygame.display.flip()
+    return frame
+
+
+def _setup_client_main(game):
+    import pygame
+    import client_main as cm
+    from net_codec import game_to_state
+
+    screen = pygame.display.set_mode((cm.LOGICAL_W, cm.LOGICAL_H))
+    font, font_small = pygame.font.SysFont("malgungothic", 20), pygame.font.SysFont("malgungothic", 16)
+    state = game_to_state(game)
+    coords = [(t["q"], t["r"]) for t in state["tiles"]]
+
+    def frame(i):
+        cm.draw_frame(screen, font, font_small, state, "ally", coords[i % len(coords)])
+        pygame.display.flip()
+    return frame
+
+
+_SETUP = {"visual": _setup_visual, "client": _setup_client, "client_main": _setup_client_main}
+
+
+def frame_times(name, game, frames=120):
+    """renderer 이름 → 프레임별 소요 시간(초) 목록. 첫 프레임(굽기/캐시 채우기)도 포함."""
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    import pygame
+    pygame.init()
+    try:
+        frame = _SETUP[name](game)
+        times = []
+        for i in range(frames):
+            t0 = time.perf_counter()
+            frame(i)
+            times.append(time.perf_counter() - t0)
+        return times
+    finally:
+        pygame.quit()
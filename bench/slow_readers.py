@@ -0,0 +1,180 @@
+# bench/slow_readers.py
+"""
+느린 클라이언트가 섞여 있을 때 서버 틱 시간 비교 (localhost, 네트워크 실제 사용).
+  python -m bench.slow_readers [--matches 4] [--slow 2] [--delay 0.5] [--seconds 10]
+                               [--transports thread asyncio]
+
+매치마다 두 진영에 client_main 대역을 붙이고 (ack 프로토콜 동일), 그중 --slow 개는
+메시지 하나를 읽을 때마다 --delay 초씩 쉬며 수신 버퍼도 작게 잡는다. localhost는
+커널 버퍼가 커서 밀림이 드러나지 않으므로 서버 쪽 송신 버퍼도 작게 잡는다 (좁은 회선 흉내).
+  thread   기존 스레드 서버: 틱 스레드가 sendall로 직접 보내므로 느린 클라이언트에 막힌다
+  asyncio  Outbox 송신 큐: 틱은 넣기만 하고, 느린 클라이언트는 최신 state만 받는다
+"""
+import argparse
+import asyncio
+import socket
+import threading
+import time
+
+import server_main
+from net_common import encode_json, read_json
+
+SLOW_RCVBUF = 4096
+SERVER_SNDBUF = 4096
+
+
+class ReaderStats:
+    def __init__(self, slow):
+        self.slow = slow
+        self.messages = 0
+        self.bytes_in = 0
+        self.last_tick = 0
+
+
+async def stand_in(port, stats, delay, stop):
+    """client_main 대역: state/delta를 읽고 ack만 보낸다 (delay > 0이면 느린 클라이언트)."""
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    if delay > 0:
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, SLOW_RCVBUF)
+    sock.setblocking(False)
+    await asyncio.get_running_loop().sock_connect(sock, ("127.0.0.1", port))
+    # 느린 클라이언트는 스트림 버퍼도 작게 (미리 읽어 두지 않고 실제로 밀리도록)
+    reader, writer = await asyncio.open_connection(sock=sock, limit=SLOW_RCVBUF if delay > 0 else 2 ** 16)
+    try:
+        while not stop.is_set():
+            data = await read_json(reader)
+            if data is None:
+                break
+            stats.messages += 1
+            kind = data.get("type")
+            if kind in ("state", "delta"):
+                stats.last_tick = data.get("tick", data.get("state", {}).get("tick", 0))
+                writer.write(encode_json({"type": "ack", "version": data["version"]}))
+                await writer.drain()
+            if delay > 0:
+                await asyncio.sleep(delay)
+    except (ConnectionError, OSError):
+        pass
+    finally:
+        writer.close()
+
+
+def _accept_thread(host, listener):
+    """server_main.accept_thread_main과 같되 송신 버퍼를 작게."""
+    while host.running:
+        try:
+            sock, addr = listener.accept()
+        except OSError:
+            break
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, SERVER_SNDBUF)
+        conn = host.join(sock, addr)
+        conn.send({"type": "hello", "side": conn.side, "match": conn.match.match_id})
+        threading.Thread(target=server_main.client_thread_main, args=(host, conn), daemon=True).start()
+
+
+def _seed_when_joined(host, n_matches):
+    with host.lock:
+        matches = list(host.matches)
+    for m in matches[:n_matches]:
+        server_main.seed_bench_inputs(m)
+
+
+async def _run_asyncio(host, n_clients, n_slow, delay, seconds):
+    def accept(reader, writer):
+        writer.get_extra_info("socket").setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, SERVER_SNDBUF)
+        return server_main.handle_async_client(host, reader, writer)
+
+    server = await asyncio.start_server(accept, "127.0.0.1", 0)
+    port = server.sockets[0].getsockname()[1]
+    stop = asyncio.Event()
+    stats = [ReaderStats(i < n_slow) for i in range(n_clients)]
+    tasks = []
+    for s in stats:
+        tasks.append(asyncio.create_task(stand_in(port, s, delay if s.slow else 0.0, stop)))
+        await asyncio.sleep(0.01)
+    _seed_when_joined(host, n_clients // 2)
+    await host.run_async(seconds, report_interval=seconds + 1)
+    stop.set()
+    server.close()
+    with host.lock:
+        conns = [c for cs in host.clients.values() for c in cs]
+        ticks = max((m.tick for m in host.matches), default=0)   # 연결이 끊기면 매치가 내려가므로 먼저
+    skipped = sum(c.outbox.states_skipped for c in conns)
+    for c in conns:
+        c.close()
+    for t in tasks:
+        t.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+    await asyncio.sleep(0.1)     # 서버 쪽 연결 태스크가 EOF를 보고 끝나도록
+    return stats, skipped, ticks
+
+
+async def _run_thread(host, n_clients, n_slow, delay, seconds):
+    listener = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    listener.bind(("127.0.0.1", 0))
+    listener.listen()
+    port = listener.getsockname()[1]
+    threading.Thread(target=_accept_thread, args=(host, listener), daemon=True).start()
+    stop = asyncio.Event()
+    stats = [ReaderStats(i < n_slow) for i in range(n_clients)]
+    tasks = []
+    for s in stats:
+        tasks.append(asyncio.create_task(stand_in(port, s, delay if s.slow else 0.0, stop)))
+        await asyncio.sleep(0.01)
+    _seed_when_joined(host, n_clients // 2)
+    await asyncio.to_thread(host.run, seconds, seconds + 1)
+    host.running = False
+    stop.set()
+    listener.close()
+    with host.lock:
+        conns = [c for cs in host.clients.values() for c in cs]
+        ticks = max((m.tick for m in host.matches), default=0)   # 연결이 끊기면 매치가 내려가므로 먼저
+    for c in conns:
+        c.close()
+    for t in tasks:
+        t.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+    return stats, None, ticks
+
+
+def run(transport, n_matches=4, n_slow=2, delay=0.5, seconds=10.0, map_size=6):
+    host = server_main.MatchHost(map_size=map_size)
+    n_clients = 2 * n_matches
+    runner = _run_asyncio if transport == "asyncio" else _run_thread
+    t0 = time.perf_counter()
+    stats, skipped, ticks = asyncio.run(runner(host, n_clients, n_slow, delay, seconds))
+    elapsed = time.perf_counter() - t0
+    fast = [s for s in stats if not s.slow]
+    slow = [s for s in stats if s.slow]
+    print(f"[{transport}] clients={n_clients} slow={n_slow} delay={delay}s "
+          f"ticks={ticks} ({ticks / elapsed:.1f}/s, 목표 {host.tick_rate}/s)")
+    print(f"  {host.match_stats.summary('match_tick')}")
+    print(f"  {host.frame_stats.summary('frame')}")
+    if fast:
+        print(f"  정상 클라이언트: 수신 {sum(s.messages for s in fast) / len(fast):.0f}개/명, "
+              f"마지막 tick {min(s.last_tick for s in fast)}")
+    if slow:
+        print(f"  느린 클라이언트: 수신 {sum(s.messages for s in slow) / len(slow):.0f}개/명, "
+              f"마지막 tick {min(s.last_tick for s in slow)}")
+    if skipped is not None:
+        print(f"  덮어써 건너뛴 state: {skipped}")
+    return host
+
+
+def main():
+    ap = argparse.ArgumentParser(description="느린 클라이언트가 섞인 서버 틱 시간 비교")
+    ap.add_argument("--matches", type=int, default=4)
+    ap.add_argument("--slow", type=int, default=2, help="느린 클라이언트 수")
+    ap.add_argument("--delay", type=float, default=0.5, help="느린 클라이언트가 메시지마다 쉬는 시간(초)")
+    ap.add_argument("--seconds", type=float, default=10.0)
+    ap.add_argument("--map-size", type=int, default=6)
+    ap.add_argument("--transports", nargs="+", default=["thread", "asyncio"],
+                    choices=["thread", "asyncio"])
+    args = ap.parse_args()
+    for transport in args.transports:
+        run(transport, args.matches, args.slow, args.delay, args.seconds, args.map_size)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,11 +1,14 @@
 import pygame
 import sys
-import math
 import socket
 import threading
-import pickle
 import time
 
+from net_codec import (FRAME_GAME, FRAME_MSG, CodecError, decode_game, unpack,
+                       encode_command, send_frame, recv_frame)
+from net_common import SnapshotBuffer
+from game.geometry import HexLayout
+
 # --------------------------------------------------------------------
 # [설정] visual_main.py의 상수 및 설정 복원
 # --------------------------------------------------------------------
@@ -14,7 +17,8 @@ FPS = 60
 HEX_SIZE = 28
 SERVER_IP = '127.0.0.1' # 테스트 시 로컬 IP (필요시 변경)
 SERVER_PORT = 12345
-BUFFER_SIZE = 16384
+# 맵은 화면 정중앙 기준 (타일 중심/폴리곤 캐시 + O(1) 픽킹)
+MAP_LAYOUT = HexLayout(HEX_SIZE, (LOGICAL_W // 2, LOGICAL_H // 2))
 
 # 색상
 COLOR_BG = (35, 36, 40)
@@ -45,7 +49,9 @@ class GameClient:
         self.font_s = pygame.font.SysFont("malgungothic", 16)
         self.font_l = pygame.font.SysFont("malgungothic", 40, bold=True)
         
-        # 상태
+        # 상태: 수신 스레드가 디코딩한 스냅샷을 snapshots에 올리고,
+        # 렌더 루프가 프레임 시작에 한 번 꺼내 self.game에 둔다 (그리는 도중 바뀌지 않음)
+        self.snapshots = SnapshotBuffer()
         self.game = None
         self.running = True
         self.socket = None
@@ -67,7 +73,8 @@ class GameClient:
             init_packet = self._recv_once()
             if init_packet:
                 print(f"서버 연결 성공: {init_packet}")
-                self.my_role = 'ally'
+                role = init_packet.get('role') if isinstance(init_packet, dict) else None
+                self.my_role = role or 'ally'
             
             # 수신 스레드
             threading.Thread(target=self.recv_loop, daemon=True).start()
@@ -77,17 +84,17 @@ class GameClient:
             return False
 
     def _recv_once(self):
+        # 게임 스냅샷(G)은 바이너리 코덱, 그 외 메시지(M)는 msgpack 봉투
         try:
-            len_bytes = self.socket.recv(4)
-            if not len_bytes: return None
-            length = int.from_bytes(len_bytes, 'big')
-            buf = b''
-            while len(buf) < length:
-                chunk = self.socket.recv(min(length - len(buf), BUFFER_SIZE))
-                if not chunk: return None
-                buf += chunk
-            return pickle.loads(buf)
-        except:
+            frame = recv_frame(self.socket)
+            if frame is None: return None
+            kind, payload = frame
+            if kind == FRAME_GAME:
+                return decode_game(payload)
+            if kind == FRAME_MSG:
+                return unpack(payload)
+            return None
+        except (OSError, CodecError):
             return None
 
     def recv_loop(self):
@@ -96,26 +103,26 @@ class GameClient:
             if data is None:
                 self.running = False
                 break
-            # 게임 상태 덮어쓰기
-            if hasattr(data, 'map'): 
-                self.game = data
+            # 디코딩은 여기서 끝났으므로 참조만 바꿔 끼운다
+            if hasattr(data, 'map'):
+                self.snapshots.publish(data)
 
     def send_cmd(self, action, params={}):
         if not self.socket: return
         try:
-            payload = pickle.dumps({'action': action, 'params': params})
-            self.socket.sendall(len(payload).to_bytes(4, 'big'))
-            self.socket.sendall(payload)
-        except:
+            send_frame(self.socket, FRAME_MSG, encode_command(action, params))
+        except (OSError, CodecError):
             self.running = False
 
     # ----------------------------------------------------------------
     # 입력 처리
     # ----------------------------------------------------------------
     def handle_input(self):
+        """이벤트 처리. 처리한 이벤트가 있으면 True."""
         mouse_pos = pygame.mouse.get_pos()
-        
-        for event in pygame.event.get():
+        events = pygame.event.get()
+
+        for event in events:
             if event.type == pygame.QUIT:
                 self.running = False
             
@@ -125,6 +132,7 @@ class GameClient:
                 elif event.button == 3: # Right Click
                     self.selected_tile = None
                     self.selected_unit_tile = None
+        return bool(events)
 
     def on_click(self, pos):
         if not self.game: return
@@ -148,11 +156,7 @@ class GameClient:
             return
 
         # 3. 맵 상호작용
-        # 📌 [수정됨] 화면 중앙을 기준으로 좌표 계산
-        ox = LOGICAL_W // 2
-        oy = LOGICAL_H // 2
-        
-        q, r = pixel_to_hex(pos[0] - ox, pos[1] - oy, HEX_SIZE)
+        q, r = MAP_LAYOUT.pick(pos)
         tile = self.game.map.get_tile(q, r)
         
         if not tile: return
@@ -163,8 +167,8 @@ class GameClient:
         if me.units_inventory and tile.owner == 'ally':
             unit_to_place = me.units_inventory[0]
             can_place = False
-            if unit_to_place.is_wall:
-                if tile.wall is None: can_place = True
+            if getattr(unit_to_place, 'is_wall', False):
+                if getattr(tile, 'wall', None) is None: can_place = True
             else:
                 if tile.unit is None: can_place = True
                 
@@ -204,9 +208,15 @@ class GameClient:
     def run(self):
         if not self.connect(): return
         
+        drawn_version = -1
         while self.running:
             dt = self.clock.tick(FPS) / 1000.0
-            self.handle_input()
+            version, self.game = self.snapshots.read()
+            had_input = self.handle_input()
+            # 새 스냅샷도 입력도 없으면 지난 화면 그대로
+            if version == drawn_version and not had_input:
+                continue
+            drawn_version = version
             self.screen.fill(COLOR_BG)
             
             if self.game:
@@ -225,13 +235,8 @@ class GameClient:
         sys.exit()
 
     def draw_game(self, dt):
-        # 📌 [수정됨] 맵을 화면 정중앙에 그리기 위한 오프셋
-        ox = LOGICAL_W // 2
-        oy = LOGICAL_H // 2
-        
         for tile in self.game.map.tiles.values():
-            cx, cy = hex_to_pixel(tile.q, tile.r, HEX_SIZE)
-            cx, cy = cx + ox, cy + oy
+            cx, cy = MAP_LAYOUT.center(tile.q, tile.r)
             
             color = COLOR_GRID
             if tile.terrain == 'gold': color = COLOR_GOLD
@@ -242,19 +247,20 @@ class GameClient:
             base_col = (max(0, r-40), max(0, g-40), max(0, b-40))
             if tile.boundary: base_col = COLOR_BOUNDARY
             
-            poly = hex_polygon(cx, cy, HEX_SIZE-1)
+            poly = MAP_LAYOUT.polygon(tile.q, tile.r, 1)
             pygame.draw.polygon(self.screen, base_col, poly)
             pygame.draw.polygon(self.screen, (50,50,50), poly, 1)
             
             units = []
-            if tile.wall: units.append(tile.wall)
+            if getattr(tile, 'wall', None): units.append(tile.wall)
             if tile.unit: units.append(tile.unit)
             
             for u in units:
                 ucol = COLOR_ALLY if u.owner == 'ally' else COLOR_ENEMY
                 if u.is_pinpoint: ucol = COLOR_PINPOINT_ALLY if u.owner == 'ally' else COLOR_PINPOINT_ENEMY
                 
-                if u.is_wall:
+                is_wall = getattr(u, 'is_wall', False)
+                if is_wall:
                     rr = HEX_SIZE
                     pygame.draw.rect(self.screen, (100,100,100), (cx-rr/2, cy-rr/2, rr, rr))
                     pygame.draw.rect(self.screen, ucol, (cx-rr/2, cy-rr/2, rr, rr), 3)
@@ -266,15 +272,15 @@ class GameClient:
                     nt = self.font_s.render(nm, True, (255,255,255))
                     self.screen.blit(nt, (cx-nt.get_width()/2, cy-nt.get_height()/2))
                     
-                if not u.is_wall:
+                if not is_wall:
                     draw_hp_bar(self.screen, cx-15, cy-HEX_SIZE+5, u.health, 100 if u.is_pinpoint else 20)
 
         if self.selected_tile:
-            cx, cy = hex_to_pixel(self.selected_tile.q, self.selected_tile.r, HEX_SIZE)
-            pygame.draw.polygon(self.screen, (255,255,255), hex_polygon(cx+ox, cy+oy, HEX_SIZE-2), 2)
+            t = self.selected_tile
+            pygame.draw.polygon(self.screen, (255,255,255), MAP_LAYOUT.polygon(t.q, t.r, 2), 2)
         if self.selected_unit_tile:
-            cx, cy = hex_to_pixel(self.selected_unit_tile.q, self.selected_unit_tile.r, HEX_SIZE)
-            pygame.draw.polygon(self.screen, (0,255,0), hex_polygon(cx+ox, cy+oy, HEX_SIZE+2), 3)
+            t = self.selected_unit_tile
+            pygame.draw.polygon(self.screen, (0,255,0), MAP_LAYOUT.polygon(t.q, t.r, -2), 3)
 
     def draw_hud(self):
         s = pygame.Surface((240, LOGICAL_H), pygame.SRCALPHA)
@@ -324,34 +330,6 @@ class GameClient:
 # --------------------------------------------------------------------
 # 헬퍼 함수
 # --------------------------------------------------------------------
-def hex_to_pixel(q, r, size):
-    x = size * 1.5 * q
-    y = size * math.sqrt(3) * (r + q / 2.0)
-    return x, y
-
-def pixel_to_hex(x, y, size):
-    q = (2./3 * x) / size
-    r = (-1./3 * x + math.sqrt(3)/3 * y) / size
-    return round_hex(q, r)
-
-def round_hex(q, r):
-    s = -q - r
-    rq, rr, rs = round(q), round(r), round(s)
-    q_diff, r_diff, s_diff = abs(rq - q), abs(rr - r), abs(rs - s)
-    if q_diff > r_diff and q_diff > s_diff:
-        rq = -rr - rs
-    elif r_diff > s_diff:
-        rr = -rq - rs
-    return int(rq), int(rr)
-
-def hex_polygon(x, y, size):
-    pts = []
-    for i in range(6):
-        deg = 60 * i
-        rad = math.pi / 180 * deg
-        pts.append((x + size * math.cos(rad), y + size * math.sin(rad)))
-    return pts
-
 def draw_hp_bar(screen, x, y, hp, max_hp):
     pct = max(0, min(1, hp / max_hp))
     w, h = 30, 4
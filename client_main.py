@@ -1,25 +1,30 @@
 # client_main.py
+import base64
 import socket
 import threading
-from typing import Dict, Any, Tuple
+import time
+from typing import Tuple
 
 import pygame
-import math
 
-from net_common import send_json, recv_json
+from net_common import send_json, JsonReader, SnapshotBuffer
+from net_delta import DeltaState
+from net_codec import decode_game, game_to_state
+from net_predict import InputSequencer, MovePredictor, Interpolator
+from game.geometry import HexLayout, axial_to_pixel
 
 SERVER_IP = "127.0.0.1"   # 다른 PC에서 접속할 때 서버 IP로 바꾸기
 SERVER_PORT = 50000
 
 LOGICAL_W, LOGICAL_H = 1280, 720
 HEX_SIZE = 28
-SQRT3 = math.sqrt(3)
 ORIGIN = (LOGICAL_W // 2, LOGICAL_H // 2 + 20)
 
 COLOR_BG = (35, 36, 40)
 COLOR_GRID = (92, 96, 105)
 COLOR_ALLY = (110, 170, 255)
 COLOR_ENEMY = (255, 130, 130)
+COLOR_FOG = (58, 60, 66)          # 시야 밖 타일 (서버가 소유/유닛 정보를 보내지 않음)
 COLOR_HL = (255, 255, 0)
 COLOR_TEXT = (235, 238, 242)
 COLOR_CAPTURE = (255, 230, 120)
@@ -31,40 +36,70 @@ COLOR_WALL_ENEMY = (210, 150, 150)
 COLOR_WALL_BREAK = (140, 200, 255)
 
 
-def axial_to_pixel(q, r, size=HEX_SIZE, origin=ORIGIN):
-    ox, oy = origin
-    x = size * 1.5 * q
-    y = size * (SQRT3 * (r + q/2))
-    return int(ox + x), int(oy + y)
+LAYOUT = HexLayout(HEX_SIZE, ORIGIN)   # 타일 중심 캐시 + O(1) 픽킹
 
 
-def hex_polygon(cx, cy, size=HEX_SIZE):
-    pts = []
-    for i in range(6):
-        ang = math.radians(60 * i - 30)
-        pts.append((cx + size * math.cos(ang), cy + size * math.sin(ang)))
-    return pts
-
-
-server_state: Dict[str, Any] = {}
+# 수신 스레드가 디코딩/색인/보간 탐지까지 마친 state를 (버전, state)로 올리고
+# 렌더 루프는 프레임마다 read() 한 번으로 받는다. state 딕셔너리는 올린 뒤 고치지 않는다.
+snapshots = SnapshotBuffer()
 my_side: str = "ally"
 running = True
+# 수신 스레드(ack/resync)와 렌더 스레드(input)가 같은 소켓에 쓰므로 메시지 단위로 잠근다
+send_lock = threading.Lock()
+
+
+def send(sock: socket.socket, data: dict):
+    with send_lock:
+        send_json(sock, data)
 
 
 def net_thread_main(sock: socket.socket):
-    global server_state, my_side, running
+    global my_side, running
+    delta_state = DeltaState()
+    reader = JsonReader(sock)
+    interp = Interpolator()
+    input_seq = 0           # 서버가 적용했다고 알려 온 마지막 입력 seq
+    input_rejected = ()     # 그중 서버가 거절한 최근 입력 seq
+
+    def publish():
+        state = delta_state.snapshot()
+        state["input_seq"] = input_seq
+        state["input_rejected"] = input_rejected
+        state["motion"] = interp.push(state["tile_index"], time.perf_counter())
+        snapshots.publish(state)
+
     try:
         while True:
-            data = recv_json(sock)
+            data = reader.read()
             if data is None:
                 print("[CLIENT] 서버 끊김")
                 running = False
                 break
-            if data.get("type") == "hello":
+            kind = data.get("type")
+            if data.get("input_seq") is not None:
+                input_seq = data["input_seq"]
+                input_rejected = tuple(data.get("input_rejected", ()))
+            if kind == "hello":
                 my_side = data.get("side", "ally")
                 print("[CLIENT] 나의 진영:", my_side)
-            elif data.get("type") == "state":
-                server_state = data.get("state", {})
+            elif kind == "state_bin":
+                # 바이너리 키프레임 → 일반 키프레임 형식으로 변환해 적용
+                captures = {(q, r): remain for q, r, remain in data.get("captures", [])}
+                state = game_to_state(decode_game(base64.b64decode(data["data"])), captures)
+                state["tick"] = data.get("tick", 0)
+                state["players"] = data.get("players", state["players"])
+                state["battles"] = data.get("battles", [])
+                delta_state.apply({"type": "state", "version": data.get("version"), "state": state})
+                publish()
+                send(sock, {"type": "ack", "version": delta_state.version})
+            elif kind in ("state", "delta"):
+                # 키프레임/델타를 누적한 뒤 새 딕셔너리로 통째 교체 (렌더 루프와 공유하지 않음)
+                if not delta_state.apply(data):
+                    send(sock, {"type": "resync"})
+                    continue
+                publish()
+                if delta_state.version is not None:
+                    send(sock, {"type": "ack", "version": delta_state.version})
     except Exception as e:
         print("[CLIENT] 네트워크 예외:", e)
     finally:
@@ -75,19 +110,123 @@ def net_thread_main(sock: socket.socket):
             pass
 
 
-def nearest_tile_from_pos(mouse_pos) -> Tuple[int, int] | None:
-    if "tiles" not in server_state:
+def nearest_tile_from_pos(state, mouse_pos) -> Tuple[int, int] | None:
+    qr = LAYOUT.pick(mouse_pos)
+    if qr is None or qr not in state.get("tile_index", {}):
         return None
-    mx, my = mouse_pos
-    best = None
-    best_d2 = 10**18
-    for t in server_state["tiles"]:
-        cx, cy = axial_to_pixel(t["q"], t["r"])
-        d2 = (mx - cx)**2 + (my - cy)**2
-        if d2 < best_d2:
-            best_d2 = d2
-            best = (t["q"], t["r"])
-    return best
+    return qr
+
+
+def unit_center(fq, fr):
+    """실수 axial 좌표(보간/예측 위치) → 화면 좌표."""
+    return axial_to_pixel(fq, fr, LAYOUT.size, LAYOUT.origin, LAYOUT.orientation)
+
+
+def draw_unit(screen, font_small, u, cx, cy, side):
+    if u["is_pinpoint"]:
+        col = COLOR_PINPOINT_ALLY if u["owner"] == side else COLOR_PINPOINT_ENEMY
+        pygame.draw.circle(screen, col, (cx, cy), HEX_SIZE // 2)
+    else:
+        pygame.draw.circle(screen, COLOR_TEXT, (cx, cy), HEX_SIZE // 3, 2)
+
+    if u["name"] == "Soldier":
+        hp_txt = font_small.render(f"{int(u['health'])}", True, COLOR_TEXT)
+        screen.blit(hp_txt, (cx - hp_txt.get_width()//2, cy + HEX_SIZE * 0.4))
+
+
+def draw_frame(screen, font, font_small, state, side, selected_tile=None,
+               unit_pos=None, hidden=(), predicted=()):
+    """
+    state(DeltaState.snapshot) 한 장을 화면에 그린다. flip은 호출자 몫.
+    unit_pos((q, r)) → 실수 (q, r): 스냅샷 보간 위치 (None이면 타일 중심)
+    hidden / predicted: 예측 중인 병의 서버 위치(그리지 않음) / [(유닛, 실수 (q, r))]
+    """
+    screen.fill(COLOR_BG)
+
+    tiles = state.get("tiles", [])
+    players = state.get("players", {})
+    battles = state.get("battles", [])
+
+    # 타일
+    for t in tiles:
+        q, r = t["q"], t["r"]
+        owner = t.get("owner")
+        cx, cy = LAYOUT.center(q, r)
+        poly = LAYOUT.polygon(q, r, 1)
+        if t.get("fog"):
+            fill = COLOR_FOG
+        else:
+            fill = COLOR_ALLY if owner == side else COLOR_ENEMY
+        pygame.draw.polygon(screen, fill, poly)
+        pygame.draw.polygon(screen, COLOR_GRID, poly, 1)
+
+    # 점령 링
+    for t in tiles:
+        if t.get("capture_remain") is not None:
+            q, r = t["q"], t["r"]
+            cx, cy = LAYOUT.center(q, r)
+            pygame.draw.circle(screen, COLOR_CAPTURE, (cx, cy), HEX_SIZE - 4, 2)
+            txt = font_small.render(f"{t['capture_remain']:.1f}s", True, COLOR_CAPTURE)
+            screen.blit(txt, (cx - txt.get_width()//2, cy - HEX_SIZE * 1.3))
+
+    # 벽 / 벽 파괴 링
+    for t in tiles:
+        q, r = t["q"], t["r"]
+        cx, cy = LAYOUT.center(q, r)
+        wall_owner = t.get("wall_owner")
+        if wall_owner:
+            col = COLOR_WALL_ALLY if wall_owner == side else COLOR_WALL_ENEMY
+            w = int(HEX_SIZE * 1.1)
+            h = int(HEX_SIZE * 0.6)
+            rect = pygame.Rect(cx - w//2, cy - h//2, w, h)
+            pygame.draw.rect(screen, col, rect, border_radius=4)
+            pygame.draw.rect(screen, (40, 40, 60), rect, 2, border_radius=4)
+
+        if t.get("wall_break_remain") is not None:
+            pygame.draw.circle(screen, COLOR_WALL_BREAK,
+                               (cx, cy), HEX_SIZE - 8, 2)
+            txt = font_small.render(f"{t['wall_break_remain']:.1f}s",
+                                    True, COLOR_WALL_BREAK)
+            screen.blit(txt, (cx - txt.get_width()//2,
+                              cy + HEX_SIZE * 0.2))
+
+    # 유닛
+    for t in tiles:
+        u = t.get("unit")
+        if not u:
+            continue
+        key = (t["q"], t["r"])
+        if key in hidden:
+            continue
+        cx, cy = LAYOUT.center(*key) if unit_pos is None else unit_center(*unit_pos(key))
+        draw_unit(screen, font_small, u, cx, cy, side)
+    for u, (fq, fr) in predicted:
+        cx, cy = unit_center(fq, fr)
+        draw_unit(screen, font_small, u, cx, cy, side)
+
+    # 전투 타일 표시
+    for b in battles:
+        tq = b["tile"]["q"]
+        tr = b["tile"]["r"]
+        cx, cy = LAYOUT.center(tq, tr)
+        pygame.draw.circle(screen, COLOR_BATTLE_RING, (cx, cy), HEX_SIZE - 4, 3)
+        txt = font_small.render("⚔", True, COLOR_BATTLE_RING)
+        screen.blit(txt, (cx - txt.get_width()//2, cy - HEX_SIZE))
+
+    # 선택된 병 테두리
+    if selected_tile is not None:
+        sq, sr = selected_tile
+        pygame.draw.polygon(screen, COLOR_HL, LAYOUT.polygon(sq, sr, 3), 3)
+
+    # 상단 정보
+    my_info = players.get(side, {})
+    my_money = my_info.get("money", 0)
+    my_res = my_info.get("reserve", {})
+    reserve_text = f"S:{my_res.get('soldier',0)}  T:{my_res.get('setpoint',0)}  M:{my_res.get('medical',0)}  W:{my_res.get('wall',0)}"
+    txt = font.render(
+        f"Side: {side.upper()}  Money: {my_money}  Reserve({reserve_text})   (1~4 유형, B:구매, 우클릭:설치/회수, 좌클릭:병 이동)",
+        True, COLOR_TEXT)
+    screen.blit(txt, (12, 12))
 
 
 def main():
@@ -99,6 +238,15 @@ def main():
 
     threading.Thread(target=net_thread_main, args=(sock,), daemon=True).start()
 
+    inputs = InputSequencer()
+    predictor = None             # hello로 진영을 안 뒤 생성
+    seen_version = 0             # 예측을 맞춰 본 마지막 스냅샷 버전
+    drawn_version = -1           # 마지막으로 그린 스냅샷 버전
+
+    def send_input(cmd):
+        send(sock, {"type": "input", "cmd": inputs.stamp(cmd)})
+        return cmd["seq"]
+
     pygame.init()
     pygame.display.set_caption("국가전쟁 멀티 클라이언트")
     screen = pygame.display.set_mode((LOGICAL_W, LOGICAL_H), pygame.SCALED)
@@ -112,9 +260,22 @@ def main():
     while running:
         dt = clock.tick(45) / 1000.0
         mouse_pos = pygame.mouse.get_pos()
+        now = time.perf_counter()
+        if predictor is None or predictor.side != my_side:
+            predictor = MovePredictor(my_side)
+
+        # 이번 프레임의 state는 여기서 한 번만 읽는다 (그리는 도중 바뀌지 않음)
+        version, state = snapshots.read()
+        if state is None:
+            state = {}
+        elif version != seen_version:
+            seen_version = version
+            inputs.ack(state["input_seq"], now)
+            predictor.reconcile(state["tile_index"], inputs.acked, now, state["input_rejected"])
 
         # 입력
-        for event in pygame.event.get():
+        events = pygame.event.get()
+        for event in events:
             if event.type == pygame.QUIT:
                 running = False
 
@@ -131,27 +292,17 @@ def main():
                     selected_type = "wall"
                 elif event.key == pygame.K_b:
                     # 구매 (예비 풀에만 쌓임)
-                    send_json(sock, {
-                        "type": "input",
-                        "cmd": {
-                            "kind": "purchase",
-                            "unit_type": selected_type,
-                        },
-                    })
+                    send_input({"kind": "purchase", "unit_type": selected_type})
 
             elif event.type == pygame.MOUSEBUTTONDOWN:
-                tile_coord = nearest_tile_from_pos(mouse_pos)
+                tile_coord = nearest_tile_from_pos(state, mouse_pos)
                 if tile_coord is None:
                     continue
                 tq, tr = tile_coord
 
                 # 좌클릭: 병 선택 / 이동
                 if event.button == 1:
-                    tile_info = None
-                    for t in server_state.get("tiles", []):
-                        if t["q"] == tq and t["r"] == tr:
-                            tile_info = t
-                            break
+                    tile_info = state["tile_index"].get(tile_coord)
                     if tile_info is None:
                         continue
                     u = tile_info.get("unit")
@@ -165,129 +316,38 @@ def main():
                             "from": [from_q, from_r],
                             "to": [tq, tr],
                         }
-                        send_json(sock, {"type": "input", "cmd": cmd})
+                        seq = send_input(cmd)
+                        # 서버 결과를 기다리지 않고 같은 규칙으로 바로 움직여 보인다
+                        predictor.predict(seq, selected_tile, (tq, tr), state["tile_index"], now)
                         selected_tile = None
 
                 # 우클릭: 설치 or 회수
                 elif event.button == 3:
                     # 먼저 해당 타일에 내 유닛이 있으면 회수 시도
-                    tile_info = None
-                    for t in server_state.get("tiles", []):
-                        if t["q"] == tq and t["r"] == tr:
-                            tile_info = t
-                            break
+                    tile_info = state["tile_index"].get(tile_coord)
 
                     recalled = False
                     if tile_info is not None:
                         u = tile_info.get("unit")
                         if u and u["owner"] == my_side and not u.get("is_pinpoint", False):
-                            send_json(sock, {
-                                "type": "input",
-                                "cmd": {"kind": "recall", "q": tq, "r": tr},
-                            })
+                            send_input({"kind": "recall", "q": tq, "r": tr})
                             recalled = True
 
                     if not recalled:
                         # 설치 시도
-                        send_json(sock, {
-                            "type": "input",
-                            "cmd": {
-                                "kind": "place",
-                                "unit_type": selected_type,
-                                "q": tq,
-                                "r": tr,
-                            },
-                        })
-
-        # 렌더
-        screen.fill(COLOR_BG)
-
-        tiles = server_state.get("tiles", [])
-        players = server_state.get("players", {})
-        battles = server_state.get("battles", [])
-
-        # 타일
-        for t in tiles:
-            q, r = t["q"], t["r"]
-            owner = t["owner"]
-            cx, cy = axial_to_pixel(q, r)
-            poly = hex_polygon(cx, cy, HEX_SIZE - 1)
-            fill = COLOR_ALLY if owner == my_side else COLOR_ENEMY
-            pygame.draw.polygon(screen, fill, poly)
-            pygame.draw.polygon(screen, COLOR_GRID, poly, 1)
-
-        # 점령 링
-        for t in tiles:
-            if t.get("capture_remain") is not None:
-                q, r = t["q"], t["r"]
-                cx, cy = axial_to_pixel(q, r)
-                pygame.draw.circle(screen, COLOR_CAPTURE, (cx, cy), HEX_SIZE - 4, 2)
-                txt = font_small.render(f"{t['capture_remain']:.1f}s", True, COLOR_CAPTURE)
-                screen.blit(txt, (cx - txt.get_width()//2, cy - HEX_SIZE * 1.3))
-
-        # 벽 / 벽 파괴 링
-        for t in tiles:
-            q, r = t["q"], t["r"]
-            cx, cy = axial_to_pixel(q, r)
-            wall_owner = t.get("wall_owner")
-            if wall_owner:
-                col = COLOR_WALL_ALLY if wall_owner == my_side else COLOR_WALL_ENEMY
-                w = int(HEX_SIZE * 1.1)
-                h = int(HEX_SIZE * 0.6)
-                rect = pygame.Rect(cx - w//2, cy - h//2, w, h)
-                pygame.draw.rect(screen, col, rect, border_radius=4)
-                pygame.draw.rect(screen, (40, 40, 60), rect, 2, border_radius=4)
-
-            if t.get("wall_break_remain") is not None:
-                pygame.draw.circle(screen, COLOR_WALL_BREAK,
-                                   (cx, cy), HEX_SIZE - 8, 2)
-                txt = font_small.render(f"{t['wall_break_remain']:.1f}s",
-                                        True, COLOR_WALL_BREAK)
-                screen.blit(txt, (cx - txt.get_width()//2,
-                                  cy + HEX_SIZE * 0.2))
-
-        # 유닛
-        for t in tiles:
-            q, r = t["q"], t["r"]
-            cx, cy = axial_to_pixel(q, r)
-            u = t.get("unit")
-            if not u:
-                continue
-            if u["is_pinpoint"]:
-                col = COLOR_PINPOINT_ALLY if u["owner"] == my_side else COLOR_PINPOINT_ENEMY
-                pygame.draw.circle(screen, col, (cx, cy), HEX_SIZE // 2)
-            else:
-                pygame.draw.circle(screen, COLOR_TEXT, (cx, cy), HEX_SIZE // 3, 2)
-
-            if u["name"] == "Soldier":
-                hp_txt = font_small.render(f"{int(u['health'])}", True, COLOR_TEXT)
-                screen.blit(hp_txt, (cx - hp_txt.get_width()//2, cy + HEX_SIZE * 0.4))
-
-        # 전투 타일 표시
-        for b in battles:
-            tq = b["tile"]["q"]
-            tr = b["tile"]["r"]
-            cx, cy = axial_to_pixel(tq, tr)
-            pygame.draw.circle(screen, COLOR_BATTLE_RING, (cx, cy), HEX_SIZE - 4, 3)
-            txt = font_small.render("⚔", True, COLOR_BATTLE_RING)
-            screen.blit(txt, (cx - txt.get_width()//2, cy - HEX_SIZE))
-
-        # 선택된 병 테두리
-        if selected_tile is not None:
-            sq, sr = selected_tile
-            cx, cy = axial_to_pixel(sq, sr)
-            pygame.draw.polygon(screen, COLOR_HL, hex_polygon(cx, cy, HEX_SIZE - 3), 3)
-
-        # 상단 정보
-        my_info = players.get(my_side, {})
-        my_money = my_info.get("money", 0)
-        my_res = my_info.get("reserve", {})
-        reserve_text = f"S:{my_res.get('soldier',0)}  T:{my_res.get('setpoint',0)}  M:{my_res.get('medical',0)}  W:{my_res.get('wall',0)}"
-        txt = font.render(
-            f"Side: {my_side.upper()}  Money: {my_money}  Reserve({reserve_text})   (1~4 유형, B:구매, 우클릭:설치/회수, 좌클릭:병 이동)",
-            True, COLOR_TEXT)
-        screen.blit(txt, (12, 12))
-
+                        send_input({"kind": "place", "unit_type": selected_type, "q": tq, "r": tr})
+
+        # 렌더: 새 스냅샷도, 입력도, 진행 중인 예측/보간도 없으면 지난 화면 그대로
+        motion = state.get("motion")
+        animating = bool(predictor.moves) or (motion is not None and motion.active(now))
+        if version == drawn_version and not events and not animating:
+            continue
+        drawn_version = version
+        # 예측 중인 병은 경로 위 위치, 나머지는 스냅샷 보간 위치
+        hidden, predicted = predictor.overlay(state.get("tile_index", {}), now)
+        draw_frame(screen, font, font_small, state, my_side, selected_tile,
+                   unit_pos=(lambda key: motion.position(key, now)) if motion is not None else None,
+                   hidden=hidden, predicted=predicted)
         pygame.display.flip()
 
     pygame.quit()
@@ -0,0 +1,58 @@
+from dataclasses import dataclass, fields, replace, asdict
+
+
+@dataclass(frozen=True)
+class Balance:
+    """
+    밸런스 수치 묶음. Game/Player/Match가 하드코딩 대신 이 값을 읽는다.
+    기본값은 기존 규칙과 동일하다.
+    """
+    # 시작 자금 / 유닛 가격
+    start_money: int = 5000
+    soldier_cost: int = 100
+    setpoint_cost: int = 500
+    medical_cost: int = 1000
+    max_setpoints: int = 3          # 진영당 셋포인트 구매 상한
+
+    # 셋포인트 포격
+    fire_interval: float = 1.0
+    hit_chance: float = 0.4
+    shot_damage: int = 5
+    setpoint_range: int = 2
+
+    # 금광
+    gold_payout_min: int = 50
+    gold_payout_max: int = 2000
+    mining_time: float = 5.0
+    gold_cooldown: float = 12.0
+
+    # 이동 / 점령
+    step_time: float = 0.4          # 적 진영으로 들어갈 때 한 칸 이동 시간(초)
+    capture_time: float = 8.0       # 적/아군 타일 점령에 필요한 시간(초)
+
+    # 보건소
+    heal_interval: float = 3.0
+    heal_max: int = 20
+
+    # 시야 (서버가 진영별로 보이는 타일만 전송)
+    soldier_sight: int = 2
+    setpoint_sight: int = 3
+    building_sight: int = 1         # 핀포인트 / 보건소
+
+    def with_overrides(self, **overrides) -> "Balance":
+        return replace(self, **overrides)
+
+    def diff(self) -> dict:
+        """기본값과 다른 항목만 (리플레이/결과 기록용)."""
+        return {k: v for k, v in asdict(self).items() if v != getattr(DEFAULT_BALANCE, k)}
+
+    @classmethod
+    def parse_value(cls, name, text):
+        """'hit_chance', '0.5' → 0.5 (필드 타입에 맞게 변환)."""
+        for f in fields(cls):
+            if f.name == name:
+                return int(text) if f.type in (int, "int") else float(text)
+        raise ValueError(f"알 수 없는 밸런스 항목: {name}")
+
+
+DEFAULT_BALANCE = Balance()
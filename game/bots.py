@@ -0,0 +1,107 @@
+import random
+
+from game.rules import hex_distance, find_pinpoint_tile
+
+RESERVE_SOLDIERS = 4      # 예비 병 유지 수
+MAX_MOVES_PER_THINK = 3   # 한 번 생각할 때 진격시키는 병 수
+
+
+class ScriptedBot:
+    """
+    헤드리스 매치용 단순 AI. think()가 Match 입력 명령(dict) 목록을 돌려준다.
+    - 보건소 1개, 셋포인트는 상한까지, 병은 예비 RESERVE_SOLDIERS개 유지
+    - 병은 아군 금광 → 경계 순으로 배치, 셋포인트는 핀포인트 4칸 이내 전방
+    - 아군 타일에 있는 병을 가까운 빈 적 경계 타일로 진격
+    난수는 매치와 별도의 스트림을 쓰므로 봇이 게임 난수 순서를 흩뜨리지 않는다.
+    """
+
+    def __init__(self, side, seed=None):
+        self.side = side
+        self.rng = random.Random(seed)
+
+    def think(self, match):
+        game = match.game
+        side = self.side
+        b = game.balance
+        player = game.players[side]
+        reserve = match.reserve[side]
+        tiles = list(game.map.tiles.values())
+        pinpoint = find_pinpoint_tile(game, side)
+        enemy_pp = next((t for t in game.map.unit_index.tiles_of_name("Pinpoint")
+                         if t.unit.owner != side), None)
+
+        cmds = []
+        money = player.money
+        # 이번에 배치할 수 있는 유닛 수 (예비 + 이번에 구매)
+        ready = {unit_type: len(pool) for unit_type, pool in reserve.items()}
+
+        def buy(unit_type, cost):
+            nonlocal money
+            cmds.append({"kind": "purchase", "unit_type": unit_type})
+            money -= cost
+            ready[unit_type] += 1
+
+        # ---- 구매 ----
+        if (not any(u.is_medical for u in player.units_inventory)
+                and money >= b.medical_cost + 2 * b.soldier_cost):
+            buy("medical", b.medical_cost)
+        n_setpoints = sum(1 for u in player.units_inventory if u.is_setpoint)
+        if n_setpoints < b.max_setpoints and money >= b.setpoint_cost + 2 * b.soldier_cost:
+            buy("setpoint", b.setpoint_cost)
+        while ready["soldier"] < RESERVE_SOLDIERS and money >= b.soldier_cost:
+            buy("soldier", b.soldier_cost)
+
+        # ---- 배치 ----
+        taken = set()
+
+        def free_own(pred):
+            return [t for t in tiles
+                    if t.owner == side and t.unit is None and (t.q, t.r) not in taken and pred(t)]
+
+        def place(unit_type, t):
+            taken.add((t.q, t.r))
+            cmds.append({"kind": "place", "unit_type": unit_type, "q": t.q, "r": t.r})
+
+        def near_pinpoint(t):
+            return pinpoint is not None and hex_distance(t.q, t.r, pinpoint.q, pinpoint.r) <= 1
+
+        def front_score(t):
+            return hex_distance(t.q, t.r, enemy_pp.q, enemy_pp.r) if enemy_pp else 0
+
+        if ready["medical"]:
+            cand = free_own(lambda t: not t.boundary and not near_pinpoint(t))
+            if cand:
+                place("medical", self.rng.choice(cand))
+
+        if ready["setpoint"] and pinpoint is not None:
+            cand = free_own(lambda t: not near_pinpoint(t)
+                            and hex_distance(t.q, t.r, pinpoint.q, pinpoint.r) <= 4)
+            cand.sort(key=front_score)
+            for t in cand[:ready["setpoint"]]:
+                place("setpoint", t)
+
+        to_place = ready["soldier"]
+        for t in game.map.gold_tiles:
+            if to_place and t.owner == side and t.unit is None and (t.q, t.r) not in taken:
+                place("soldier", t)
+                to_place -= 1
+        if to_place:
+            cand = [t for t in game.map.boundary_tiles(side)
+                    if t.unit is None and (t.q, t.r) not in taken and t.terrain != "gold"]
+            self.rng.shuffle(cand)
+            for t in cand[:to_place]:
+                place("soldier", t)
+
+        # ---- 진격 ----
+        idle = [t for t in game.map.unit_index.tiles(side, "Soldier")
+                if t.owner == side and t.terrain != "gold" and not game.moves.is_moving(t.unit)]
+        targets = [t for owner in game.players if owner != side
+                   for t in game.map.boundary_tiles(owner) if t.unit is None]
+        self.rng.shuffle(idle)
+        for src in idle[:MAX_MOVES_PER_THINK]:
+            if not targets:
+                break
+            dst = min(targets, key=lambda t: hex_distance(src.q, src.r, t.q, t.r))
+            targets.remove(dst)
+            cmds.append({"kind": "move", "from": [src.q, src.r], "to": [dst.q, dst.r]})
+        return cmds
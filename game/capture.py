@@ -0,0 +1,70 @@
+"""
+점령 시스템 (Game.captures). 남의 진영 타일 위에 병이 서 있는 칸만 상태로 들고 있는다.
+
+규칙 (기존 visual_main / Match와 같음):
+- 병이 자기 진영이 아닌 타일에 서면 그 칸의 점령이 시작된다 (remain = balance.capture_time).
+- 같은 진영 병이 계속 서 있으면 틱마다 remain이 dt만큼 줄고, 0 이하가 되면 소유가 바뀐다.
+- 병이 떠나거나 죽거나 다른 진영 유닛으로 바뀌면 취소된다.
+
+맵 전체를 훑지 않고 UnitIndex(배치/제거)와 HexMap(소유 변경) 알림으로 바뀐 칸만 모아 두었다가
+update에서 판정하므로, 틱 비용은 점령 중인 칸 수 + 이번 틱에 바뀐 칸 수에 비례한다.
+완료된 점령은 completed에 (타일, 새 소유자)로 남는다 (UI 알림/네트워크용). 경계는
+HexMap.set_owner가 그 칸과 이웃만 갱신한다.
+"""
+
+
+class CaptureSystem:
+    def __init__(self, game):
+        self.game = game
+        self.states = {}        # {(q, r): {"owner", "remain", "unit_id"}} (시작 순서 유지)
+        self._dirty = {}        # 유닛/소유가 바뀐 칸 (q, r) → 타일
+        self.completed = []     # 이번 틱에 점령이 끝난 [(타일, 새 소유자)]
+        game.map.unit_index.watchers.append(self._mark)
+        game.map.owner_watchers.append(self._mark)
+
+    def _mark(self, tile):
+        self._dirty[(tile.q, tile.r)] = tile
+
+    def remain(self, tile):
+        """점령 남은 시간(초). 점령 중이 아니면 None."""
+        state = self.states.get((tile.q, tile.r))
+        return state["remain"] if state is not None else None
+
+    def update(self, dt):
+        self.completed = []
+        states = self.states
+        dirty = self._dirty
+        self._dirty = {}
+
+        # 바뀐 칸의 진행 중 점령 취소
+        for key, tile in dirty.items():
+            state = states.get(key)
+            if state is not None:
+                unit = tile.unit
+                if not unit or unit.name != "Soldier" or unit.owner != state["owner"]:
+                    del states[key]
+
+        # 진행
+        done = []
+        for key, state in states.items():
+            state["remain"] -= dt
+            if state["remain"] <= 0:
+                done.append(key)
+        get_tile = self.game.map.get_tile
+        for key in done:
+            state = states.pop(key)
+            tile = get_tile(*key)
+            self.game.map.set_owner(tile, state["owner"])
+            self.completed.append((tile, state["owner"]))
+            # 방금 소유가 바뀐 칸은 병과 진영이 같아졌으므로 다시 볼 필요가 없다
+            self._dirty.pop(key, None)
+
+        # 새로 점령 시작 (맵 순서)
+        index_of = self.game.map.index_of
+        b = self.game.balance
+        for tile in sorted(dirty.values(), key=lambda t: index_of(t.q, t.r)):
+            unit = tile.unit
+            if unit and unit.name == "Soldier" and tile.owner != unit.owner:
+                key = (tile.q, tile.r)
+                if key not in states:
+                    states[key] = {"owner": unit.owner, "remain": b.capture_time, "unit_id": id(unit)}
@@ -0,0 +1,272 @@
+from array import array
+from bisect import bisect_right
+from collections.abc import Mapping
+from typing import List, Optional
+
+from game.hex_map import HexMap, axial_range, DIRECTIONS
+from game.unit import Unit
+
+# 열(column)에 들어가는 문자열 값 ↔ 정수 id
+OWNERS = [None, 'ally', 'enemy']
+TERRAINS = ['land', 'gold']
+
+
+def _intern(table, value):
+    try:
+        return table.index(value)
+    except ValueError:
+        table.append(value)
+        return len(table) - 1
+
+
+class CompactTile:
+    """
+    CompactHexMap의 열 버퍼 한 칸을 가리키는 가벼운 뷰.
+    Tile과 같은 속성/메서드를 제공하지만 값은 모두 맵의 배열에 저장된다.
+    """
+    __slots__ = ("_m", "_i", "q", "r")
+
+    def __init__(self, m, i, q, r):
+        self._m = m
+        self._i = i
+        self.q = q
+        self.r = r
+
+    # ----- 열 접근 -----
+    @property
+    def owner(self) -> str:
+        return OWNERS[self._m.owner_col[self._i]]
+
+    @owner.setter
+    def owner(self, value):
+        self._m.owner_col[self._i] = _intern(OWNERS, value)
+
+    @property
+    def terrain(self) -> str:
+        return TERRAINS[self._m.terrain_col[self._i]]
+
+    @terrain.setter
+    def terrain(self, value):
+        self._m.terrain_col[self._i] = _intern(TERRAINS, value)
+
+    @property
+    def blocked(self) -> bool:
+        return bool(self._m.blocked_col[self._i])
+
+    @blocked.setter
+    def blocked(self, value):
+        self._m.blocked_col[self._i] = 1 if value else 0
+
+    @property
+    def boundary(self) -> bool:
+        return bool(self._m.boundary_col[self._i])
+
+    @boundary.setter
+    def boundary(self, value):
+        self._m.boundary_col[self._i] = 1 if value else 0
+
+    @property
+    def gold_cooldown(self):
+        return self._m.cooldown_col[self._i]
+
+    @gold_cooldown.setter
+    def gold_cooldown(self, value):
+        self._m.cooldown_col[self._i] = value
+
+    @property
+    def gold_amount(self) -> int:
+        return self._m.amount_col[self._i]
+
+    @gold_amount.setter
+    def gold_amount(self, value):
+        self._m.amount_col[self._i] = value
+
+    @property
+    def gold_timer(self) -> float:
+        return self._m.timer_col[self._i]
+
+    @gold_timer.setter
+    def gold_timer(self, value):
+        self._m.timer_col[self._i] = value
+
+    @property
+    def unit(self) -> Optional[Unit]:
+        uid = self._m.unit_col[self._i]
+        return None if uid < 0 else self._m.units[uid]
+
+    @unit.setter
+    def unit(self, value):
+        self._m.set_unit(self._i, value)
+
+    # ----- Tile과 동일한 API -----
+    def __hash__(self) -> int:
+        return hash((self.q, self.r))
+
+    def __eq__(self, other) -> bool:
+        return (isinstance(other, CompactTile) and self.q == other.q and self.r == other.r)
+
+    def __repr__(self) -> str:
+        return (f"CompactTile(q={self.q}, r={self.r}, owner={self.owner!r}, "
+                f"terrain={self.terrain!r}, unit={self.unit!r}, boundary={self.boundary})")
+
+    def is_empty(self) -> bool:
+        return self._m.unit_col[self._i] < 0
+
+    def place_unit(self, unit: Unit):
+        if not self.is_empty():
+            raise ValueError(f"Tile({self.q},{self.r}) is not available for placement.")
+        self.unit = unit
+        self._m.unit_index.add(self, unit)
+
+    def remove_unit(self) -> Unit:
+        if self.is_empty():
+            raise ValueError("No unit to remove.")
+        removed = self.unit
+        self.unit = None
+        self._m.unit_index.discard(self, removed)
+        return removed
+
+
+class CompactTiles(Mapping):
+    """
+    (q, r) → CompactTile 매핑. 딕셔너리 대신 조밀 인덱스를 계산하고,
+    뷰는 처음 접근할 때 만들어 재사용한다(같은 칸은 항상 같은 뷰 객체).
+    """
+
+    def __init__(self, m):
+        self._m = m
+
+    def __getitem__(self, key):
+        i = self._m.index_of(*key)
+        if i < 0:
+            raise KeyError(key)
+        return self._m.view(i)
+
+    def get(self, key, default=None):
+        i = self._m.index_of(*key)
+        return default if i < 0 else self._m.view(i)
+
+    def __contains__(self, key):
+        return self._m.index_of(*key) >= 0
+
+    def __iter__(self):
+        return axial_range(self._m.size)
+
+    def __len__(self):
+        return len(self._m.unit_col)
+
+    def values(self):
+        view = self._m.view
+        return [view(i) for i in range(len(self))]
+
+    def items(self):
+        view = self._m.view
+        return [(c, view(i)) for i, c in enumerate(axial_range(self._m.size))]
+
+
+class CompactHexMap(HexMap):
+    """
+    구조-배열(SoA) 맵. 타일 상태를 array 열 버퍼에 담고
+    (q, r) → 조밀 인덱스(열 오프셋 + 행)로 접근한다. 반지름 50~200(수만 타일)용.
+    tiles / get_tile / neighbors 는 HexMap과 똑같이 동작한다.
+    """
+
+    def _generate_map(self):
+        size = self.size
+        # q 열마다 시작 인덱스와 r 최솟값 (axial_range 순서와 동일)
+        self._col_start = array('i')
+        self._col_rmin = array('i')
+        n = 0
+        for q in range(-size, size + 1):
+            r1 = max(-size, -q - size)
+            r2 = min(size, -q + size)
+            self._col_start.append(n)
+            self._col_rmin.append(r1)
+            n += r2 - r1 + 1
+        self.owner_col = array('b', [_intern(OWNERS, 'ally')]) * n
+        self.terrain_col = array('b', [0]) * n
+        self.blocked_col = array('b', [0]) * n
+        self.boundary_col = array('b', [0]) * n
+        self.cooldown_col = array('d', [0.0]) * n
+        self.amount_col = array('i', [0]) * n
+        self.timer_col = array('d', [0.0]) * n
+        self.unit_col = array('i', [-1]) * n
+        self.units: List[Optional[Unit]] = []   # unit_col이 가리키는 슬롯
+        self._free_slots: List[int] = []
+        self._views: List[Optional[CompactTile]] = [None] * n
+        self.tiles = CompactTiles(self)
+
+    def _build_tables(self):
+        # 인접 인덱스는 평탄한 배열(n*6, 없으면 -1)로 즉시 계산하고,
+        # 타일 튜플/링은 큰 맵에서 메모리를 아끼기 위해 처음 조회할 때 채운다.
+        n = len(self.unit_col)
+        index_of = self.index_of
+        nbr = array('i', [-1]) * (n * 6)
+        for i, (q, r) in enumerate(axial_range(self.size)):
+            base = i * 6
+            for d, (dq, dr) in enumerate(DIRECTIONS):
+                nbr[base + d] = index_of(q + dq, r + dr)
+        self.nbr_col = nbr
+        self._nbr_cache = [None] * n
+        self._ring_cache = [None] * n
+
+    def neighbor_indices(self, i) -> tuple:
+        base = i * 6
+        return tuple(j for j in self.nbr_col[base:base + 6] if j >= 0)
+
+    def tile_by_index(self, i):
+        return self.view(i)
+
+    def _setup_starting_ownership(self):
+        # HexMap과 같은 규칙(q<0 아군, 인접 진영이 다르면 경계)을 뷰 없이 열에 직접 기록
+        ally, enemy = _intern(OWNERS, 'ally'), _intern(OWNERS, 'enemy')
+        own, bnd, nbr = self.owner_col, self.boundary_col, self.nbr_col
+        for i, (q, r) in enumerate(axial_range(self.size)):
+            own[i] = ally if q < 0 else enemy
+        for i in range(len(own)):
+            o = own[i]
+            for j in nbr[i * 6:i * 6 + 6]:
+                if j >= 0 and own[j] != o:
+                    bnd[i] = 1
+                    break
+        boundary = self._boundary = {}
+        for i in range(len(own)):
+            if bnd[i]:
+                boundary.setdefault(OWNERS[own[i]], set()).add(i)
+
+    def index_of(self, q, r) -> int:
+        """맵 밖이면 -1."""
+        size = self.size
+        if not (-size <= q <= size and -size <= r <= size and -size <= -q - r <= size):
+            return -1
+        c = q + size
+        return self._col_start[c] + (r - self._col_rmin[c])
+
+    def view(self, i) -> CompactTile:
+        v = self._views[i]
+        if v is None:
+            c = bisect_right(self._col_start, i) - 1
+            q = c - self.size
+            v = self._views[i] = CompactTile(self, i, q, self._col_rmin[c] + (i - self._col_start[c]))
+        return v
+
+    def get_tile(self, q, r):
+        i = self.index_of(q, r)
+        return None if i < 0 else self.view(i)
+
+    def set_unit(self, i, unit):
+        col = self.unit_col
+        old = col[i]
+        if old >= 0:
+            self.units[old] = None
+            self._free_slots.append(old)
+        if unit is None:
+            col[i] = -1
+            return
+        if self._free_slots:
+            slot = self._free_slots.pop()
+            self.units[slot] = unit
+        else:
+            slot = len(self.units)
+            self.units.append(unit)
+        col[i] = slot
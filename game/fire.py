@@ -0,0 +1,119 @@
+"""
+셋포인트 포격 (Game.fire). fire_interval마다 Game이 volley()를 부른다.
+
+목표 규칙: 사거리 안 적 병 중 가장 가까운 링부터, 같은 링에서는 경계 타일 우선,
+동률이면 링 테이블(HexMap.ring) 순서상 먼저인 타일.
+
+포대가 많아도 싸도록 두 단계로 나눈다.
+1) 조준: 셋포인트마다 미리 만든 사거리 마스크(사거리 안 맵 인덱스 frozenset)와
+   적 병 위치 집합의 교집합만 구한다 (C 수준 집합 연산, 유닛/타일 객체를 훑지 않음).
+   후보가 둘 이상일 때만 (링, 경계, 링 순서) 순위로 고른다. 셋포인트 목록과 마스크는
+   셋포인트가 설치/제거될 때까지 재사용한다.
+2) 사격: 셋포인트 맵 순서대로 명중 판정. 앞 포대가 목표를 쓰러뜨리면 그 타일을
+   조준했던 뒤 포대만 다시 조준한다. 다른 병이 사라져도 남은 목표의 우선순위는
+   그대로이므로, 결과(난수 소비 순서 포함)는 포대마다 순서대로 조준하던 방식과 같다.
+"""
+
+
+class FireSystem:
+    def __init__(self, game):
+        self.game = game
+        # (셋포인트 맵 인덱스, 사거리) → (사거리 안 맵 인덱스 frozenset, {맵 인덱스: 순위})
+        self._masks = {}
+        self._batteries = []        # [(셋포인트 타일, 진영, 마스크)] 맵 순서
+        self._batteries_key = None  # 위 목록을 만들 때의 (사거리, 셋포인트 버킷 버전들)
+
+    def _mask(self, i, max_range):
+        """
+        순위 = 링 * 2W + (경계가 아니면 W) + 링 안 순서 (W = 가장 바깥 링 크기).
+        작을수록 우선이며, 경계 여부는 쏠 때 타일에서 읽는다.
+        """
+        key = (i, max_range)
+        mask = self._masks.get(key)
+        if mask is None:
+            m = self.game.map
+            t = m.tile_by_index(i)
+            w = 6 * max_range
+            rank = {}
+            for k in range(1, max_range + 1):
+                for pos, nb in enumerate(m.ring(t.q, t.r, k)):
+                    rank[m.index_of(nb.q, nb.r)] = k * 2 * w + pos
+            mask = self._masks[key] = (frozenset(rank), rank, w)
+        return mask
+
+    def _foes(self, owner):
+        """owner의 적 병 위치 {맵 인덱스: 타일} (진영이 둘이면 상대 버킷 그대로)."""
+        index = self.game.map.unit_index
+        buckets = [index.positions(side, "Soldier") for side in self.game.players if side != owner]
+        if len(buckets) == 1:
+            return buckets[0]
+        merged = {}
+        for b in buckets:
+            merged.update(b)
+        return merged
+
+    @staticmethod
+    def _aim(mask, foes, foe_set):
+        """사거리 안 첫 목표의 맵 인덱스 (없으면 -1). foe_set은 foes의 키 집합."""
+        area, rank, w = mask
+        near = area.intersection(foe_set)
+        if not near:
+            return -1
+        best, best_rank = -1, None
+        for j in near:
+            r = rank[j] if foes[j].boundary else rank[j] + w
+            if best_rank is None or r < best_rank:
+                best, best_rank = j, r
+        return best
+
+    def batteries(self):
+        """[(셋포인트 타일, 진영, 마스크)] 맵 순서. 셋포인트 배치가 바뀌었을 때만 다시 만든다."""
+        m = self.game.map
+        index = m.unit_index
+        max_range = self.game.balance.setpoint_range
+        key = (max_range,) + tuple(index.version(side, "Setpoint") for side in self.game.players)
+        if key != self._batteries_key:
+            self._batteries = [(t, t.unit.owner, self._mask(m.index_of(t.q, t.r), max_range))
+                               for t in index.tiles_of_name("Setpoint")]
+            self._batteries_key = key
+        return self._batteries
+
+    def volley(self):
+        """모든 셋포인트가 한 번씩 쏜다 (명중 확률 hit_chance, 피해 shot_damage). 명중한 타일 목록."""
+        game = self.game
+        b = game.balance
+        m = game.map
+        rng = game.rng
+        batteries = self.batteries()
+        hits = []
+        if not batteries:
+            return hits
+
+        # 1) 현재 배치 기준 일괄 조준
+        foes = {}       # 진영 → (적 병 {맵 인덱스: 타일}, 그 키 집합)
+        aim = self._aim
+        aims = []
+        for t, owner, mask in batteries:
+            entry = foes.get(owner)
+            if entry is None:
+                positions = self._foes(owner)
+                entry = foes[owner] = (positions, set(positions))
+            aims.append(aim(mask, *entry))
+
+        # 2) 순서대로 사격 (쓰러진 타일을 노리던 포대만 다시 조준)
+        killed = set()
+        for (t, owner, mask), j in zip(batteries, aims):
+            if j in killed:
+                j = aim(mask, *foes[owner])
+            if j < 0:
+                continue
+            if rng.random() < b.hit_chance:
+                target = m.tile_by_index(j)
+                target.unit.take_damage(b.shot_damage)
+                if target.unit.health <= 0:
+                    target.remove_unit()
+                    killed.add(j)
+                    for _, foe_set in foes.values():
+                        foe_set.discard(j)
+                hits.append(target)
+        return hits
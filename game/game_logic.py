@@ -1,152 +1,143 @@
 import random
 from game.hex_map import HexMap
+from game.balance import DEFAULT_BALANCE
+from game.capture import CaptureSystem
+from game.compact_map import CompactHexMap
+from game.fire import FireSystem
+from game.healing import HealingSystem
+from game.movement import MovementSystem
+from game.pathfinding import PathService
 from game.player import Player
+from game.scheduler import (Scheduler, PHASE_COOLDOWN, PHASE_MINING, PHASE_FIRE,
+                            PHASE_HEAL, PHASE_SHOT)
+from game.visibility import VisibilitySystem
 
 class Game:
-    def __init__(self):
-        self.map = HexMap(size=6)
-        self.players = {'ally': Player('ally'), 'enemy': Player('enemy')}
-        self.heal_queue = []   # [(unit, hospital_tile, timer)]
-        self.fire_timer = 0.0
-        self.recent_shots = []  # [[target_tile, timer], ...]
+    def __init__(self, map_size=6, compact_map=False, seed=None, balance=None):
+        # seed: 이 판의 난수 스트림 (맵 생성/채굴 금액/포격 명중).
+        # 생략하면 전역 random에서 뽑으므로 random.seed()로도 재현되고,
+        # 어느 경우든 self.seed만 있으면 리플레이로 같은 판을 다시 돌릴 수 있다.
+        if seed is None:
+            seed = random.getrandbits(63)
+        self.seed = seed
+        self.rng = random.Random(seed)
+        self.balance = balance if balance is not None else DEFAULT_BALANCE
+        # compact_map=True: 큰 맵용 배열 기반(SoA) 저장소
+        map_cls = CompactHexMap if compact_map else HexMap
+        self.map = map_cls(size=map_size, rng=self.rng)
+        self.players = {'ally': Player('ally', self.balance), 'enemy': Player('enemy', self.balance)}
+        self.paths = PathService(self.map)     # A* + 경로 캐시, 이동 중 재계획
+        self.moves = MovementSystem(self)      # 진행 중 병 이동 (moves.update(dt))
+        self.captures = CaptureSystem(self)    # 남의 타일 위 병의 점령 진행 (captures.update(dt))
+        self.fire = FireSystem(self)           # 셋포인트 일괄 조준/사격 (포격 이벤트에서 호출)
+        self.vision = VisibilitySystem(self)   # 진영별 시야 (서버 전송 필터)
+        self.recent_shots = {}  # {shot_id: target_tile} (0.5초 뒤 만료)
+        self._next_shot_id = 0
+
+        # 시간 기반 규칙은 모두 스케줄러 이벤트로 처리
+        self.scheduler = Scheduler()
+        self._mining = {}       # (q, r) → 채굴 완료 이벤트
+        self._cooldowns = {}    # (q, r) → 쿨다운 만료 이벤트
+        self._dirty_gold = {}   # 유닛이 바뀐 금광 (다음 틱 채굴 단계에서 판정)
+        self.map.unit_index.watchers.append(self._on_unit_change)
+        self.scheduler.schedule(self.balance.fire_interval, PHASE_FIRE, self._process_setpoint_fire)
+        self.healing = HealingSystem(self)     # 보건소 환자별 회복 이벤트 (send_to_hospital)
 
     # =========================================================
-    # 메인 업데이트: visual_main에서 매 프레임 dt로 호출
+    # 메인 업데이트: visual_main / 서버(Match)에서 dt로 호출
+    # 시간 경과는 스케줄러가 관리하고, 이번 틱에 만기된 이벤트만
+    # 기존 시스템 순서(쿨다운 → 채굴 → 포격 → 회복 → 폭발 효과)대로 실행한다.
     # =========================================================
     def update_systems(self, dt=1.0):
-        self._update_gold_cooldowns(dt)
-        self._process_gold_mining(dt)
-        self._process_setpoint_fire(dt)
-        self._process_healing(dt)
-        self._update_shot_effects(dt)
+        sched = self.scheduler
+        sched.begin_tick(dt)
+        sched.run_due(PHASE_COOLDOWN)
+        self._sync_gold_tiles()
+        sched.run_due(PHASE_MINING)
+        sched.run_due(PHASE_FIRE)
+        sched.run_due(PHASE_HEAL)
+        sched.run_due(PHASE_SHOT)
 
     # -------------------------------------------------
-    # 헥스 거리 계산 (axial)
+    # 금광: 쿨다운 만료 / 채굴 5초 완료가 이벤트
     # -------------------------------------------------
-    def _hex_distance(self, q1, r1, q2, r2):
-        dq = q1 - q2
-        dr = r1 - r2
-        ds = -(q1 + r1) - (-(q2 + r2))
-        return max(abs(dq), abs(dr), abs(ds))
-
-    # -------------------------------------------------
-    # 금광 쿨다운
-    # -------------------------------------------------
-    def _update_gold_cooldowns(self, dt):
-        for t in self.map.tiles.values():
-            if t.gold_cooldown > 0:
-                t.gold_cooldown -= dt
-                if t.gold_cooldown < 0:
-                    t.gold_cooldown = 0
-
-    # -------------------------------------------------
-    # 병 유닛이 금광에서 채굴 (시각화를 위한 t.gold_timer 유지)
-    # -------------------------------------------------
-    def _process_gold_mining(self, dt):
-        for t in self.map.tiles.values():
-            if t.terrain == 'gold' and t.unit and t.unit.name == 'Soldier':
-                if t.gold_cooldown <= 0:
-                    t.gold_timer = getattr(t, "gold_timer", 0.0) + dt
-                    if t.gold_timer >= 5.0:
-                        amount = random.randint(50, 2000)
-                        owner = t.unit.owner
-                        self.players[owner].money += amount
-                        t.gold_cooldown = 12.0
-                        t.gold_amount = amount  # 시각화용
-                        t.gold_timer = 0.0
-                        # print(f"[{owner}] mined {amount} gold!")
-                else:
-                    t.gold_timer = 0.0
-            else:
-                if hasattr(t, "gold_timer"):
-                    if not (t.terrain == 'gold' and t.unit and t.unit.name == 'Soldier'):
-                        t.gold_timer = 0.0
-
-    # -------------------------------------------------
-    # 셋포인트 포격 (가까운 병 우선 + 경계 우선, Tile set 사용하지 않도록 수정)
-    # -------------------------------------------------
-    def _process_setpoint_fire(self, dt):
-        self.fire_timer += dt
-        if self.fire_timer < 1.0:
+    def _on_unit_change(self, tile):
+        if tile.terrain == 'gold':
+            self._dirty_gold[(tile.q, tile.r)] = tile
+
+    def _sync_gold_tiles(self):
+        """
+        유닛이 바뀐 금광만 채굴 시작/중단을 판정한다.
+        이전처럼 채굴 단계 시점에 병이 있으면 이번 틱 시작부터 시간을 센다.
+        """
+        if not self._dirty_gold:
             return
-        self.fire_timer = 0.0
-
-        for t in self.map.tiles.values():
-            u = t.unit
-            if not u or not u.is_setpoint:
-                continue
-
-            # 사거리 2 후보 수집 (Tile을 set에 넣지 말고 좌표 튜플로 중복 제거)
-            ring1 = self.map.neighbors(t.q, t.r)  # 거리 1
-            ring2_list = []
-            for nb in ring1:
-                ring2_list.extend(self.map.neighbors(nb.q, nb.r))  # 거리 2
-
-            seen = set()  # {(q,r)}
-            candidates = []  # (dist, -priority, tile)
-
-            def consider_tile(tile_obj):
-                key = (tile_obj.q, tile_obj.r)
-                if key in seen: 
-                    return
-                seen.add(key)
-                if tile_obj.unit and tile_obj.unit.name == "Soldier" and tile_obj.unit.owner != u.owner:
-                    dist = self._hex_distance(t.q, t.r, tile_obj.q, tile_obj.r)
-                    priority = 1 if getattr(tile_obj, "boundary", False) else 0  # 경계 우선
-                    candidates.append((dist, -priority, tile_obj))
-
-            for nb in ring1:
-                consider_tile(nb)
-            for nb2 in ring2_list:
-                consider_tile(nb2)
-
-            if not candidates:
-                continue
-
-            candidates.sort(key=lambda x: (x[0], x[1]))  # 거리 우선, 그다음 경계 우선
-            target = candidates[0][2]
-
-            # 명중 확률 40%
-            if random.random() < 0.4:
-                target.unit.take_damage(5)
-                if target.unit.health <= 0:
-                    target.unit = None
-                # 폭발 시각 효과(0.5초)
-                self.recent_shots.append([target, 0.5])
+        dirty = self._dirty_gold
+        self._dirty_gold = {}
+        for key, t in dirty.items():
+            mining = self._mining.get(key)
+            soldier = t.unit is not None and t.unit.name == 'Soldier'
+            if not soldier or t.gold_cooldown > 0:
+                if mining is not None:
+                    mining.cancel()
+                    del self._mining[key]
+            elif mining is None:
+                sched = self.scheduler
+                self._mining[key] = sched.schedule_at(
+                    sched.tick_start + self.balance.mining_time, PHASE_MINING, self._finish_mining, t,
+                    rank=self.map.gold_tiles.index(t))
+
+    def _finish_mining(self, t):
+        del self._mining[(t.q, t.r)]
+        b = self.balance
+        amount = self.rng.randint(b.gold_payout_min, b.gold_payout_max)
+        owner = t.unit.owner
+        self.players[owner].money += amount
+        t.gold_cooldown = b.gold_cooldown
+        t.gold_amount = amount  # 시각화용
+        self._cooldowns[(t.q, t.r)] = self.scheduler.schedule(
+            b.gold_cooldown, PHASE_COOLDOWN, self._end_gold_cooldown, t)
+        # print(f"[{owner}] mined {amount} gold!")
+
+    def _end_gold_cooldown(self, t):
+        del self._cooldowns[(t.q, t.r)]
+        t.gold_cooldown = 0
+        # 쿨다운이 끝난 틱에 병이 서 있으면 바로 채굴을 다시 시작
+        self._dirty_gold[(t.q, t.r)] = t
+
+    def gold_cooldown_left(self, t) -> float:
+        """금광 쿨다운 남은 시간(초). 표시/직렬화용."""
+        ev = self._cooldowns.get((t.q, t.r))
+        return max(0.0, ev.when - self.scheduler.now) if ev is not None else 0.0
+
+    def gold_mining_progress(self, t) -> float:
+        """현재 채굴 진행 시간(초, 0~mining_time). 표시/직렬화용."""
+        ev = self._mining.get((t.q, t.r))
+        return max(0.0, self.balance.mining_time - (ev.when - self.scheduler.now)) if ev is not None else 0.0
 
     # -------------------------------------------------
-    # (선택) 전투 후 보건소 귀환 대기열 등록
+    # 셋포인트 포격 (가까운 병 우선 + 경계 우선, 조준/사격은 Game.fire)
     # -------------------------------------------------
-    def send_to_hospital(self, unit):
-        for t in self.map.tiles.values():
-            if t.unit and t.unit.is_medical and t.unit.owner == unit.owner:
-                self.heal_queue.append((unit, t, 0.0))
-                break
+    def _process_setpoint_fire(self):
+        # fire_interval(기본 1초)마다 (이전 포격 틱의 끝에서부터)
+        b = self.balance
+        self.scheduler.schedule(b.fire_interval, PHASE_FIRE, self._process_setpoint_fire)
+        for target in self.fire.volley():
+            # 폭발 시각 효과(0.5초)
+            self._add_shot(target)
 
     # -------------------------------------------------
-    # 보건소 회복: 3초당 HP +1 (최대 20)
+    # (선택) 전투 후 보건소 귀환 (회복은 Game.healing)
     # -------------------------------------------------
-    def _process_healing(self, dt):
-        done = []
-        for i, (u, hosp, timer) in enumerate(self.heal_queue):
-            if not hosp.unit or not hosp.unit.is_medical:
-                done.append(i)
-                continue
-            timer += dt
-            if timer >= 3.0:
-                u.health = min(20, u.health + 1)
-                timer = 0.0
-            if u.health >= 20:
-                done.append(i)
-            self.heal_queue[i] = (u, hosp, timer)
-        for i in reversed(done):
-            self.heal_queue.pop(i)
+    def send_to_hospital(self, unit):
+        return self.healing.admit(unit)
 
     # -------------------------------------------------
-    # 폭발 링 시각 효과 타이머 관리
+    # 폭발 링 시각 효과 (0.5초 뒤 만료 이벤트로 제거)
     # -------------------------------------------------
-    def _update_shot_effects(self, dt):
-        for shot in list(self.recent_shots):
-            shot[1] -= dt
-            if shot[1] <= 0:
-                self.recent_shots.remove(shot)
+    def _add_shot(self, target):
+        shot_id = self._next_shot_id
+        self._next_shot_id += 1
+        self.recent_shots[shot_id] = target
+        self.scheduler.schedule_at(self.scheduler.tick_start + 0.5, PHASE_SHOT,
+                                   self.recent_shots.pop, shot_id)
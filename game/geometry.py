@@ -0,0 +1,156 @@
+"""
+헥스 화면 좌표 변환 (visual_main / client_main / client 공용, pygame 비의존).
+
+방향(orientation)은 중심 좌표식과 꼭짓점이 항상 같은 쌍으로 쓰인다.
+    FLAT  : x = size * 1.5 * q,        y = size * √3 * (r + q/2),   꼭짓점 0°, 60°, ...
+    POINTY: x = size * √3 * (q + r/2), y = size * 1.5 * r,          꼭짓점 -30°, 30°, ...
+세 클라이언트는 FLAT 중심식을 써 왔으므로 기본값은 FLAT.
+픽셀 → 타일은 중심식의 역변환 후 큐브 반올림이라 가장 가까운 중심을 O(1)로 찾는다.
+"""
+import math
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Tuple
+
+SQRT3 = math.sqrt(3)
+
+FLAT = "flat"
+POINTY = "pointy"
+
+
+# -------------------------------------------------
+# 헥스 거리 (axial)
+# -------------------------------------------------
+def hex_distance(q1, r1, q2, r2):
+    dq = q1 - q2
+    dr = r1 - r2
+    ds = -(q1 + r1) - (-(q2 + r2))
+    return max(abs(dq), abs(dr), abs(ds))
+
+
+# -------------------------------------------------
+# 타일 ↔ 픽셀
+# -------------------------------------------------
+def _center(q, r, size, orientation):
+    if orientation == FLAT:
+        return size * 1.5 * q, size * (SQRT3 * (r + q / 2))
+    return size * (SQRT3 * (q + r / 2)), size * 1.5 * r
+
+
+def axial_to_pixel(q, r, size, origin=(0, 0), orientation=FLAT) -> Tuple[int, int]:
+    x, y = _center(q, r, size, orientation)
+    return int(origin[0] + x), int(origin[1] + y)
+
+
+def cube_round(fq, fr) -> Tuple[int, int]:
+    """실수 axial 좌표 → 가장 가까운 정수 타일 (q + r + s = 0 유지)."""
+    fs = -fq - fr
+    q, r, s = round(fq), round(fr), round(fs)
+    dq, dr, ds = abs(q - fq), abs(r - fr), abs(s - fs)
+    if dq > dr and dq > ds:
+        q = -r - s
+    elif dr > ds:
+        r = -q - s
+    return int(q), int(r)
+
+
+def pixel_to_axial(x, y, size, origin=(0, 0), orientation=FLAT) -> Tuple[int, int]:
+    x -= origin[0]
+    y -= origin[1]
+    if orientation == FLAT:
+        fq = (2.0 / 3.0 * x) / size
+        fr = (-1.0 / 3.0 * x + SQRT3 / 3.0 * y) / size
+    else:
+        fq = (SQRT3 / 3.0 * x - 1.0 / 3.0 * y) / size
+        fr = (2.0 / 3.0 * y) / size
+    return cube_round(fq, fr)
+
+
+# -------------------------------------------------
+# 폴리곤: (size, 방향)별 꼭짓점 오프셋을 한 번만 계산
+# -------------------------------------------------
+@lru_cache(maxsize=None)
+def corner_offsets(size, orientation=FLAT) -> Tuple[Tuple[float, float], ...]:
+    start = 0 if orientation == FLAT else -30
+    return tuple((size * math.cos(math.radians(start + 60 * i)),
+                  size * math.sin(math.radians(start + 60 * i))) for i in range(6))
+
+
+def hex_polygon(cx, cy, size, orientation=FLAT) -> List[Tuple[float, float]]:
+    return [(cx + dx, cy + dy) for dx, dy in corner_offsets(size, orientation)]
+
+
+# -------------------------------------------------
+# 일괄 변환
+# -------------------------------------------------
+def centers_many(coords: Iterable[Tuple[int, int]], size, origin=(0, 0),
+                 orientation=FLAT) -> List[Tuple[int, int]]:
+    ox, oy = origin
+    out = []
+    for q, r in coords:
+        x, y = _center(q, r, size, orientation)
+        out.append((int(ox + x), int(oy + y)))
+    return out
+
+
+def pick_many(points: Iterable[Tuple[float, float]], size, origin=(0, 0),
+              orientation=FLAT) -> List[Tuple[int, int]]:
+    return [pixel_to_axial(x, y, size, origin, orientation) for x, y in points]
+
+
+class HexLayout:
+    """
+    원점/확대율/방향이 정해진 화면 배치.
+    타일 중심과 타일 폴리곤(inset 별)을 캐시하고, set_view()로 원점이나 확대율이 바뀌면 비운다.
+    pick()은 맵 반지름 안이면 (q, r), 밖이면 None.
+    """
+
+    def __init__(self, size, origin=(0, 0), radius=None, zoom=1.0, orientation=FLAT):
+        self.base_size = size
+        self.origin = origin
+        self.radius = radius          # None 이면 맵 범위 검사 생략
+        self.zoom = zoom
+        self.orientation = orientation
+        self._centers: Dict[Tuple[int, int], Tuple[int, int]] = {}
+        self._polys: Dict[Tuple[int, int, int], List[Tuple[float, float]]] = {}
+
+    @property
+    def size(self):
+        return self.base_size * self.zoom
+
+    def set_view(self, origin=None, zoom=None):
+        if origin is not None:
+            self.origin = origin
+        if zoom is not None:
+            self.zoom = zoom
+        self._centers.clear()
+        self._polys.clear()
+
+    def center(self, q, r) -> Tuple[int, int]:
+        c = self._centers.get((q, r))
+        if c is None:
+            c = self._centers[(q, r)] = axial_to_pixel(q, r, self.size, self.origin, self.orientation)
+        return c
+
+    def polygon(self, q, r, inset=1) -> List[Tuple[float, float]]:
+        """타일 외곽 폴리곤 (반지름 size - inset). 그리기 전용이라 결과를 고치지 말 것."""
+        key = (q, r, inset)
+        p = self._polys.get(key)
+        if p is None:
+            cx, cy = self.center(q, r)
+            p = self._polys[key] = hex_polygon(cx, cy, self.size - inset, self.orientation)
+        return p
+
+    def centers(self, coords) -> List[Tuple[int, int]]:
+        return [self.center(q, r) for q, r in coords]
+
+    def contains(self, q, r) -> bool:
+        n = self.radius
+        return n is None or max(abs(q), abs(r), abs(q + r)) <= n
+
+    def pick(self, pos) -> Optional[Tuple[int, int]]:
+        q, r = pixel_to_axial(pos[0], pos[1], self.size, self.origin, self.orientation)
+        return (q, r) if self.contains(q, r) else None
+
+    def pick_many(self, points) -> List[Optional[Tuple[int, int]]]:
+        picked = pick_many(points, self.size, self.origin, self.orientation)
+        return [qr if self.contains(*qr) else None for qr in picked]
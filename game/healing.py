@@ -0,0 +1,71 @@
+"""
+보건소 회복 (Game.healing). 환자마다 스케줄러 이벤트 하나로 heal_interval마다 HP +1 (최대 heal_max).
+
+- 환자는 유닛 객체 자체(id)로 구분하므로 같은 유닛을 두 번 보내도 한 번만 등록된다.
+- 보건소 타일별로 환자를 묶어 두고, 보건소 칸의 유닛이 바뀌면(UnitIndex 알림) 그 보건소
+  환자만 바로 내보낸다. 회복 중인 유닛이 없으면 틱 비용은 0이다.
+"""
+from game.scheduler import PHASE_HEAL
+
+
+class HealingSystem:
+    def __init__(self, game):
+        self.game = game
+        self._patients = {}         # id(unit) → [unit, 보건소 타일, 다음 회복 이벤트] (등록 순)
+        self._wards = {}            # 보건소 (q, r) → {id(unit), ...}
+        game.map.unit_index.watchers.append(self._on_unit_change)
+
+    def __len__(self):
+        return len(self._patients)
+
+    def __contains__(self, unit):
+        return id(unit) in self._patients
+
+    def patients(self):
+        """[(유닛, 보건소 타일)] 등록 순."""
+        return [(u, hosp) for u, hosp, _ in self._patients.values()]
+
+    def admit(self, unit) -> bool:
+        """unit을 같은 진영 보건소 환자로 등록. 이미 환자이거나 보건소가 없으면 False."""
+        key = id(unit)
+        if key in self._patients:
+            return False
+        hosp = self.game.map.unit_index.first(unit.owner, "Medical")
+        if hosp is None:
+            return False
+        ev = self.game.scheduler.schedule(self.game.balance.heal_interval, PHASE_HEAL, self._heal_tick, key)
+        self._patients[key] = [unit, hosp, ev]
+        self._wards.setdefault((hosp.q, hosp.r), set()).add(key)
+        return True
+
+    def discharge(self, unit):
+        self._drop(id(unit))
+
+    def _drop(self, key):
+        entry = self._patients.pop(key, None)
+        if entry is None:
+            return
+        _, hosp, ev = entry
+        ev.cancel()
+        ward = self._wards.get((hosp.q, hosp.r))
+        if ward is not None:
+            ward.discard(key)
+            if not ward:
+                del self._wards[(hosp.q, hosp.r)]
+
+    def _heal_tick(self, key):
+        u = self._patients[key][0]
+        b = self.game.balance
+        u.health = min(b.heal_max, u.health + 1)
+        if u.health < b.heal_max:
+            self._patients[key][2] = self.game.scheduler.schedule(b.heal_interval, PHASE_HEAL,
+                                                                  self._heal_tick, key)
+        else:
+            self._drop(key)
+
+    def _on_unit_change(self, tile):
+        ward = self._wards.get((tile.q, tile.r))
+        if ward is not None and not (tile.unit and tile.unit.is_medical):
+            # 보건소가 파괴/회수됨: 그 보건소 환자 전부 퇴원
+            for key in list(ward):
+                self._drop(key)
@@ -1,32 +1,115 @@
 import random
-from typing import Dict, Tuple
+from typing import Callable, Dict, List, Optional, Tuple
 from game.tile import Tile
 from game.unit import create_pinpoint
+from game.unit_index import UnitIndex
+
+RING_DEPTH = 4      # 미리 계산하는 링 거리 (셋포인트 사거리 2, 배치 반경 4)
+
+DIRECTIONS = ((+1, 0), (+1, -1), (0, -1), (-1, 0), (-1, +1), (0, +1))
+
+
+def axial_range(size):
+    """반지름 size 육각 맵의 (q, r) 좌표를 고정된 순서로 생성."""
+    for q in range(-size, size + 1):
+        r1 = max(-size, -q - size)
+        r2 = min(size, -q + size)
+        for r in range(r1, r2 + 1):
+            yield q, r
+
 
 class HexMap:
-    def __init__(self, size: int = 6):
+    def __init__(self, size: int = 6, rng: Optional[random.Random] = None):
         self.size = size
+        self.rng = rng if rng is not None else random.Random()   # 금광 배치용 난수
         self.tiles: Dict[Tuple[int, int], Tile] = {}
+        self.gold_tiles: List[Tile] = []    # 금광 타일 (틱 처리 대상)
+        self.version = 0                    # 소유/경계가 바뀔 때마다 증가 (렌더 캐시 무효화용)
+        self._boundary: Dict[str, set] = {} # 진영 → 경계 타일 인덱스 (set_owner가 주변만 갱신)
+        # 소유가 바뀐 직후 호출되는 콜백 f(tile) (예: Game의 점령 판정)
+        self.owner_watchers: List[Callable[[object], None]] = []
+        self.unit_index = UnitIndex(self)   # 진영/종류별 유닛 위치
         self._generate_map()
+        self._build_tables()
         self._setup_starting_ownership()
         self._place_pinpoints()
         self._place_gold_mines()
 
     def _generate_map(self):
-        for q in range(-self.size, self.size + 1):
-            r1 = max(-self.size, -q - self.size)
-            r2 = min(self.size, -q + self.size)
-            for r in range(r1, r2 + 1):
-                self.tiles[(q, r)] = Tile(q, r, owner='ally')
+        for q, r in axial_range(self.size):
+            self.tiles[(q, r)] = Tile(q, r, owner='ally')
+
+    # -------------------------------------------------
+    # 인접/링 테이블: 생성 시 한 번 계산해 두고 조회는 캐시된 튜플을 그대로 반환
+    # -------------------------------------------------
+    def _build_tables(self):
+        self._tile_list = list(self.tiles.values())
+        self._index = {(t.q, t.r): i for i, t in enumerate(self._tile_list)}
+        for t in self._tile_list:
+            t.unit_index = self.unit_index
+        self._nbr_idx = [
+            tuple(j for j in (self._index.get((t.q + dq, t.r + dr), -1) for dq, dr in DIRECTIONS) if j >= 0)
+            for t in self._tile_list
+        ]
+        n = len(self._tile_list)
+        self._nbr_cache: List[Optional[tuple]] = [None] * n
+        self._ring_cache: List[Optional[tuple]] = [None] * n
+        for i in range(n):
+            self._neighbor_tiles(i)
+            self._rings(i)
+
+    def index_of(self, q, r) -> int:
+        """(q, r)의 조밀 인덱스. 맵 밖이면 -1."""
+        return self._index.get((q, r), -1)
+
+    def tile_by_index(self, i):
+        return self._tile_list[i]
+
+    def neighbor_indices(self, i) -> tuple:
+        return self._nbr_idx[i]
+
+    def _neighbor_tiles(self, i):
+        nb = self._nbr_cache[i]
+        if nb is None:
+            tile = self.tile_by_index
+            nb = self._nbr_cache[i] = tuple(tile(j) for j in self.neighbor_indices(i))
+        return nb
+
+    def _bfs_rings(self, i, depth):
+        """
+        거리별 링 (rings[k] = 거리 k 타일들). 같은 링 안의 순서는
+        인접 방향 순서로 넓혀 가며 처음 발견된 순서.
+        """
+        tile = self.tile_by_index
+        seen = {i}
+        frontier = [i]
+        rings = [(tile(i),)]
+        for _ in range(depth):
+            nxt = []
+            for c in frontier:
+                for j in self.neighbor_indices(c):
+                    if j not in seen:
+                        seen.add(j)
+                        nxt.append(j)
+            rings.append(tuple(tile(j) for j in nxt))
+            frontier = nxt
+        return rings
+
+    def _rings(self, i):
+        """(rings, withins) – withins[k] = 거리 1..k 타일 (중심 제외, 가까운 순)."""
+        entry = self._ring_cache[i]
+        if entry is None:
+            rings = self._bfs_rings(i, RING_DEPTH)
+            withins = [()]
+            for k in range(1, RING_DEPTH + 1):
+                withins.append(withins[-1] + rings[k])
+            entry = self._ring_cache[i] = (tuple(rings), tuple(withins))
+        return entry
 
     def _setup_starting_ownership(self):
         for (q, r), tile in self.tiles.items():
             tile.owner = 'ally' if q < 0 else 'enemy'
-        for (q, r), tile in self.tiles.items():
-            for neighbor in self.neighbors(q, r):
-                if neighbor.owner != tile.owner:
-                    tile.boundary = True
-                    break
+        self.rebuild_boundaries()
 
     def _place_pinpoints(self):
         ally_q = min(q for q, _ in self.tiles.keys())
@@ -41,22 +124,79 @@ class HexMap:
         if not ally_candidates: ally_candidates = [t for t in self.tiles.values() if t.owner == 'ally']
         if not enemy_candidates: enemy_candidates = [t for t in self.tiles.values() if t.owner == 'enemy']
 
-        a_tile = random.choice(ally_candidates)
-        e_tile = random.choice(enemy_candidates)
+        a_tile = self.rng.choice(ally_candidates)
+        e_tile = self.rng.choice(enemy_candidates)
         for t in [a_tile, e_tile]:
             t.terrain = 'gold'
             t.gold_cooldown = 0
-            t.gold_amount = random.randint(50, 2000)
+            t.gold_amount = self.rng.randint(50, 2000)
             t.gold_timer = 0.0
+            self.gold_tiles.append(t)
 
     def get_tile(self, q, r):
         return self.tiles.get((q, r))
 
+    def set_owner(self, tile, owner):
+        """타일 소유 변경은 이 메서드로 (version 증가, 그 타일과 이웃 6칸의 경계만 다시 판정)."""
+        if tile.owner != owner:
+            i = self.index_of(tile.q, tile.r)
+            self._boundary.get(tile.owner, set()).discard(i)
+            tile.owner = owner
+            self.version += 1
+            self._refresh_boundary(i)
+            for j in self.neighbor_indices(i):
+                self._refresh_boundary(j)
+            for w in self.owner_watchers:
+                w(tile)
+
+    # -------------------------------------------------
+    # 경계: tile.boundary 플래그 + 진영별 경계 집합
+    # -------------------------------------------------
+    def _refresh_boundary(self, i):
+        tile = self.tile_by_index(i)
+        owner = tile.owner
+        at = self.tile_by_index
+        flag = any(at(j).owner != owner for j in self.neighbor_indices(i))
+        if tile.boundary != flag:
+            tile.boundary = flag
+        members = self._boundary.get(owner)
+        if members is None:
+            members = self._boundary[owner] = set()
+        if flag:
+            members.add(i)
+        else:
+            members.discard(i)
+
+    def rebuild_boundaries(self):
+        """모든 타일의 경계를 처음부터 다시 판정 (시작 시/검증용, O(맵))."""
+        self._boundary = {}
+        for i in range(len(self.tiles)):
+            self._refresh_boundary(i)
+
+    def boundary_tiles(self, owner):
+        """owner 진영의 경계 타일 (맵 인덱스 순 = tiles 순회 순서)."""
+        tile = self.tile_by_index
+        return [tile(i) for i in sorted(self._boundary.get(owner, ()))]
+
     def neighbors(self, q, r):
-        dirs = [(+1, 0), (+1, -1), (0, -1), (-1, 0), (-1, +1), (0, +1)]
-        res = []
-        for dq, dr in dirs:
-            nb = self.get_tile(q + dq, r + dr)
-            if nb:
-                res.append(nb)
-        return res
+        i = self.index_of(q, r)
+        return self._neighbor_tiles(i) if i >= 0 else ()
+
+    def ring(self, q, r, k):
+        """거리가 정확히 k인 타일들 (k <= RING_DEPTH면 캐시된 튜플)."""
+        i = self.index_of(q, r)
+        if i < 0:
+            return ()
+        if k <= RING_DEPTH:
+            return self._rings(i)[0][k]
+        return self._bfs_rings(i, k)[k]
+
+    def within(self, q, r, k):
+        """거리 1..k 타일들, 가까운 링부터 (중심 제외)."""
+        i = self.index_of(q, r)
+        if i < 0:
+            return ()
+        if k <= RING_DEPTH:
+            return self._rings(i)[1][k]
+        rings = self._bfs_rings(i, k)
+        return tuple(t for ring in rings[1:] for t in ring)
@@ -0,0 +1,175 @@
+from collections import deque
+
+from game.balance import DEFAULT_BALANCE
+from game.game_logic import Game
+from game.rules import can_place_unit_on_tile
+
+# 기본 규칙값 (매치별 값은 game.balance.step_time / capture_time)
+STEP_TIME = DEFAULT_BALANCE.step_time         # 적 진영으로 들어갈 때 한 칸 이동 시간(초)
+CAPTURE_TIME = DEFAULT_BALANCE.capture_time   # 적/아군 타일 점령에 필요한 시간(초)
+
+SIDES = ("ally", "enemy")
+UNIT_TYPES = ("soldier", "setpoint", "medical")
+REJECTED_HISTORY = 16       # 진영별로 기억해 두는 최근 거절 입력 seq 수
+
+
+class Match:
+    """
+    서버용 한 판(Game + 예비 유닛). 이동/점령 진행은 Game.moves / Game.captures.
+    visual_main의 pygame 루프가 하던 일을 헤드리스로 수행한다.
+    입력은 inputs 큐에 (side, cmd) 로 쌓이고 step()에서 일괄 적용된다.
+    """
+
+    def __init__(self, match_id=0, map_size=6, compact_map=False, seed=None, balance=None):
+        self.match_id = match_id
+        self.map_size = map_size
+        self.compact_map = compact_map
+        self.game = Game(map_size=map_size, compact_map=compact_map, seed=seed, balance=balance)
+        self.reserve = {side: {t: [] for t in UNIT_TYPES} for side in SIDES}
+        self.inputs = deque()      # [(side, cmd)] – 네트워크 스레드에서 append
+        self.input_seq = {}        # 진영 → 마지막으로 적용한 입력의 cmd["seq"] (클라이언트 지연 측정/예측용)
+        self.input_rejected = {}   # 진영 → 최근 거절된 입력 seq (deque). 적용 ≠ 성공이므로 따로 알린다
+        self.tick = 0
+        self.recorder = None       # game.replay.ReplayRecorder (입력/상태 해시 기록)
+
+    # =========================================================
+    # 고정 스텝 업데이트
+    # =========================================================
+    def step(self, dt):
+        while self.inputs:
+            side, cmd = self.inputs.popleft()
+            if self.recorder is not None:
+                self.recorder.record_input(self.tick, side, cmd)
+            ok, _ = self.apply_input(side, cmd)
+            if isinstance(cmd, dict) and "seq" in cmd:
+                self.input_seq[side] = cmd["seq"]
+                if not ok:
+                    rejected = self.input_rejected.get(side)
+                    if rejected is None:
+                        rejected = self.input_rejected[side] = deque(maxlen=REJECTED_HISTORY)
+                    rejected.append(cmd["seq"])
+        self.game.moves.update(dt)
+        self.game.captures.update(dt)
+        self.game.update_systems(dt)
+        self.tick += 1
+        if self.recorder is not None:
+            self.recorder.record_tick(self)
+
+    # -------------------------------------------------
+    # 입력 처리: (성공 여부, 사유)
+    # -------------------------------------------------
+    def apply_input(self, side, cmd):
+        if side not in SIDES or not isinstance(cmd, dict):
+            return False, "잘못된 입력"
+        handler = {
+            "purchase": self._cmd_purchase,
+            "place": self._cmd_place,
+            "move": self._cmd_move,
+            "recall": self._cmd_recall,
+        }.get(cmd.get("kind"))
+        if handler is None:
+            return False, "알 수 없는 명령"
+        try:
+            return handler(side, cmd)
+        except (KeyError, TypeError, ValueError) as e:
+            return False, str(e)
+
+    def _tile_at(self, q, r):
+        tile = self.game.map.get_tile(int(q), int(r))
+        if tile is None:
+            raise ValueError("맵 밖 좌표입니다.")
+        return tile
+
+    def _cmd_purchase(self, side, cmd):
+        unit_type = cmd["unit_type"]
+        if unit_type not in UNIT_TYPES:
+            raise ValueError("Invalid unit type")
+        u = self.game.players[side].purchase_unit(unit_type)
+        self.reserve[side][unit_type].append(u)
+        return True, "구매 완료"
+
+    def _cmd_place(self, side, cmd):
+        unit_type = cmd["unit_type"]
+        pool = self.reserve[side].get(unit_type)
+        if not pool:
+            return False, "예비 유닛이 없습니다."
+        tile = self._tile_at(cmd["q"], cmd["r"])
+        candidate = pool[0]
+        candidate.owner = side
+        ok, reason = can_place_unit_on_tile(self.game, candidate, tile)
+        if not ok:
+            return False, reason
+        tile.place_unit(candidate)
+        pool.pop(0)
+        return True, "설치 완료"
+
+    def _cmd_move(self, side, cmd):
+        src = self._tile_at(*cmd["from"])
+        dst = self._tile_at(*cmd["to"])
+        soldier = src.unit
+        if not soldier or soldier.owner != side or soldier.name != "Soldier":
+            return False, "이동할 병 유닛이 없습니다."
+        if dst.unit is not None:
+            return False, "목표 타일에 유닛이 있습니다."
+        self.game.moves.cancel(soldier)
+
+        # 같은 진영 내부 이동은 순간이동
+        if src.owner == side and dst.owner == side:
+            dst.place_unit(src.remove_unit())
+            return True, "순간이동 완료"
+
+        path = self.game.paths.find_path(src, dst)
+        if not path:
+            return False, "경로가 없습니다."
+        self.game.moves.start(soldier, path)
+        return True, "이동 시작"
+
+    def _cmd_recall(self, side, cmd):
+        tile = self._tile_at(cmd["q"], cmd["r"])
+        u = tile.unit
+        if not u or u.owner != side or u.is_pinpoint:
+            return False, "회수할 유닛이 없습니다."
+        tile.remove_unit()
+        self.game.moves.cancel(u)
+        if u.is_setpoint:
+            self.reserve[side]["setpoint"].append(u)
+        elif u.is_medical:
+            self.reserve[side]["medical"].append(u)
+        else:
+            self.reserve[side]["soldier"].append(u)
+        return True, "회수 완료"
+
+    # =========================================================
+    # client_main.py가 기대하는 state 딕셔너리
+    # =========================================================
+    def tile_record(self, tile):
+        rec = {"q": tile.q, "r": tile.r, "owner": tile.owner}
+        if tile.boundary:
+            rec["boundary"] = True
+        if tile.terrain != "land":
+            rec["terrain"] = tile.terrain
+        u = tile.unit
+        if u is not None:
+            rec["unit"] = {"name": u.name, "owner": u.owner, "health": u.health,
+                           "is_pinpoint": u.is_pinpoint}
+        remain = self.game.captures.remain(tile)
+        if remain is not None:
+            rec["capture_remain"] = round(remain, 1)
+        return rec
+
+    def players_state(self):
+        return {
+            side: {
+                "money": p.money,
+                "reserve": {t: len(pool) for t, pool in self.reserve[side].items()},
+            }
+            for side, p in self.game.players.items()
+        }
+
+    def to_state(self):
+        return {
+            "tick": self.tick,
+            "tiles": [self.tile_record(t) for t in self.game.map.tiles.values()],
+            "players": self.players_state(),
+            "battles": [],
+        }
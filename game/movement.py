@@ -0,0 +1,192 @@
+"""
+이동 시스템 (Game.moves). 진행 중인 모든 병 이동을 평행 배열로 들고 틱마다 한 번에 진행한다.
+
+규칙 (한 칸 = balance.step_time 초):
+- 누적 시간이 step_time을 넘은 이동들이 한 라운드에 한 칸씩 '다음 칸'을 요청한다.
+- 같은 칸을 여러 이동이 요청하면 먼저 명령된 이동(배열 앞쪽)이 차지하고 나머지는 대기.
+- 다음 칸에 '이동 중인' 유닛이 있으면 step_time 동안은 비켜 주기를 기다린다
+  (같은 틱 안에서도 앞 유닛이 움직이면 다음 라운드에 바로 따라간다).
+- 멈춰 있는 유닛이 중간 칸을 막으면 우회 경로를 다시 잡는다. 첫 우회는 캐시된 A*
+  (대부분 한 번으로 끝남), 같은 이동이 또 막히면 D* Lite 계획을 만들어 이후에는 점진 재계획.
+  다만 그사이 맵 전체에서 바뀐 칸이 많으면(Replanner.stale) 그 회차는 A*로 대신한다.
+  우회로가 없으면 멈추되, 막은 유닛이 이동 중이면 step_time마다 한 번씩
+  STALL_STEPS번까지 다시 시도한다 (혼잡한 행렬에서 바로 포기하지 않도록).
+  목표 칸이 멈춘 유닛에 막혀도 멈춘다 (stopped에 남음).
+- 이동 중 사망/회수된 유닛의 이동은 조용히 끝난다.
+라운드는 더 이상 움직이는 유닛이 없을 때까지 반복하므로 결과는 배열 순서(명령 순서)에만 의존한다.
+"""
+from array import array
+
+STALL_STEPS = 5     # 이동 중 유닛에 막혀 우회로도 없을 때 멈추기 전까지 다시 시도하는 횟수
+
+
+class MovementSystem:
+    def __init__(self, game):
+        self.game = game
+        # 슬롯별 평행 배열 (명령 순서 유지, 끝난 슬롯은 틱 끝에 한 번에 압축)
+        self._units = []            # Unit (끝난 슬롯은 None)
+        self._paths = []            # 타일 목록
+        self._planners = []         # 재계획기: None → 첫 우회 뒤 False → 두 번째 우회부터 D* Lite
+        self._idx = array('i')      # 현재 칸 (경로 인덱스)
+        self._acc = array('d')      # 다음 칸까지 누적 시간
+        self._wait = array('d')     # 이동 중 유닛 때문에 기다린 시간 (재시도마다 0)
+        self._stall = array('i')    # 우회로 없이 기다린 횟수
+        self._slot = {}             # id(unit) → 슬롯
+        self._dead = 0
+        self.stopped = []           # 이번 틱에 막혀서 멈춘 유닛 (UI 알림용)
+
+    def __len__(self):
+        return len(self._slot)
+
+    def is_moving(self, unit) -> bool:
+        return id(unit) in self._slot
+
+    def start(self, unit, path):
+        """path[0]에 서 있는 unit을 path[-1]까지 이동시킨다 (기존 이동은 취소)."""
+        self.cancel(unit)
+        if len(path) < 2:
+            return
+        self._slot[id(unit)] = len(self._units)
+        self._units.append(unit)
+        self._paths.append(path)
+        self._planners.append(None)
+        self._idx.append(0)
+        self._acc.append(0.0)
+        self._wait.append(0.0)
+        self._stall.append(0)
+
+    def cancel(self, unit):
+        i = self._slot.get(id(unit))
+        if i is not None:
+            self._end(i)
+
+    def progress(self):
+        """[(경로 인덱스, 누적 시간)] 명령 순서대로 (리플레이 상태 해시용)."""
+        return [(self._idx[i], self._acc[i]) for i, u in enumerate(self._units) if u is not None]
+
+    def _end(self, i, stopped=False):
+        unit = self._units[i]
+        del self._slot[id(unit)]
+        self._units[i] = None
+        self._paths[i] = None
+        self._planners[i] = None
+        self._dead += 1
+        if stopped:
+            self.stopped.append(unit)
+
+    def _compact(self):
+        keep = [i for i, u in enumerate(self._units) if u is not None]
+        self._units = [self._units[i] for i in keep]
+        self._paths = [self._paths[i] for i in keep]
+        self._planners = [self._planners[i] for i in keep]
+        self._idx = array('i', (self._idx[i] for i in keep))
+        self._acc = array('d', (self._acc[i] for i in keep))
+        self._wait = array('d', (self._wait[i] for i in keep))
+        self._stall = array('i', (self._stall[i] for i in keep))
+        self._slot = {id(u): i for i, u in enumerate(self._units)}
+        self._dead = 0
+
+    # -------------------------------------------------
+    # 틱 진행
+    # -------------------------------------------------
+    def update(self, dt):
+        self.stopped = []
+        if self._dead:
+            self._compact()
+        n = len(self._units)
+        if not n:
+            return
+        step = self.game.balance.step_time
+        acc = self._acc
+        for i in range(n):
+            acc[i] += dt
+
+        pending = [i for i in range(n) if acc[i] >= step]
+        while pending:
+            moved, pending = self._round(pending, step)
+            if not moved:
+                break
+        # 이번 틱에 끝내 움직이지 못한 이동은 한 칸 분량만 남기고 대기
+        wait = self._wait
+        for i in pending:
+            if self._units[i] is not None:
+                wait[i] += dt
+                acc[i] = step
+        if self._dead:
+            self._compact()
+
+    def _round(self, pending, step):
+        units, paths, idx, acc, wait = self._units, self._paths, self._idx, self._acc, self._wait
+        moving = self._slot
+        claims = {}
+        intents = []
+        retry = []
+        for i in pending:
+            unit = units[i]
+            if unit is None:
+                continue
+            path = paths[i]
+            k = idx[i]
+            cur = path[k]
+            if cur.unit is not unit:            # 사망/회수
+                self._end(i)
+                continue
+            nxt = path[k + 1]
+            occ = nxt.unit
+            if occ is not None:
+                if id(occ) in moving and wait[i] < step:
+                    retry.append(i)
+                    continue
+                if nxt is path[-1]:
+                    self._end(i, stopped=True)
+                    continue
+                path = self._reroute(i, cur)
+                if path is None:
+                    if id(occ) in moving and self._stall[i] < STALL_STEPS:
+                        self._stall[i] += 1
+                        wait[i] = 0.0
+                        retry.append(i)
+                    else:
+                        self._end(i, stopped=True)
+                    continue
+                nxt = path[1]
+                if nxt.unit is not None:        # 목표 칸만 남은 경우
+                    retry.append(i)
+                    continue
+            if nxt in claims:
+                retry.append(i)
+                continue
+            claims[nxt] = i
+            intents.append((i, cur, nxt))
+
+        for i, cur, nxt in intents:
+            nxt.place_unit(cur.remove_unit())
+            idx[i] += 1
+            acc[i] -= step
+            wait[i] = 0.0
+            self._stall[i] = 0
+            if idx[i] + 1 >= len(paths[i]):
+                self._end(i)
+            elif acc[i] >= step:
+                retry.append(i)
+        retry.sort()
+        return bool(intents), retry
+
+    def _reroute(self, i, cur):
+        planner = self._planners[i]
+        goal = self._paths[i][-1]
+        if planner and not planner.stale():
+            rest = planner.path_from(cur)
+        else:
+            # 첫 우회이거나 그사이 바뀐 칸이 많으면 A*가 싸다. 출발점에서 앞으로 탐색하므로
+            # 행렬에 갇힌 병은 (목표에서 거꾸로 도는 D* Lite와 달리) 금방 실패로 끝난다.
+            rest = self.game.paths.find_path(cur, goal)
+            if planner is None:
+                self._planners[i] = False
+            elif planner is False and rest is not None:
+                self._planners[i] = self.game.paths.replanner(cur, goal)
+        if rest is None:
+            return None
+        self._paths[i] = rest
+        self._idx[i] = 0
+        return rest
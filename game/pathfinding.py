@@ -0,0 +1,288 @@
+"""
+경로 탐색 서비스 (Game.paths).
+
+find_path(start, goal, step_cost=None)
+    헥스 거리 휴리스틱 A*. 통과 규칙은 rules.bfs_path와 같다:
+    중간 칸은 비어 있어야 하고 목표 칸만 예외.
+    결과는 (출발, 목표, 점유 epoch) 키의 LRU 캐시에 남는다. 배치/제거가 한 번이라도
+    일어나면 UnitIndex.epoch가 바뀌므로 캐시된 경로가 낡은 점유로 나오는 일은 없다.
+    비용 함수를 쓰면 키에 그 함수와 HexMap.version(소유 변경)도 넣는다.
+
+replanner(start, goal, step_cost=None) → Replanner
+    이동 중인 병 하나의 D* Lite 계획. 경로 위 칸이 막히면 그 사이 점유가 바뀐 칸만
+    반영해 현재 위치에서 다시 계획하므로 처음부터 탐색하지 않는다.
+
+칸 비용은 step_cost(tile) (>= 1, 기본 모두 1). 진영마다 다를 수 있으므로 (ownership_cost)
+호출마다 넘기고, 생략하면 서비스 기본값을 쓴다. 1보다 작으면 휴리스틱이 과대평가가 되어
+최단 경로를 보장하지 못한다. 비용 함수는 캐시 키가 되므로 진영별로 한 번 만들어 재사용한다.
+"""
+import heapq
+from collections import OrderedDict
+
+INF = float("inf")
+PATH_CACHE_SIZE = 256
+REPLAN_MAX_CHANGES = 64     # 마지막 계획 뒤 바뀐 칸이 이보다 많으면 점진 갱신 대신 새로 계획
+
+
+def ownership_cost(side, enemy=1.0, gold=1.0):
+    """진영/지형 비용: 아군 칸 1, 그 외 칸 enemy, 금광이면 gold배."""
+    def cost(tile):
+        c = 1.0 if tile.owner == side else enemy
+        return c * gold if tile.terrain == "gold" else c
+    return cost
+
+
+class PathService:
+    def __init__(self, hex_map, step_cost=None, cache_size=PATH_CACHE_SIZE):
+        self.map = hex_map
+        self.step_cost = step_cost      # 호출에서 step_cost를 생략했을 때의 기본값
+        self.cache_size = cache_size
+        self._cache = OrderedDict()     # (출발, 목표, epoch[, 비용, map.version]) → 맵 인덱스 튜플 / None
+        self.coords = [(t.q, t.r) for t in hex_map.tiles.values()]   # 맵 인덱스 순서
+        self.hits = 0
+        self.misses = 0
+
+    def h(self, a, b):
+        """맵 인덱스 a, b 사이 헥스 거리."""
+        aq, ar = self.coords[a]
+        bq, br = self.coords[b]
+        return max(abs(aq - bq), abs(ar - br), abs(aq + ar - bq - br))
+
+    def enter_cost(self, j, goal, cost=None):
+        """j 칸에 들어가는 비용 (cost: 칸 비용 함수, None이면 1). 유닛이 있으면(목표 칸 제외) INF."""
+        t = self.map.tile_by_index(j)
+        if t.unit is not None and j != goal:
+            return INF
+        return 1.0 if cost is None else cost(t)
+
+    # -------------------------------------------------
+    # A* + LRU
+    # -------------------------------------------------
+    def find_path(self, start_tile, goal_tile, step_cost=None):
+        """start → goal 타일 목록 (양 끝 포함). 경로가 없으면 None."""
+        m = self.map
+        s = m.index_of(start_tile.q, start_tile.r)
+        g = m.index_of(goal_tile.q, goal_tile.r)
+        cost = self.step_cost if step_cost is None else step_cost
+        if cost is None:
+            key = (s, g, m.unit_index.epoch)
+        else:
+            # 비용이 소유에 따라 달라지므로 소유 변경(version)도 키에
+            key = (s, g, m.unit_index.epoch, cost, m.version)
+        cache = self._cache
+        if key in cache:
+            cache.move_to_end(key)
+            self.hits += 1
+            idx = cache[key]
+        else:
+            self.misses += 1
+            idx = cache[key] = self._astar(s, g, cost)
+            if len(cache) > self.cache_size:
+                cache.popitem(last=False)
+        if idx is None:
+            return None
+        tile = m.tile_by_index
+        return [tile(i) for i in idx]
+
+    def _astar(self, s, g, cost=None):
+        if s == g:
+            return (s,)
+        nbrs = self.map.neighbor_indices
+        enter = self.enter_cost
+        h = self.h
+        dist = {s: 0.0}
+        prev = {s: None}
+        closed = set()
+        seq = 0
+        # 같은 f면 목표에 가까운(h 작은) 칸부터
+        heap = [(h(s, g), h(s, g), seq, s)]
+        while heap:
+            _, _, _, c = heapq.heappop(heap)
+            if c == g:
+                path = []
+                while c is not None:
+                    path.append(c)
+                    c = prev[c]
+                path.reverse()
+                return tuple(path)
+            if c in closed:
+                continue
+            closed.add(c)
+            dc = dist[c]
+            for j in nbrs(c):
+                if j in closed:
+                    continue
+                w = enter(j, g, cost)
+                if w == INF:
+                    continue
+                nd = dc + w
+                if nd < dist.get(j, INF):
+                    dist[j] = nd
+                    prev[j] = c
+                    hj = h(j, g)
+                    seq += 1
+                    heapq.heappush(heap, (nd + hj, hj, seq, j))
+        return None
+
+    def replanner(self, start_tile, goal_tile, step_cost=None):
+        return Replanner(self, start_tile, goal_tile,
+                         self.step_cost if step_cost is None else step_cost)
+
+
+class Replanner:
+    """
+    D* Lite (Koenig & Likhachev 2002). 목표에서 거꾸로 탐색해 g[칸] = 목표까지 비용을 유지한다.
+    병이 움직이면 km만 늘리고, 점유가 바뀐 칸은 그 이웃의 rhs만 다시 계산한다.
+    UnitIndex의 변경 이력이 이미 밀려났거나 바뀐 칸이 REPLAN_MAX_CHANGES보다 많으면
+    (많은 병이 동시에 움직이는 경우) 점진 갱신이 새 탐색보다 비싸므로 현재 위치에서 새로 계획한다.
+    비용 함수가 있으면 소유 변경(HexMap.version)도 칸 비용을 바꾸므로 그때도 새로 계획한다.
+    """
+
+    def __init__(self, service, start_tile, goal_tile, cost=None):
+        self.service = service
+        self.cost = cost
+        m = service.map
+        self.goal = m.index_of(goal_tile.q, goal_tile.r)
+        self._reset(m.index_of(start_tile.q, start_tile.r))
+
+    def _reset(self, start):
+        self.start = self.last = start
+        self.km = 0.0
+        self.g = {}
+        self.rhs = {self.goal: 0.0}
+        self.open = {}                  # 칸 → 현재 유효한 키 (힙의 나머지는 지연 삭제)
+        self.heap = []
+        self.epoch = self.service.map.unit_index.epoch
+        self.map_version = self.service.map.version
+        self._push(self.goal, self._key(self.goal))
+        self._compute()
+
+    def _key(self, s):
+        m = min(self.g.get(s, INF), self.rhs.get(s, INF))
+        return (m + self.service.h(self.start, s) + self.km, m)
+
+    def _push(self, s, key):
+        self.open[s] = key
+        heapq.heappush(self.heap, (key, s))
+
+    def _update(self, u):
+        goal = self.goal
+        if u != goal:
+            service = self.service
+            m = service.map
+            tile = m.tile_by_index
+            cost = self.cost
+            g = self.g
+            best = INF
+            for s in m.neighbor_indices(u):
+                gs = g.get(s, INF)
+                if gs == INF:
+                    continue
+                t = tile(s)
+                if t.unit is not None and s != goal:
+                    continue
+                v = gs + (1.0 if cost is None else cost(t))
+                if v < best:
+                    best = v
+            self.rhs[u] = best
+        self.open.pop(u, None)
+        if self.g.get(u, INF) != self.rhs.get(u, INF):
+            self._push(u, self._key(u))
+
+    def _top(self):
+        heap, open_ = self.heap, self.open
+        while heap:
+            key, s = heap[0]
+            if open_.get(s) == key:
+                return key, s
+            heapq.heappop(heap)
+        return None, None
+
+    def _compute(self):
+        g, rhs = self.g, self.rhs
+        service = self.service
+        nbrs = service.map.neighbor_indices
+        tile = service.map.tile_by_index
+        cost = self.cost
+        goal = self.goal
+        start = self.start
+        while True:
+            k_old, u = self._top()
+            if u is None:
+                break
+            if not (k_old < self._key(start) or rhs.get(start, INF) != g.get(start, INF)):
+                break
+            heapq.heappop(self.heap)
+            del self.open[u]
+            k_new = self._key(u)
+            if k_old < k_new:
+                self._push(u, k_new)
+            elif g.get(u, INF) > rhs.get(u, INF):
+                # 좋아진 경우는 u로 들어가는 간선만 보면 된다 (이웃의 rhs를 낮추기만 함)
+                gu = g[u] = rhs[u]
+                t = tile(u)
+                if t.unit is not None and u != goal:
+                    continue
+                via = gu + (1.0 if cost is None else cost(t))
+                for s in nbrs(u):
+                    if s != goal and via < rhs.get(s, INF):
+                        rhs[s] = via
+                        if g.get(s, INF) != via:
+                            self._push(s, self._key(s))
+                        else:
+                            self.open.pop(s, None)
+            else:
+                g[u] = INF
+                self._update(u)
+                for s in nbrs(u):
+                    self._update(s)
+
+    def stale(self) -> bool:
+        """마지막 계획 뒤 바뀐 칸이 너무 많아 path_from이 새로 계획하게 되는지."""
+        m = self.service.map
+        if self.cost is not None and m.version != self.map_version:
+            return True
+        changed = m.unit_index.changes_since(self.epoch)
+        return changed is None or len(changed) > REPLAN_MAX_CHANGES
+
+    def path_from(self, tile):
+        """현재 위치 tile → 목표 타일 목록 (양 끝 포함). 막혀서 갈 수 없으면 None."""
+        service = self.service
+        m = service.map
+        s = m.index_of(tile.q, tile.r)
+        changed = m.unit_index.changes_since(self.epoch)
+        if (changed is None or len(changed) > REPLAN_MAX_CHANGES
+                or (self.cost is not None and m.version != self.map_version)):
+            self._reset(s)
+        else:
+            self.km += service.h(self.last, s)
+            self.start = self.last = s
+            self.epoch = m.unit_index.epoch
+            nbrs = m.neighbor_indices
+            for v in changed:
+                for u in nbrs(v):
+                    self._update(u)
+            self._compute()
+
+        if self.rhs.get(s, INF) == INF:
+            return None
+        enter = service.enter_cost
+        cost = self.cost
+        g = self.g
+        path = [s]
+        seen = {s}
+        cur = s
+        while cur != self.goal:
+            best, nxt = INF, None
+            for j in m.neighbor_indices(cur):
+                c = enter(j, self.goal, cost)
+                if c != INF:
+                    v = c + g.get(j, INF)
+                    if v < best:
+                        best, nxt = v, j
+            if nxt is None or nxt in seen:
+                return None
+            path.append(nxt)
+            seen.add(nxt)
+            cur = nxt
+        return [m.tile_by_index(i) for i in path]
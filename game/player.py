@@ -1,15 +1,18 @@
-from typing import List
+from typing import List, Optional
+from game.balance import Balance, DEFAULT_BALANCE
 from game.unit import create_soldier, create_setpoint, create_medical
 
 class Player:
-    def __init__(self, name: str):
+    def __init__(self, name: str, balance: Optional[Balance] = None):
         self.name = name
-        self.money = 5000
+        self.balance = balance if balance is not None else DEFAULT_BALANCE
+        self.money = self.balance.start_money
         self.units_inventory: List = []
 
     def purchase_unit(self, unit_type: str):
+        b = self.balance
         if unit_type == 'soldier':
-            cost = 100
+            cost = b.soldier_cost
             if self.money < cost:
                 raise ValueError("Not enough money")
             self.money -= cost
@@ -18,18 +21,18 @@ class Player:
             return unit
 
         elif unit_type == 'setpoint':
-            cost = 500
+            cost = b.setpoint_cost
             if self.money < cost:
                 raise ValueError("Not enough money")
-            if sum(1 for u in self.units_inventory if u.is_setpoint) >= 3:
-                raise ValueError("Max 3 Setpoint units allowed")
+            if sum(1 for u in self.units_inventory if u.is_setpoint) >= b.max_setpoints:
+                raise ValueError(f"Max {b.max_setpoints} Setpoint units allowed")
             self.money -= cost
             unit = create_setpoint(self.name)
             self.units_inventory.append(unit)
             return unit
 
         elif unit_type == 'medical':
-            cost = 1000
+            cost = b.medical_cost
             if self.money < cost:
                 raise ValueError("Not enough money")
             if any(u.is_medical for u in self.units_inventory):
@@ -0,0 +1,155 @@
+"""
+리플레이: 시드 + 틱별 입력 로그로 한 판을 그대로 다시 돌린다.
+
+파일 형식(gzip 압축 JSON, REPLAY_VERSION=1):
+    {"version", "seed", "map_size", "compact_map", "dt", "ticks",
+     "balance": {기본값과 다른 밸런스 항목},
+     "inputs": [[tick, side, cmd], ...],        # 그 틱의 step() 시작 시 적용
+     "keyframes": [[tick, state_hash], ...]}    # 해당 틱 step() 직후 상태
+
+    python -m game.replay match_0.replay        # 재시뮬레이션 + 해시 검증
+"""
+import argparse
+import gzip
+import hashlib
+import json
+import time
+from collections import defaultdict
+
+from game.balance import DEFAULT_BALANCE
+from game.match import Match
+
+REPLAY_VERSION = 1
+KEYFRAME_EVERY = 100      # 상태 해시 기록 간격(틱)
+
+
+class ReplayMismatch(Exception):
+    def __init__(self, tick, expected, actual):
+        super().__init__(f"tick {tick}: state hash {actual} != {expected}")
+        self.tick = tick
+        self.expected = expected
+        self.actual = actual
+
+
+def state_hash(match) -> str:
+    """재현성 검증용 상태 해시 (타일/유닛/돈/예비 유닛/점령·이동 진행)."""
+    game = match.game
+    parts = [match.tick]
+    for t in game.map.tiles.values():
+        u = t.unit
+        parts.append((t.owner, t.boundary, t.terrain,
+                      u and (u.name, u.owner, u.health)))
+    for side, p in game.players.items():
+        parts.append((side, p.money, [len(pool) for pool in match.reserve[side].values()]))
+    parts.append(sorted((k, s["owner"], s["remain"]) for k, s in match.game.captures.states.items()))
+    parts.append(game.moves.progress())
+    return hashlib.md5(repr(parts).encode()).hexdigest()
+
+
+class Replay:
+    def __init__(self, seed, map_size=6, compact_map=False, dt=0.05,
+                 ticks=0, inputs=None, keyframes=None, balance=None):
+        self.seed = seed
+        self.map_size = map_size
+        self.compact_map = compact_map
+        self.dt = dt
+        self.ticks = ticks
+        self.inputs = inputs if inputs is not None else []
+        self.keyframes = keyframes if keyframes is not None else []
+        self.balance = balance if balance is not None else {}
+
+    def to_dict(self):
+        return {
+            "version": REPLAY_VERSION,
+            "seed": self.seed,
+            "map_size": self.map_size,
+            "compact_map": self.compact_map,
+            "dt": self.dt,
+            "ticks": self.ticks,
+            "balance": self.balance,
+            "inputs": self.inputs,
+            "keyframes": self.keyframes,
+        }
+
+    @classmethod
+    def from_dict(cls, d):
+        if d.get("version") != REPLAY_VERSION:
+            raise ValueError(f"지원하지 않는 리플레이 버전: {d.get('version')}")
+        return cls(d["seed"], d["map_size"], d["compact_map"], d["dt"], d["ticks"],
+                   d["inputs"], d["keyframes"], d.get("balance"))
+
+    def save(self, path):
+        with gzip.open(path, "wt", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f, separators=(",", ":"))
+
+    @classmethod
+    def load(cls, path):
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            return cls.from_dict(json.load(f))
+
+
+class ReplayRecorder:
+    """
+    첫 step() 전에 Match에 붙여 입력과 주기적 상태 해시를 기록한다.
+    Match.step()이 record_input / record_tick 을 호출한다.
+    """
+
+    def __init__(self, match, dt, keyframe_every=KEYFRAME_EVERY):
+        self.replay = Replay(match.game.seed, match.map_size, match.compact_map, dt,
+                             balance=match.game.balance.diff())
+        self.keyframe_every = keyframe_every
+        match.recorder = self
+
+    def record_input(self, tick, side, cmd):
+        self.replay.inputs.append([tick, side, cmd])
+
+    def record_tick(self, match):
+        self.replay.ticks = match.tick
+        if match.tick % self.keyframe_every == 0:
+            self.replay.keyframes.append([match.tick, state_hash(match)])
+
+
+def run_replay(replay, verify=True):
+    """
+    리플레이를 실시간 대기 없이 재시뮬레이션한다.
+    verify=True 이면 키프레임마다 상태 해시를 비교해 어긋나면 ReplayMismatch.
+    """
+    match = Match(map_size=replay.map_size, compact_map=replay.compact_map, seed=replay.seed,
+                  balance=DEFAULT_BALANCE.with_overrides(**replay.balance))
+    by_tick = defaultdict(list)
+    for tick, side, cmd in replay.inputs:
+        by_tick[tick].append((side, cmd))
+    expected = {tick: h for tick, h in replay.keyframes} if verify else {}
+
+    dt = replay.dt
+    for tick in range(replay.ticks):
+        pending = by_tick.get(tick)
+        if pending:
+            match.inputs.extend(pending)
+        match.step(dt)
+        h = expected.get(match.tick)
+        if h is not None:
+            actual = state_hash(match)
+            if actual != h:
+                raise ReplayMismatch(match.tick, h, actual)
+    return match
+
+
+def main():
+    ap = argparse.ArgumentParser(description="리플레이 재시뮬레이션/검증")
+    ap.add_argument("path")
+    ap.add_argument("--no-verify", action="store_true")
+    args = ap.parse_args()
+
+    replay = Replay.load(args.path)
+    t0 = time.perf_counter()
+    run_replay(replay, verify=not args.no_verify)
+    elapsed = time.perf_counter() - t0
+    sim = replay.ticks * replay.dt
+    print(f"[REPLAY] seed={replay.seed} ticks={replay.ticks} inputs={len(replay.inputs)} "
+          f"keyframes={len(replay.keyframes)} sim={sim:.1f}s wall={elapsed:.2f}s "
+          f"speed=x{sim / elapsed if elapsed > 0 else float('inf'):.0f}")
+
+
+if __name__ == "__main__":
+    main()
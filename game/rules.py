@@ -0,0 +1,70 @@
+from collections import deque
+
+from game.geometry import hex_distance
+
+
+# -------------------------------------------------
+# BFS (좌표 튜플 기반)
+# -------------------------------------------------
+def bfs_path(game, start_tile, goal_tile):
+    start = (start_tile.q, start_tile.r)
+    goal = (goal_tile.q, goal_tile.r)
+    if start == goal:
+        return [start_tile]
+
+    q = deque([start])
+    prev = {start: None}
+    while q:
+        cq, cr = q.popleft()
+        for nb in game.map.neighbors(cq, cr):
+            key = (nb.q, nb.r)
+            if key in prev:
+                continue
+            # 중간 칸은 비어 있어야 통과 (목표 칸은 key==goal일 때만 예외)
+            if nb.unit is not None and key != goal:
+                continue
+            prev[key] = (cq, cr)
+            if key == goal:
+                # 경로 복원
+                path_coords = []
+                cur = goal
+                while cur is not None:
+                    path_coords.append(cur)
+                    cur = prev[cur]
+                path_coords.reverse()
+                return [game.map.get_tile(q, r) for (q, r) in path_coords]
+            q.append(key)
+    return None
+
+
+# -------------------------------------------------
+# 규칙/도우미 (visual_main, 서버 공용)
+# -------------------------------------------------
+def find_pinpoint_tile(game, owner='ally'):
+    return game.map.unit_index.first(owner, "Pinpoint")
+
+
+def recompute_boundaries(game):
+    """경계 전체 재계산. 소유 변경은 HexMap.set_owner가 주변만 갱신하므로 검증/복구용."""
+    game.map.version += 1
+    game.map.rebuild_boundaries()
+
+
+def can_place_unit_on_tile(game, unit, tile):
+    if tile.unit is not None:
+        return False, "이미 유닛이 있습니다."
+    if tile.owner != unit.owner:
+        return False, "해당 진영 타일에만 설치할 수 있습니다."
+    for nb in game.map.neighbors(tile.q, tile.r):
+        if nb.unit and nb.unit.is_pinpoint and unit.name != "Soldier":
+            return False, "핀포인트 인접 타일에는 병 유닛만 설치 가능."
+    if unit.is_setpoint:
+        pp = find_pinpoint_tile(game, owner=unit.owner)
+        if not pp:
+            return False, "핀포인트를 찾을 수 없습니다."
+        if hex_distance(tile.q, tile.r, pp.q, pp.r) > 4:
+            return False, "셋포인트는 핀포인트로부터 4칸 이내에만 설치 가능."
+    if unit.is_medical:
+        if game.map.unit_index.first(unit.owner, "Medical") is not None:
+            return False, "보건소는 각 진영 1개만 설치 가능."
+    return True, "설치 가능"
@@ -0,0 +1,79 @@
+import heapq
+
+# 같은 틱 안에서의 실행 순서 (기존 update_systems의 시스템 순서와 동일)
+PHASE_COOLDOWN = 0
+PHASE_MINING = 1
+PHASE_FIRE = 2
+PHASE_HEAL = 3
+PHASE_SHOT = 4
+NUM_PHASES = 5
+
+# 누적 dt와 절대 시각의 반올림 차이 흡수용
+EPSILON = 1e-9
+
+
+class Timer:
+    __slots__ = ("when", "seq", "rank", "callback", "args", "active")
+
+    def __init__(self, when, seq, rank, callback, args):
+        self.when = when
+        self.seq = seq
+        self.rank = rank
+        self.callback = callback
+        self.args = args
+        self.active = True
+
+    def __lt__(self, other):
+        return (self.when, self.seq) < (other.when, other.seq)
+
+    def cancel(self):
+        self.active = False
+
+
+class Scheduler:
+    """
+    단계(phase)별 힙 기반 타이머.
+    update_systems가 begin_tick(dt) 후 단계 순서대로 run_due()를 부르면
+    그 틱에 만기된 이벤트만 실행된다 – 아무것도 만기되지 않으면 힙 top만 본다.
+    같은 틱에 만기된 이벤트는 rank 순(기본 0, 다음은 예약 순)으로 실행해
+    예전 전체 순회(맵 순서)와 같은 처리 순서 – 즉 같은 난수 소비 순서를 지킨다.
+    취소는 지연 삭제(active=False)로 처리한다.
+    """
+
+    def __init__(self):
+        self.now = 0.0          # 현재 틱 끝 시각 (= 누적 dt)
+        self.tick_start = 0.0   # 현재 틱 시작 시각
+        self._heaps = [[] for _ in range(NUM_PHASES)]
+        self._seq = 0
+
+    def schedule_at(self, when, phase, callback, *args, rank=0) -> Timer:
+        self._seq += 1
+        t = Timer(when, self._seq, rank, callback, args)
+        heapq.heappush(self._heaps[phase], t)
+        return t
+
+    def schedule(self, delay, phase, callback, *args, rank=0) -> Timer:
+        return self.schedule_at(self.now + delay, phase, callback, *args, rank=rank)
+
+    def begin_tick(self, dt):
+        self.tick_start = self.now
+        self.now += dt
+
+    def run_due(self, phase):
+        heap = self._heaps[phase]
+        limit = self.now + EPSILON
+        while heap and heap[0].when <= limit:
+            due = []
+            while heap and heap[0].when <= limit:
+                t = heapq.heappop(heap)
+                if t.active:
+                    due.append(t)
+            if len(due) > 1:
+                due.sort(key=lambda t: (t.rank, t.seq))
+            for t in due:
+                if t.active:
+                    t.active = False
+                    t.callback(*t.args)
+
+    def pending(self) -> int:
+        return sum(1 for h in self._heaps for t in h if t.active)
@@ -1,7 +1,10 @@
-from dataclasses import dataclass
-from typing import Optional
+from dataclasses import dataclass, field
+from typing import Optional, TYPE_CHECKING
 from game.unit import Unit
 
+if TYPE_CHECKING:
+    from game.unit_index import UnitIndex
+
 @dataclass
 class Tile:
     q: int
@@ -13,6 +16,7 @@ class Tile:
     boundary: bool = False      # 경계 타일 여부
     gold_cooldown: int = 0      # 금광 쿨다운(초)
     gold_amount: int = 0        # 다음 채굴 금액(50~2000)
+    unit_index: Optional["UnitIndex"] = field(default=None, repr=False, compare=False)
 
     # (선택) dict/set 키로 쓸 때 안전하게
     def __hash__(self) -> int:
@@ -28,10 +32,14 @@ class Tile:
         if not self.is_empty():
             raise ValueError(f"Tile({self.q},{self.r}) is not available for placement.")
         self.unit = unit
+        if self.unit_index is not None:
+            self.unit_index.add(self, unit)
 
     def remove_unit(self) -> Unit:
         if self.unit is None:
             raise ValueError("No unit to remove.")
         removed = self.unit
         self.unit = None
+        if self.unit_index is not None:
+            self.unit_index.discard(self, removed)
         return removed
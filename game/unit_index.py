@@ -0,0 +1,100 @@
+from collections import deque
+from typing import Callable, Dict, List, Optional, Tuple
+
+CHANGE_LOG_LEN = 4096   # 점유 변경 이력 길이 (경로 재계획이 따라잡을 수 있는 범위)
+
+
+class UnitIndex:
+    """
+    (진영, 유닛 이름) → 그 유닛이 서 있는 타일들.
+    Tile.place_unit / remove_unit 이 갱신하므로 조회에 맵 전체를 훑지 않는다.
+    버킷은 {맵 인덱스: 타일} 이라 결과를 맵 순서로 돌려줄 수 있다.
+    epoch 는 배치/제거마다 1씩 늘어나는 점유 버전이고, 최근 변경 칸은
+    changes_since()로 받아 갈 수 있다 (경로 캐시/재계획용).
+    """
+
+    def __init__(self, hex_map):
+        self._map = hex_map
+        self._buckets: Dict[Tuple[str, str], Dict[int, object]] = {}
+        self._versions: Dict[Tuple[str, str], int] = {}     # 버킷별 변경 횟수
+        # 배치/제거 직후 호출되는 콜백 f(tile) (예: Game의 금광 채굴 판정)
+        self.watchers: List[Callable[[object], None]] = []
+        self.epoch = 0
+        self._changes = deque(maxlen=CHANGE_LOG_LEN)   # [(epoch, 맵 인덱스)]
+
+    def add(self, tile, unit):
+        key = (unit.owner, unit.name)
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = self._buckets[key] = {}
+        i = self._map.index_of(tile.q, tile.r)
+        bucket[i] = tile
+        self._versions[key] = self._versions.get(key, 0) + 1
+        self._changed(i)
+        for w in self.watchers:
+            w(tile)
+
+    def discard(self, tile, unit):
+        i = self._map.index_of(tile.q, tile.r)
+        key = (unit.owner, unit.name)
+        bucket = self._buckets.get(key)
+        if bucket:
+            bucket.pop(i, None)
+        self._versions[key] = self._versions.get(key, 0) + 1
+        self._changed(i)
+        for w in self.watchers:
+            w(tile)
+
+    def _changed(self, i):
+        self.epoch += 1
+        self._changes.append((self.epoch, i))
+
+    def changes_since(self, epoch) -> Optional[set]:
+        """epoch 이후 점유가 바뀐 칸의 맵 인덱스들. 이력이 이미 밀려났으면 None."""
+        if epoch == self.epoch:
+            return set()
+        log = self._changes
+        if not log or log[0][0] > epoch + 1:
+            return None
+        out = set()
+        for e, i in reversed(log):
+            if e <= epoch:
+                break
+            out.add(i)
+        return out
+
+    # -------------------------------------------------
+    # 조회
+    # -------------------------------------------------
+    def first(self, owner, name) -> Optional[object]:
+        """진영별로 하나뿐인 유닛(핀포인트/보건소) 타일."""
+        bucket = self._buckets.get((owner, name))
+        if not bucket:
+            return None
+        return next(iter(bucket.values()))
+
+    def count(self, owner, name) -> int:
+        return len(self._buckets.get((owner, name), ()))
+
+    def version(self, owner, name) -> int:
+        """해당 진영/종류 버킷이 바뀔 때마다 늘어나는 값 (목록 캐시 무효화용)."""
+        return self._versions.get((owner, name), 0)
+
+    def positions(self, owner, name) -> Dict[int, object]:
+        """맵 인덱스 → 타일 (버킷 그대로: 배치/제거가 바로 반영되므로 읽기만 할 것)."""
+        return self._buckets.setdefault((owner, name), {})
+
+    def tiles(self, owner, name) -> List[object]:
+        """해당 진영/종류 유닛 타일들 (맵 순서)."""
+        bucket = self._buckets.get((owner, name))
+        if not bucket:
+            return []
+        return [bucket[i] for i in sorted(bucket)]
+
+    def tiles_of_name(self, name) -> List[object]:
+        """모든 진영의 해당 종류 유닛 타일들 (맵 순서)."""
+        merged = {}
+        for (owner, n), bucket in self._buckets.items():
+            if n == name:
+                merged.update(bucket)
+        return [merged[i] for i in sorted(merged)]
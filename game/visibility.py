@@ -0,0 +1,111 @@
+"""
+진영별 시야 (Game.vision). 서버가 플레이어마다 보이는 타일만 보내는 데 쓴다.
+
+- 자기 진영 타일은 항상 보인다.
+- 유닛은 자기 칸과 시야 반경(balance.*_sight) 안 타일을 밝힌다.
+
+진영마다 타일별로 "이 칸을 밝히는 유닛 수"를 세어 두고, UnitIndex 알림(배치/제거 =
+이동/설치/회수/사망)이 올 때 그 칸 유닛의 시야 범위만 빼고 더한다. 소유 변경은
+HexMap 알림으로 그 칸만 다시 본다. 그래서 비용은 바뀐 시야 범위 크기에 비례하고,
+맵 크기나 접속자 수와는 무관하다.
+
+보임 여부가 바뀌었을 수 있는 칸은 진영별로 모아 두었다가 drain(side)로 넘긴다
+(net_delta.ViewEncoder가 틱마다 가져감).
+"""
+
+
+class VisibilitySystem:
+    def __init__(self, game):
+        self.game = game
+        m = game.map
+        n = len(m.tiles)
+        self._cover = {side: [0] * n for side in game.players}   # 진영 → 칸별 밝히는 유닛 수
+        self._sources = {}      # 맵 인덱스 → 그 칸 유닛으로 세어 둔 (진영, 반경)
+        self._areas = {}        # (맵 인덱스, 반경) → 시야 칸 인덱스 (중심 포함)
+        self._flips = {side: {} for side in game.players}        # 진영 → 보임이 바뀐 (q, r)
+        for i in range(n):
+            if m.tile_by_index(i).unit is not None:
+                self._refresh(i)
+        for flips in self._flips.values():
+            flips.clear()
+        m.unit_index.watchers.append(self._on_unit_change)
+        m.owner_watchers.append(self._on_owner_change)
+
+    def sight(self, unit):
+        b = self.game.balance
+        if unit.name == "Soldier":
+            return b.soldier_sight
+        if unit.is_setpoint:
+            return b.setpoint_sight
+        return b.building_sight
+
+    def _area(self, i, radius):
+        key = (i, radius)
+        area = self._areas.get(key)
+        if area is None:
+            m = self.game.map
+            t = m.tile_by_index(i)
+            area = self._areas[key] = (i,) + tuple(m.index_of(nb.q, nb.r) for nb in m.within(t.q, t.r, radius))
+        return area
+
+    def _shine(self, source, i, delta):
+        side, radius = source
+        cover = self._cover.get(side)
+        if cover is None:
+            return
+        flips = self._flips[side]
+        tile = self.game.map.tile_by_index
+        for j in self._area(i, radius):
+            before = cover[j]
+            cover[j] = before + delta
+            if (before == 0) != (cover[j] == 0):
+                t = tile(j)
+                if t.owner != side:
+                    flips[(t.q, t.r)] = True
+
+    def _refresh(self, i):
+        unit = self.game.map.tile_by_index(i).unit
+        new = (unit.owner, self.sight(unit)) if unit is not None else None
+        old = self._sources.get(i)
+        if old == new:
+            return
+        if old is not None:
+            self._shine(old, i, -1)
+            del self._sources[i]
+        if new is not None:
+            self._shine(new, i, +1)
+            self._sources[i] = new
+
+    def _on_unit_change(self, tile):
+        self._refresh(self.game.map.index_of(tile.q, tile.r))
+
+    def _on_owner_change(self, tile):
+        # 옛/새 소유 진영 모두 이 칸의 보임 여부가 바뀌었을 수 있다 (유닛 정보도 함께)
+        for flips in self._flips.values():
+            flips[(tile.q, tile.r)] = True
+
+    # -------------------------------------------------
+    # 조회
+    # -------------------------------------------------
+    def is_visible(self, side, q, r) -> bool:
+        m = self.game.map
+        tile = m.get_tile(q, r)
+        if tile is None:
+            return False
+        if tile.owner == side:
+            return True
+        cover = self._cover.get(side)
+        return cover is not None and cover[m.index_of(q, r)] > 0
+
+    def visible_count(self, side) -> int:
+        """side가 보는 타일 수 (O(맵), 통계/검증용)."""
+        return sum(1 for (q, r) in self.game.map.tiles if self.is_visible(side, q, r))
+
+    def drain(self, side):
+        """지난 drain 이후 side 시야에서 보임 여부가 바뀌었을 수 있는 (q, r) 목록."""
+        flips = self._flips.get(side)
+        if not flips:
+            return []
+        out = list(flips)
+        flips.clear()
+        return out
@@ -1,14 +1,19 @@
 from game.game_logic import Game
-import time
+from game.unit import create_soldier
 
-game = Game()
+# 헤드리스 금광 채굴 확인: 실제 대기 없이 update_systems(dt)로 시간을 진행한다.
+# 성능 측정은 python -m bench
+DT = 0.05
+
+game = Game(seed=0)
 ally = game.players['ally']
+gold = next(t for t in game.map.gold_tiles if t.owner == 'ally' and t.unit is None)
+gold.place_unit(create_soldier('ally'))
 
 print("초기 아군 돈:", ally.money)
-game.collect_gold('ally')
-print("금광 수급 후 돈:", ally.money)
-
-for i in range(12):
-    game.update_cooldowns()
-    print(f"쿨다운 {i+1}초 경과")
-    time.sleep(0.05)  # 보기용(선택)
+b = game.balance
+steps_per_sec = round(1 / DT)
+for sec in range(int(b.mining_time + b.gold_cooldown) + 1):
+    for _ in range(steps_per_sec):
+        game.update_systems(DT)
+    print(f"{sec + 1}초 경과  돈: {ally.money}  쿨다운: {game.gold_cooldown_left(gold):.1f}s")
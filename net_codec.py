@@ -0,0 +1,467 @@
+# net_codec.py
+"""
+pickle 대신 쓰는 버전 있는 바이너리 코덱.
+
+게임 스냅샷 (little-endian)
+  헤더   <2sBBHIfBB : magic, 버전, phase, 맵 반지름, 타일 수, 남은 시간, 승자, 플레이어 수
+  타일   1바이트 (owner 2bit | terrain 2bit | boundary | blocked | unit | wall)
+         좌표는 axial_range(반지름) 순서로 암묵 – 저장하지 않는다.
+         금광 타일이면 <fIf (gold_cooldown, gold_amount, gold_timer) 추가
+         유닛/벽이 있으면 각각 <BBh (유닛 타입, owner, 체력) 추가
+  플레이어 <BiH (이름, 돈, 인벤토리 수) + 인벤토리 유닛마다 <Bh (타입, 체력)
+
+명령 봉투는 msgpack 부분집합(nil/bool/int/float/str/bin/array/map)으로 인코딩한다.
+어느 쪽도 임의 객체를 만들지 않으므로 상대가 코드를 실행시킬 수 없다.
+
+프레임: 4바이트 길이(big-endian, 기존 client.py와 동일) + 1바이트 종류 + 페이로드
+"""
+import struct
+
+from game.hex_map import axial_range
+from game.player import Player
+from game.tile import Tile
+from game.unit import (create_pinpoint, create_setpoint, create_soldier,
+                       create_medical, create_maintenance)
+
+MAGIC = b"GJ"
+CODEC_VERSION = 1
+MAX_FRAME = 64 * 1024 * 1024
+
+FRAME_GAME = b"G"       # 게임 스냅샷
+FRAME_MSG = b"M"        # msgpack 봉투 (명령/역할 통지 등)
+
+OWNERS = (None, "ally", "enemy")
+TERRAINS = ("land", "gold")
+PHASES = ("playing", "preparation", "game_over")
+UNIT_FACTORIES = (
+    ("Pinpoint", create_pinpoint),
+    ("Setpoint", create_setpoint),
+    ("Soldier", create_soldier),
+    ("Medical", create_medical),
+    ("Maintenance", create_maintenance),
+)
+UNIT_TYPE_IDS = {name: i for i, (name, _) in enumerate(UNIT_FACTORIES)}
+OWNER_IDS = {o: i for i, o in enumerate(OWNERS)}
+TERRAIN_IDS = {t: i for i, t in enumerate(TERRAINS)}
+PHASE_IDS = {p: i for i, p in enumerate(PHASES)}
+
+_HEADER = struct.Struct("<2sBBHIfBB")
+_GOLD = struct.Struct("<fIf")
+_UNIT = struct.Struct("<BBh")
+_PLAYER = struct.Struct("<BiH")
+_INV_UNIT = struct.Struct("<Bh")
+_FRAME = struct.Struct(">IB")
+
+F_BOUNDARY = 0x10
+F_BLOCKED = 0x20
+F_UNIT = 0x40
+F_WALL = 0x80
+
+
+class CodecError(ValueError):
+    pass
+
+
+# =========================================================
+# 게임 스냅샷
+# =========================================================
+def _owner_id(owner):
+    try:
+        return OWNER_IDS[owner]
+    except KeyError:
+        raise CodecError(f"unknown owner: {owner!r}")
+
+
+def _unit_type_id(unit):
+    try:
+        return UNIT_TYPE_IDS[unit.name]
+    except KeyError:
+        raise CodecError(f"unknown unit type: {unit.name!r}")
+
+
+def _make_unit(type_id, owner, health):
+    try:
+        _, factory = UNIT_FACTORIES[type_id]
+    except IndexError:
+        raise CodecError(f"bad unit type id: {type_id}")
+    u = factory(owner)
+    u.health = health
+    return u
+
+
+def encode_game(game) -> bytes:
+    m = game.map
+    coords = list(axial_range(m.size))
+    winner = getattr(game, "winner", None)
+    out = bytearray(_HEADER.pack(
+        MAGIC, CODEC_VERSION,
+        PHASE_IDS.get(getattr(game, "game_phase", "playing"), 0),
+        m.size, len(coords),
+        float(getattr(game, "time_remaining", 0.0)),
+        _owner_id(winner) if winner in OWNER_IDS else 0,
+        len(game.players),
+    ))
+    # 스케줄러 기반 Game이면 남은 쿨다운/채굴 진행을 이벤트 시각에서 계산
+    cooldown_left = getattr(game, "gold_cooldown_left", lambda t: t.gold_cooldown)
+    mining_progress = getattr(game, "gold_mining_progress", lambda t: getattr(t, "gold_timer", 0.0))
+    for q, r in coords:
+        t = m.get_tile(q, r)
+        wall = getattr(t, "wall", None)
+        flags = _owner_id(t.owner) | (TERRAIN_IDS.get(t.terrain, 0) << 2)
+        if t.boundary:
+            flags |= F_BOUNDARY
+        if t.blocked:
+            flags |= F_BLOCKED
+        if t.unit is not None:
+            flags |= F_UNIT
+        if wall is not None:
+            flags |= F_WALL
+        out.append(flags)
+        if t.terrain == "gold":
+            out += _GOLD.pack(cooldown_left(t), t.gold_amount, mining_progress(t))
+        if t.unit is not None:
+            out += _UNIT.pack(_unit_type_id(t.unit), _owner_id(t.unit.owner), t.unit.health)
+        if wall is not None:
+            out += _UNIT.pack(_unit_type_id(wall), _owner_id(wall.owner), wall.health)
+    for name, p in game.players.items():
+        out += _PLAYER.pack(_owner_id(name), p.money, len(p.units_inventory))
+        for u in p.units_inventory:
+            out += _INV_UNIT.pack(_unit_type_id(u), u.health)
+    return bytes(out)
+
+
+class MapSnapshot:
+    """디코딩된 맵 – HexMap의 조회 API(tiles/get_tile/neighbors)만 제공."""
+    DIRS = ((+1, 0), (+1, -1), (0, -1), (-1, 0), (-1, +1), (0, +1))
+
+    def __init__(self, size, tiles):
+        self.size = size
+        self.tiles = tiles
+
+    def get_tile(self, q, r):
+        return self.tiles.get((q, r))
+
+    def neighbors(self, q, r):
+        return [t for t in (self.tiles.get((q + dq, r + dr)) for dq, dr in self.DIRS) if t]
+
+
+class GameSnapshot:
+    """디코딩된 게임 – 클라이언트 렌더링에 필요한 속성만 가진다."""
+
+    def __init__(self, map_, players, game_phase, time_remaining, winner):
+        self.map = map_
+        self.players = players
+        self.game_phase = game_phase
+        self.time_remaining = time_remaining
+        self.winner = winner
+
+
+def decode_game(data) -> GameSnapshot:
+    mv = memoryview(data)
+    try:
+        magic, ver, phase, size, count, remain, winner, n_players = _HEADER.unpack_from(mv, 0)
+    except struct.error as e:
+        raise CodecError(str(e))
+    if magic != MAGIC:
+        raise CodecError("bad magic")
+    if ver != CODEC_VERSION:
+        raise CodecError(f"unsupported codec version {ver}")
+    coords = list(axial_range(size))
+    if count != len(coords):
+        raise CodecError("tile count does not match map size")
+    try:
+        off = _HEADER.size
+        tiles = {}
+        for q, r in coords:
+            flags = mv[off]
+            off += 1
+            owner_id = flags & 0x03
+            terrain_id = (flags >> 2) & 0x03
+            if owner_id >= len(OWNERS) or terrain_id >= len(TERRAINS):
+                raise CodecError("bad tile flags")
+            t = Tile(q, r, owner=OWNERS[owner_id], terrain=TERRAINS[terrain_id],
+                     blocked=bool(flags & F_BLOCKED), boundary=bool(flags & F_BOUNDARY))
+            t.wall = None
+            if t.terrain == "gold":
+                t.gold_cooldown, t.gold_amount, t.gold_timer = _GOLD.unpack_from(mv, off)
+                off += _GOLD.size
+            if flags & F_UNIT:
+                type_id, o, hp = _UNIT.unpack_from(mv, off)
+                off += _UNIT.size
+                t.unit = _make_unit(type_id, OWNERS[o], hp)
+            if flags & F_WALL:
+                type_id, o, hp = _UNIT.unpack_from(mv, off)
+                off += _UNIT.size
+                t.wall = _make_unit(type_id, OWNERS[o], hp)
+            tiles[(q, r)] = t
+
+        players = {}
+        for _ in range(n_players):
+            name_id, money, n_inv = _PLAYER.unpack_from(mv, off)
+            off += _PLAYER.size
+            name = OWNERS[name_id]
+            p = Player(name)
+            p.money = money
+            for _ in range(n_inv):
+                type_id, hp = _INV_UNIT.unpack_from(mv, off)
+                off += _INV_UNIT.size
+                p.units_inventory.append(_make_unit(type_id, name, hp))
+            players[name] = p
+    except (struct.error, IndexError) as e:
+        raise CodecError(f"truncated snapshot: {e}")
+
+    return GameSnapshot(MapSnapshot(size, tiles), players, PHASES[phase] if phase < len(PHASES) else "playing",
+                        remain, OWNERS[winner] if winner < len(OWNERS) else None)
+
+
+def game_to_state(game, captures=None):
+    """
+    client_main.py 형식의 state 딕셔너리(타일 레코드 목록, Match.tile_record와 같은 레코드)로 변환.
+    captures: {(q, r): 남은 점령 시간}. 바이너리 스냅샷에는 점령 진행도가 없으므로
+    state_bin 메시지의 captures 필드를 넘긴다. None이면 game.captures에서 읽는다.
+    """
+    system = getattr(game, "captures", None) if captures is None else None
+    tiles = []
+    for t in game.map.tiles.values():
+        rec = {"q": t.q, "r": t.r, "owner": t.owner}
+        if t.boundary:
+            rec["boundary"] = True
+        if t.terrain != "land":
+            rec["terrain"] = t.terrain
+        u = t.unit
+        if u is not None:
+            rec["unit"] = {"name": u.name, "owner": u.owner, "health": u.health,
+                           "is_pinpoint": u.is_pinpoint}
+        if system is not None:
+            remain = system.remain(t)
+            remain = None if remain is None else round(remain, 1)
+        else:
+            remain = captures.get((t.q, t.r)) if captures else None
+        if remain is not None:
+            rec["capture_remain"] = remain
+        tiles.append(rec)
+    players = {name: {"money": p.money} for name, p in game.players.items()}
+    return {"tiles": tiles, "players": players, "battles": []}
+
+
+# =========================================================
+# msgpack 부분집합 (명령 봉투)
+# =========================================================
+def pack(obj) -> bytes:
+    out = bytearray()
+    _pack_into(out, obj)
+    return bytes(out)
+
+
+def _pack_into(out, obj):
+    if obj is None:
+        out.append(0xC0)
+    elif obj is True:
+        out.append(0xC3)
+    elif obj is False:
+        out.append(0xC2)
+    elif isinstance(obj, int):
+        if 0 <= obj < 0x80:
+            out.append(obj)
+        elif -32 <= obj < 0:
+            out.append(obj & 0xFF)
+        elif -(1 << 63) <= obj < (1 << 63):
+            out.append(0xD3)
+            out += struct.pack(">q", obj)
+        elif 0 <= obj < (1 << 64):
+            out.append(0xCF)
+            out += struct.pack(">Q", obj)
+        else:
+            raise CodecError("int out of range")
+    elif isinstance(obj, float):
+        out.append(0xCB)
+        out += struct.pack(">d", obj)
+    elif isinstance(obj, str):
+        b = obj.encode("utf-8")
+        n = len(b)
+        if n < 32:
+            out.append(0xA0 | n)
+        elif n < 0x100:
+            out += bytes((0xD9, n))
+        elif n < 0x10000:
+            out.append(0xDA)
+            out += struct.pack(">H", n)
+        else:
+            out.append(0xDB)
+            out += struct.pack(">I", n)
+        out += b
+    elif isinstance(obj, (bytes, bytearray, memoryview)):
+        b = bytes(obj)
+        n = len(b)
+        if n < 0x100:
+            out += bytes((0xC4, n))
+        elif n < 0x10000:
+            out.append(0xC5)
+            out += struct.pack(">H", n)
+        else:
+            out.append(0xC6)
+            out += struct.pack(">I", n)
+        out += b
+    elif isinstance(obj, (list, tuple)):
+        n = len(obj)
+        if n < 16:
+            out.append(0x90 | n)
+        elif n < 0x10000:
+            out.append(0xDC)
+            out += struct.pack(">H", n)
+        else:
+            out.append(0xDD)
+            out += struct.pack(">I", n)
+        for item in obj:
+            _pack_into(out, item)
+    elif isinstance(obj, dict):
+        n = len(obj)
+        if n < 16:
+            out.append(0x80 | n)
+        elif n < 0x10000:
+            out.append(0xDE)
+            out += struct.pack(">H", n)
+        else:
+            out.append(0xDF)
+            out += struct.pack(">I", n)
+        for k, v in obj.items():
+            _pack_into(out, k)
+            _pack_into(out, v)
+    else:
+        raise CodecError(f"cannot pack {type(obj).__name__}")
+
+
+_FIXED = {
+    0xCC: ">B", 0xCD: ">H", 0xCE: ">I", 0xCF: ">Q",
+    0xD0: ">b", 0xD1: ">h", 0xD2: ">i", 0xD3: ">q",
+    0xCA: ">f", 0xCB: ">d",
+}
+
+
+def unpack(data, max_depth=32):
+    mv = memoryview(data)
+    try:
+        obj, off = _unpack_from(mv, 0, max_depth)
+    except (struct.error, IndexError, UnicodeDecodeError) as e:
+        raise CodecError(f"bad msgpack: {e}")
+    if off != len(mv):
+        raise CodecError("trailing bytes after msgpack object")
+    return obj
+
+
+def _unpack_from(mv, off, depth):
+    if depth < 0:
+        raise CodecError("msgpack nesting too deep")
+    b = mv[off]
+    off += 1
+    if b < 0x80:
+        return b, off
+    if b >= 0xE0:
+        return b - 0x100, off
+    if 0xA0 <= b <= 0xBF:
+        return _str(mv, off, b & 0x1F)
+    if 0x90 <= b <= 0x9F:
+        return _array(mv, off, b & 0x0F, depth)
+    if 0x80 <= b <= 0x8F:
+        return _map(mv, off, b & 0x0F, depth)
+    if b == 0xC0:
+        return None, off
+    if b == 0xC2:
+        return False, off
+    if b == 0xC3:
+        return True, off
+    fmt = _FIXED.get(b)
+    if fmt is not None:
+        (v,) = struct.unpack_from(fmt, mv, off)
+        return v, off + struct.calcsize(fmt)
+    if b in (0xD9, 0xDA, 0xDB, 0xC4, 0xC5, 0xC6, 0xDC, 0xDD, 0xDE, 0xDF):
+        lfmt = {0xD9: ">B", 0xC4: ">B", 0xDA: ">H", 0xC5: ">H", 0xDC: ">H", 0xDE: ">H"}.get(b, ">I")
+        (n,) = struct.unpack_from(lfmt, mv, off)
+        off += struct.calcsize(lfmt)
+        if b in (0xD9, 0xDA, 0xDB):
+            return _str(mv, off, n)
+        if b in (0xC4, 0xC5, 0xC6):
+            if off + n > len(mv):
+                raise CodecError("truncated bin")
+            return bytes(mv[off:off + n]), off + n
+        if b in (0xDC, 0xDD):
+            return _array(mv, off, n, depth)
+        return _map(mv, off, n, depth)
+    raise CodecError(f"unsupported msgpack type 0x{b:02x}")
+
+
+def _str(mv, off, n):
+    if off + n > len(mv):
+        raise CodecError("truncated str")
+    return str(mv[off:off + n], "utf-8"), off + n
+
+
+def _array(mv, off, n, depth):
+    items = []
+    for _ in range(n):
+        v, off = _unpack_from(mv, off, depth - 1)
+        items.append(v)
+    return items, off
+
+
+def _map(mv, off, n, depth):
+    d = {}
+    for _ in range(n):
+        k, off = _unpack_from(mv, off, depth - 1)
+        v, off = _unpack_from(mv, off, depth - 1)
+        if isinstance(k, list):
+            k = tuple(k)
+        try:
+            d[k] = v
+        except TypeError:
+            raise CodecError("unhashable msgpack map key")
+    return d, off
+
+
+def encode_command(action, params=None) -> bytes:
+    return pack({"v": CODEC_VERSION, "action": action, "params": params or {}})
+
+
+def decode_command(data):
+    env = unpack(data)
+    if not isinstance(env, dict) or env.get("v") != CODEC_VERSION:
+        raise CodecError("bad command envelope")
+    action = env.get("action")
+    params = env.get("params", {})
+    if not isinstance(action, str) or not isinstance(params, dict):
+        raise CodecError("bad command envelope")
+    return action, params
+
+
+# =========================================================
+# 프레이밍
+# =========================================================
+def send_frame(sock, kind: bytes, payload: bytes):
+    sock.sendall(_FRAME.pack(len(payload) + 1, kind[0]) + payload)
+
+
+def _recv_exact(sock, n):
+    buf = bytearray(n)
+    view = memoryview(buf)
+    got = 0
+    while got < n:
+        k = sock.recv_into(view[got:])
+        if not k:
+            return None
+        got += k
+    view.release()
+    return buf
+
+
+def recv_frame(sock):
+    """(종류, 페이로드) 반환. 연결이 끊기면 None."""
+    head = _recv_exact(sock, 4)
+    if head is None:
+        return None
+    (length,) = struct.unpack(">I", head)
+    if not 1 <= length <= MAX_FRAME:
+        raise CodecError(f"bad frame length {length}")
+    body = _recv_exact(sock, length)
+    if body is None:
+        return None
+    return bytes(body[:1]), memoryview(body)[1:]
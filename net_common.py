@@ -1,22 +1,94 @@
 # net_common.py
+import asyncio
 import json
 import socket
+import weakref
+from collections import deque
 
 ENCODING = "utf-8"
+RECV_CHUNK = 65536
 
-# 소켓별 수신 버퍼
-_recv_buffers = {}
 _decoder = json.JSONDecoder()
 
 
+def encode_json(data: dict) -> bytes:
+    """JSON 객체 하나를 전송 형식(개행으로 끝나는 한 줄)으로."""
+    return json.dumps(data, separators=(",", ":")).encode(ENCODING) + b"\n"
+
+
 def send_json(sock: socket.socket, data: dict):
     """
     JSON 객체 하나를 전송.
-    \n 으로 구분을 두지만, 파싱은 스트림 기반으로 진행한다.
+    메시지는 \n 으로 구분한다 (JsonReader가 개행 단위로 잘라 디코딩).
+    """
+    sock.sendall(encode_json(data))
+
+
+class JsonReader:
     """
-    msg = json.dumps(data, separators=(",", ":")).encode(ENCODING)
-    msg += b"\n"
-    sock.sendall(msg)
+    연결별 개행 구분 JSON 수신기.
+    - recv_into로 미리 잡아 둔 bytearray에 바로 받아 복사/재인코딩이 없다.
+    - 개행 탐색은 이전에 본 위치부터 이어서 하므로 메시지 하나가
+      여러 청크로 나뉘어 와도 전체 처리량은 O(n).
+    - 한 청크에 여러 메시지가 와도 read()가 하나씩 돌려준다.
+    """
+
+    def __init__(self, sock: socket.socket, bufsize: int = RECV_CHUNK):
+        self.sock = sock
+        self._buf = bytearray(bufsize)
+        self._start = 0   # 아직 소비하지 않은 데이터 시작
+        self._end = 0     # 수신된 데이터 끝
+        self._scan = 0    # 개행 탐색을 재개할 위치
+
+    def _next_line(self):
+        buf = self._buf
+        while True:
+            nl = buf.find(b"\n", self._scan, self._end)
+            if nl < 0:
+                self._scan = self._end
+                return None
+            start = self._start
+            self._start = self._scan = nl + 1
+            view = memoryview(buf)[start:nl]
+            try:
+                text = str(view, ENCODING)
+            finally:
+                view.release()
+            if text.strip():
+                return text
+
+    def _make_room(self):
+        buf = self._buf
+        size = len(buf)
+        pending = self._end - self._start
+        if self._start and (self._end == size or self._start >= size // 2):
+            # 소비된 앞부분을 버리고 남은 데이터를 앞으로 당긴다.
+            buf[:pending] = buf[self._start:self._end]
+            self._scan -= self._start
+            self._start, self._end = 0, pending
+        if self._end == size:
+            # 메시지 하나가 버퍼보다 크면 두 배로 키운다.
+            buf.extend(bytes(size))
+
+    def read(self):
+        """다음 JSON 객체를 반환. 연결이 끊기면 None."""
+        while True:
+            line = self._next_line()
+            if line is not None:
+                return _decoder.decode(line)
+            self._make_room()
+            view = memoryview(self._buf)[self._end:]
+            try:
+                n = self.sock.recv_into(view)
+            finally:
+                view.release()
+            if not n:
+                return None
+            self._end += n
+
+
+# 소켓별 수신기 (소켓이 GC되면 함께 사라진다)
+_readers = weakref.WeakKeyDictionary()
 
 
 def recv_json(sock: socket.socket):
@@ -24,31 +96,138 @@ def recv_json(sock: socket.socket):
     스트림에서 JSON 객체를 하나씩 꺼내는 함수.
     여러 JSON이 한 번에 오거나, 나눠서 와도 안전하게 처리한다.
     """
-    buf = _recv_buffers.get(sock, b"")
+    reader = _readers.get(sock)
+    if reader is None:
+        # 값이 키를 강하게 잡으면 WeakKeyDictionary가 비워지지 않으므로 proxy 사용
+        reader = _readers[sock] = JsonReader(weakref.proxy(sock))
+    obj = reader.read()
+    if obj is None:
+        _readers.pop(sock, None)
+    return obj
+
+
+# =========================================================
+# 수신 스레드 → 렌더 스레드 스냅샷 전달
+# =========================================================
+class SnapshotBuffer:
+    """
+    이중 버퍼 스냅샷 전달. 수신 스레드가 디코딩/색인까지 끝낸 스냅샷을 publish()로
+    올리면 (버전, 스냅샷) 튜플 하나를 통째로 바꿔 끼운다. 참조 대입은 원자적이므로
+    렌더 쪽은 read() 한 번으로 항상 온전한 한 장을 받고, 버전이 그대로면 그릴 일이 없다.
+    올린 스냅샷은 어느 쪽도 고치지 않는다 (다음 것은 새 객체로).
+    publish는 한 스레드에서만 부른다.
+    """
+
+    def __init__(self):
+        self._front = (0, None)
 
+    def publish(self, snapshot) -> int:
+        version = self._front[0] + 1
+        self._front = (version, snapshot)
+        return version
+
+    def read(self):
+        """(버전, 스냅샷). 아직 없으면 (0, None)."""
+        return self._front
+
+    @property
+    def version(self) -> int:
+        return self._front[0]
+
+
+# =========================================================
+# asyncio 전송 (같은 개행 구분 JSON 형식)
+# =========================================================
+async def read_line(reader: asyncio.StreamReader):
+    """개행까지 한 메시지(원본 bytes, 개행 포함). 연결이 끊기면 None."""
+    parts = []
+    try:
+        while True:
+            try:
+                parts.append(await reader.readuntil(b"\n"))
+                return b"".join(parts)
+            except asyncio.LimitOverrunError as e:
+                # 스트림 한도(limit)보다 긴 메시지: 본 만큼 꺼내 두고 이어서 읽는다
+                parts.append(await reader.readexactly(e.consumed))
+    except asyncio.IncompleteReadError:
+        return None
+
+
+def decode_line(line: bytes):
+    """read_line 결과 → JSON 객체 (빈 줄이면 None)."""
+    return _decoder.decode(str(line, ENCODING)) if line.strip() else None
+
+
+async def read_json(reader: asyncio.StreamReader):
+    """다음 JSON 객체를 반환. 연결이 끊기면 None."""
     while True:
-        if buf:
-            text = buf.decode(ENCODING)
-            text_stripped = text.lstrip()
-
-            if not text_stripped:
-                buf = b""
-                _recv_buffers[sock] = buf
-            else:
-                try:
-                    obj, idx = _decoder.raw_decode(text_stripped)
-                    consumed_len = len(text) - len(text_stripped) + idx
-                    remaining = text[consumed_len:]
-                    _recv_buffers[sock] = remaining.encode(ENCODING)
-                    return obj
-                except json.JSONDecodeError:
-                    # 데이터가 부족한 경우 – 더 받는다.
-                    pass
-
-        chunk = sock.recv(4096)
-        if not chunk:
-            _recv_buffers.pop(sock, None)
+        line = await read_line(reader)
+        if line is None:
             return None
+        obj = decode_line(line)
+        if obj is not None:
+            return obj
+
+
+class Outbox:
+    """
+    연결별 비차단 송신 큐. 송신자(틱 루프)는 put/put_state만 부르고 기다리지 않으며,
+    실제 쓰기는 run() 태스크가 writer.drain()으로 상대 속도에 맞춰 한다.
+    - put(): 입력/제어 메시지 (hello, ack, input 등). 순서대로 빠짐없이 보낸다.
+    - put_state(): state/delta. 아직 못 보낸 것이 있으면 최신 것으로 덮어쓴다.
+      느린 상대는 중간 스냅샷을 건너뛰고 가장 새 것을 받는다 (인코딩도 보낼 때 한 번만).
+    델타 프로토콜은 클라이언트 ack 기준이라 중간 델타를 건너뛰어도 안전하다.
+    """
+
+    def __init__(self, writer: asyncio.StreamWriter):
+        self.writer = writer
+        # drain()이 전송 버퍼가 다 빠질 때까지 기다리게 한다 (쌓인 옛 state 대신 최신 것을 보내도록)
+        writer.transport.set_write_buffer_limits(0)
+        self._queue = deque()       # 인코딩된 신뢰 메시지
+        self._state = None          # 아직 못 보낸 최신 state 메시지 (dict)
+        self._wake = asyncio.Event()
+        self.closed = False
+        self.bytes_out = 0
+        self.states_sent = 0
+        self.states_skipped = 0     # 덮어써져 보내지 않은 state 수
+
+    def put(self, data: dict):
+        if not self.closed:
+            self._queue.append(encode_json(data))
+            self._wake.set()
+
+    def put_state(self, data: dict):
+        if self.closed:
+            return
+        if self._state is not None:
+            self.states_skipped += 1
+        self._state = data
+        self._wake.set()
+
+    async def run(self):
+        """연결이 끊기거나 close()될 때까지 큐를 비운다."""
+        writer = self.writer
+        try:
+            while not self.closed:
+                await self._wake.wait()
+                self._wake.clear()
+                while not self.closed and (self._queue or self._state is not None):
+                    if self._queue:
+                        msg = self._queue.popleft()
+                    else:
+                        msg = encode_json(self._state)
+                        self._state = None
+                        self.states_sent += 1
+                    writer.write(msg)
+                    self.bytes_out += len(msg)
+                    await writer.drain()
+        except (ConnectionError, OSError):
+            pass
+        finally:
+            self.close()
 
-        buf += chunk
-        _recv_buffers[sock] = buf
+    def close(self):
+        if not self.closed:
+            self.closed = True
+            self._wake.set()
+            self.writer.close()
@@ -0,0 +1,274 @@
+# net_delta.py
+"""
+버전 기반 state 델타 프로토콜 (net_common.send_json/recv_json 위에서 동작).
+
+서버 → 클라이언트
+  {"type":"state","version":v,"keyframe":true,"state":{...전체...}}   키프레임
+  {"type":"delta","version":v,"base":b,"tick":n,"tiles":[...],
+   "players":{...}(변경 시), "battles":[...](변경 시)}               델타
+클라이언트 → 서버
+  {"type":"ack","version":v}     적용 완료한 버전
+  {"type":"resync"}              키프레임 재요청
+
+델타는 클라이언트가 마지막으로 ack한 버전(base) 이후 바뀐 타일만 담는다.
+타일 레코드는 절대값이므로 같은 델타를 여러 번 적용해도 안전하다.
+
+진영별 시야를 적용할 때는 매치 공용 DeltaEncoder 위에 진영마다 ViewEncoder를 두고,
+시야 밖 타일은 {"q","r","fog":true} 레코드로 보낸다 (소유/유닛/점령 정보 없음).
+"""
+from collections import deque
+
+KEYFRAME_INTERVAL = 100     # 클라이언트별 키프레임 주기(버전 수)
+HISTORY_LEN = 200           # 델타 계산에 보관하는 변경 이력 길이
+
+
+def tile_key(rec):
+    return rec["q"], rec["r"]
+
+
+# =========================================================
+# 서버: 매치별 인코더
+# =========================================================
+class DeltaEncoder:
+    def __init__(self, keyframe_interval=KEYFRAME_INTERVAL, history_len=HISTORY_LEN):
+        self.keyframe_interval = keyframe_interval
+        self.version = 0
+        self.tick = 0
+        self.records = {}                  # {(q,r): tile record}
+        self.players = {}
+        self.battles = []
+        self.players_version = 0
+        self.battles_version = 0
+        self.history = deque(maxlen=history_len)   # [(version, [keys])]
+        self._cache = {}                   # {base: msg} – 같은 틱 내 재사용
+
+    def update(self, state):
+        """매 틱 전체 state 딕셔너리를 받아 바뀐 타일만 이력에 기록."""
+        self.version += 1
+        self.tick = state.get("tick", self.tick)
+        self._cache = {}
+        changed = []
+        records = self.records
+        for rec in state["tiles"]:
+            key = tile_key(rec)
+            if records.get(key) != rec:
+                records[key] = rec
+                changed.append(key)
+        self.history.append((self.version, changed))
+
+        players = state.get("players", {})
+        if players != self.players:
+            self.players = players
+            self.players_version = self.version
+        battles = state.get("battles", [])
+        if battles != self.battles:
+            self.battles = battles
+            self.battles_version = self.version
+
+    def keyframe(self):
+        return {
+            "type": "state",
+            "version": self.version,
+            "keyframe": True,
+            "state": {
+                "tick": self.tick,
+                "tiles": list(self.records.values()),
+                "players": self.players,
+                "battles": self.battles,
+            },
+        }
+
+    def _can_delta_from(self, base):
+        if base is None or base > self.version:
+            return False
+        if base == self.version:
+            return True
+        # base 이후의 모든 버전이 이력에 남아 있어야 한다.
+        return bool(self.history) and self.history[0][0] <= base + 1
+
+    def delta(self, base):
+        msg = self._cache.get(base)
+        if msg is not None:
+            return msg
+        keys = {}
+        for ver, changed in reversed(self.history):
+            if ver <= base:
+                break
+            for k in changed:
+                keys[k] = True
+        msg = {
+            "type": "delta",
+            "version": self.version,
+            "base": base,
+            "tick": self.tick,
+            "tiles": [self.records[k] for k in keys],
+        }
+        if self.players_version > base:
+            msg["players"] = self.players
+        if self.battles_version > base:
+            msg["battles"] = self.battles
+        self._cache[base] = msg
+        return msg
+
+    def message_for(self, peer):
+        """peer: acked / last_keyframe 속성을 가진 연결 상태."""
+        if (not self._can_delta_from(peer.acked)
+                or self.version - peer.last_keyframe >= self.keyframe_interval):
+            peer.last_keyframe = self.version
+            return self.keyframe()
+        return self.delta(peer.acked)
+
+
+def fog_record(key):
+    return {"q": key[0], "r": key[1], "fog": True}
+
+
+class ViewEncoder(DeltaEncoder):
+    """
+    한 진영 시야로 거른 인코더. 공용 인코더(source)가 이번 버전에 바꾼 타일과
+    시야가 바뀐 타일(drain())만 다시 보므로 갱신 비용은 O(변경 수)다.
+    is_visible((q, r)) / drain() 은 보통 Game.vision의 해당 진영 메서드.
+    players는 자기 진영 것만 보낸다.
+    """
+
+    def __init__(self, source, side, is_visible, drain, **kw):
+        super().__init__(**kw)
+        self.source = source
+        self.side = side
+        self.is_visible = is_visible
+        self.drain = drain
+
+    def sync(self):
+        """source.update() 직후 매 틱 호출."""
+        src = self.source
+        if self.version == 0 or not src.history or src.history[-1][0] != src.version:
+            keys = dict.fromkeys(src.records)     # 처음/이력 불일치: 전체 다시 판정
+        else:
+            keys = dict.fromkeys(src.history[-1][1])
+        keys.update(dict.fromkeys(self.drain()))
+        self.version += 1
+        self.tick = src.tick
+        self._cache = {}
+        changed = []
+        records = self.records
+        for key in keys:
+            rec = src.records.get(key)
+            if rec is None:
+                continue
+            if not self.is_visible(key):
+                rec = fog_record(key)
+            if records.get(key) != rec:
+                records[key] = rec
+                changed.append(key)
+        self.history.append((self.version, changed))
+
+        mine = src.players.get(self.side)
+        players = {self.side: mine} if mine is not None else {}
+        if players != self.players:
+            self.players = players
+            self.players_version = self.version
+        if src.battles != self.battles:
+            self.battles = src.battles
+            self.battles_version = self.version
+
+
+class PeerVersion:
+    """클라이언트별 ack 상태."""
+
+    def __init__(self):
+        self.acked = None
+        self.last_keyframe = 0
+
+    def on_message(self, data):
+        kind = data.get("type")
+        if kind == "ack":
+            v = data.get("version")
+            if isinstance(v, int) and (self.acked is None or v > self.acked):
+                self.acked = v
+            return True
+        if kind == "resync":
+            self.acked = None
+            return True
+        return False
+
+
+# =========================================================
+# 클라이언트: 델타 적용
+# =========================================================
+class DeltaState:
+    def __init__(self):
+        self.version = None
+        self.tick = 0
+        self.tiles = {}        # {(q,r): record}
+        self.players = {}
+        self.battles = []
+
+    def apply(self, data):
+        """
+        state/delta 메시지를 적용.
+        적용했으면 True, 기준 버전이 맞지 않아 버렸으면 False(→ resync 필요).
+        """
+        kind = data.get("type")
+        if kind == "state":
+            st = data.get("state", {})
+            self.tiles = {tile_key(t): t for t in st.get("tiles", [])}
+            self.players = st.get("players", {})
+            self.battles = st.get("battles", [])
+            self.tick = st.get("tick", 0)
+            self.version = data.get("version")
+            return True
+        if kind == "delta":
+            if self.version is None or data["base"] > self.version:
+                return False
+            if data["version"] <= self.version:
+                # 이미 같거나 더 최신 상태 – 재전송분은 무시
+                return True
+            for rec in data.get("tiles", []):
+                self.tiles[tile_key(rec)] = rec
+            if "players" in data:
+                self.players = data["players"]
+            if "battles" in data:
+                self.battles = data["battles"]
+            self.tick = data.get("tick", self.tick)
+            self.version = data["version"]
+            return True
+        return False
+
+    def snapshot(self):
+        return {
+            "tick": self.tick,
+            "tiles": list(self.tiles.values()),
+            "tile_index": dict(self.tiles),     # (q, r) → record (클릭/조회용)
+            "players": self.players,
+            "battles": self.battles,
+        }
+
+
+# =========================================================
+# 대역폭 비교: 유휴 맵에서 전체 state vs 델타
+# =========================================================
+def measure_bandwidth(ticks=600, map_size=6):
+    import json
+    from game.match import Match
+
+    def size(msg):
+        return len(json.dumps(msg, separators=(",", ":"))) + 1
+
+    match = Match(map_size=map_size)
+    enc = DeltaEncoder()
+    peer = PeerVersion()
+    full_bytes = delta_bytes = 0
+    for _ in range(ticks):
+        match.step(0.05)
+        state = match.to_state()
+        full_bytes += size({"type": "state", "state": state})
+        enc.update(state)
+        msg = enc.message_for(peer)
+        delta_bytes += size(msg)
+        peer.acked = msg["version"]
+    return full_bytes, delta_bytes
+
+
+if __name__ == "__main__":
+    full, delta = measure_bandwidth()
+    print(f"full={full}B delta={delta}B ratio={full / max(1, delta):.1f}x")
@@ -0,0 +1,241 @@
+# net_predict.py
+"""
+클라이언트 쪽 입력 번호 / 이동 예측 / 스냅샷 보간 (client_main용, pygame 비의존).
+입력 번호와 예측은 렌더 스레드, 보간 탐지(Interpolator.push)는 수신 스레드에서 돈다.
+
+입력 번호
+  보내는 입력 cmd마다 seq를 붙인다. 서버는 진영별로 마지막으로 적용한 seq를
+  state/delta 메시지의 input_seq로 돌려준다 (Match.input_seq). 적용했다고 성공한 것은
+  아니므로 최근 거절된 seq 목록도 input_rejected로 함께 온다 (Match.input_rejected).
+
+이동 예측 (MovePredictor)
+  move를 보내는 순간 서버와 같은 규칙으로 바로 움직여 보인다.
+  - 출발/도착이 모두 내 진영이면 순간이동 (Match._cmd_move와 같음)
+  - 아니면 rules.bfs_path와 같은 통과 규칙(중간 칸은 비어 있어야 함)의 BFS 경로를
+    한 칸 = STEP_TIME 초로 진행 (MovementSystem과 같은 타이밍)
+  서버가 그 입력을 거절했으면(input_rejected) 바로 버린다. 적용했다고 알려 오면(ack)
+  서버 state를 기준으로 맞춘다. 서버의 병이 예측 경로 위 한 칸 이내에 있으면 계속 예측하되
+  (서버가 앞서 있으면 그 칸에 시계를 맞춤), 경로를 벗어났거나(우회/막힘) 도착했으면
+  예측을 버리고 서버 state를 그대로 보여 준다.
+
+스냅샷 보간 (Interpolator)
+  서버는 10~20Hz로 타일 단위 state만 보내므로, 한 스냅샷 사이에 이웃 칸으로 옮겨 간
+  유닛을 찾아(Motion) 다음 스냅샷 간격 동안 화면 좌표를 이어서 움직인다.
+"""
+import time
+from collections import deque
+
+from game.balance import DEFAULT_BALANCE
+from game.hex_map import DIRECTIONS
+
+STEP_TIME = DEFAULT_BALANCE.step_time   # visual_main / Match와 같은 한 칸 이동 시간(초)
+ACK_TIMEOUT = 2.0                       # 이 시간 안에 ack가 없으면 예측을 버린다(초)
+
+
+def neighbor_keys(key):
+    q, r = key
+    return [(q + dq, r + dr) for dq, dr in DIRECTIONS]
+
+
+def bfs_keys(tile_index, start, goal):
+    """
+    state 레코드 위 BFS 경로 [(q, r), ...] (없으면 None). rules.bfs_path와 같은 규칙:
+    중간 칸은 비어 있어야 하고 목표 칸만 예외. 시야 밖(fog) 칸은 비어 있다고 본다.
+    """
+    if start == goal:
+        return [start]
+    prev = {start: None}
+    frontier = deque([start])
+    while frontier:
+        cur = frontier.popleft()
+        for key in neighbor_keys(cur):
+            if key in prev:
+                continue
+            rec = tile_index.get(key)
+            if rec is None:
+                continue
+            if "unit" in rec and key != goal:
+                continue
+            prev[key] = cur
+            if key == goal:
+                path = []
+                while key is not None:
+                    path.append(key)
+                    key = prev[key]
+                path.reverse()
+                return path
+            frontier.append(key)
+    return None
+
+
+class InputSequencer:
+    """보낸 입력의 seq와 보낸 시각. ack(seq)로 적용 확인된 입력을 지운다."""
+
+    def __init__(self):
+        self.seq = 0
+        self.acked = 0
+        self.sent_at = {}       # seq → 보낸 시각
+        self.rtt = None         # 최근 입력→state 왕복 (지수 평균, 초)
+
+    def stamp(self, cmd, now=None):
+        """cmd에 다음 seq를 붙여 돌려준다."""
+        self.seq += 1
+        cmd["seq"] = self.seq
+        self.sent_at[self.seq] = time.perf_counter() if now is None else now
+        return cmd
+
+    def ack(self, seq, now=None):
+        if seq is None or seq <= self.acked:
+            return
+        now = time.perf_counter() if now is None else now
+        sent = self.sent_at.get(seq)
+        if sent is not None:
+            sample = now - sent
+            self.rtt = sample if self.rtt is None else self.rtt * 0.8 + sample * 0.2
+        for s in [s for s in self.sent_at if s <= seq]:
+            del self.sent_at[s]
+        self.acked = seq
+
+
+class MovePredictor:
+    def __init__(self, side, step_time=STEP_TIME):
+        self.side = side
+        self.step_time = step_time
+        self.moves = []         # [{"seq","path","t0","unit"}] 진행 중 예측
+
+    def predict(self, seq, src, dst, tile_index, now):
+        """move 입력을 보낼 때 호출. 예측을 시작했으면 True."""
+        a, b = tile_index.get(src), tile_index.get(dst)
+        if a is None or b is None or "unit" in b:
+            return False
+        unit = a.get("unit")
+        if not unit or unit["owner"] != self.side or unit["name"] != "Soldier":
+            return False
+        self.moves = [m for m in self.moves if m["path"][0] != src]
+        if a.get("owner") == self.side and b.get("owner") == self.side:
+            path = [src, dst]
+            t0 = now - self.step_time         # 순간이동: 이미 도착한 것으로
+        else:
+            path = bfs_keys(tile_index, src, dst)
+            if not path or len(path) < 2:
+                return False
+            t0 = now
+        self.moves.append({"seq": seq, "path": path, "t0": t0, "unit": unit})
+        return True
+
+    def _index(self, m, now):
+        return (now - m["t0"]) / self.step_time
+
+    def reconcile(self, tile_index, acked_seq, now, rejected=()):
+        """
+        새 서버 state를 받을 때마다 호출. ack된 예측을 서버 위치에 맞추거나 버린다.
+        rejected: 서버가 거절한 입력 seq (출발 칸에 그대로 있는 병을 걷게 두지 않도록 바로 버린다).
+        """
+        keep = []
+        for m in self.moves:
+            path = m["path"]
+            if m["seq"] > acked_seq:
+                if now - m["t0"] < ACK_TIMEOUT:
+                    keep.append(m)
+                continue
+            if m["seq"] in rejected:
+                continue
+            # 서버가 적용한 뒤: 예측 위치 ±1 칸 안의 경로 위에 내 병이 있는지
+            k = min(int(self._index(m, now)), len(path) - 1)
+            found = None
+            for j in (k, k + 1, k - 1):
+                if 0 <= j < len(path):
+                    u = tile_index.get(path[j], {}).get("unit")
+                    if u and u["owner"] == self.side and u["name"] == "Soldier":
+                        found = j
+                        break
+            if found is None or found == len(path) - 1:
+                continue        # 경로 이탈(거절/우회) 또는 도착: 서버 state를 그대로 쓴다
+            if found > k:
+                # 서버가 앞서 있으면 그 칸에 시계를 맞춘다 (칸 안 진행률은 유지).
+                # 한 칸 뒤처진 것은 왕복 지연만큼 예측이 앞서는 정상 상태라 그대로 둔다.
+                frac = self._index(m, now) - int(self._index(m, now))
+                m["t0"] = now - (found + frac) * self.step_time
+            m["unit"] = tile_index[path[found]]["unit"]
+            keep.append(m)
+        self.moves = keep
+
+    def overlay(self, tile_index, now):
+        """
+        (가릴 서버 타일 키 집합, [(유닛 레코드, (실수 q, 실수 r))]).
+        예측 중인 병은 서버 위치 대신 경로 위 보간 위치에 그린다.
+        """
+        hidden = set()
+        drawn = []
+        for m in self.moves:
+            path = m["path"]
+            # 서버 state에서 이 병이 서 있는 칸(경로 앞쪽부터)을 가린다
+            for key in path:
+                u = tile_index.get(key, {}).get("unit")
+                if u and u["owner"] == self.side and u["name"] == "Soldier":
+                    hidden.add(key)
+                    break
+            p = self._index(m, now)
+            k = int(p)
+            if k >= len(path) - 1:
+                q, r = path[-1]
+                drawn.append((m["unit"], (float(q), float(r))))
+                continue
+            frac = p - k
+            (q0, r0), (q1, r1) = path[k], path[k + 1]
+            drawn.append((m["unit"], (q0 + (q1 - q0) * frac, r0 + (r1 - r0) * frac)))
+        return hidden, drawn
+
+
+class Motion:
+    """한 스냅샷의 보간 정보. 만든 뒤 바꾸지 않으므로 수신 스레드에서 렌더 스레드로 그대로 넘긴다."""
+    __slots__ = ("slides", "t", "interval")
+
+    def __init__(self, slides, t, interval):
+        self.slides = slides        # 새 칸 (q, r) → 옛 칸 (q, r)
+        self.t = t                  # 스냅샷 받은 시각
+        self.interval = interval    # 미끄러지는 시간 (= 스냅샷 간격)
+
+    def position(self, key, now):
+        """key 칸 유닛을 그릴 실수 (q, r)."""
+        old = self.slides.get(key)
+        if old is None:
+            return float(key[0]), float(key[1])
+        a = min(1.0, (now - self.t) / self.interval)
+        return old[0] + (key[0] - old[0]) * a, old[1] + (key[1] - old[1]) * a
+
+    def active(self, now):
+        """아직 미끄러지는 유닛이 있으면 True (렌더를 건너뛰면 안 됨)."""
+        return bool(self.slides) and now - self.t < self.interval
+
+
+class Interpolator:
+    """직전 스냅샷과 비교해 이웃 칸으로 옮겨 간 유닛을 찾는다 (스냅샷마다 push 한 번, 한 스레드에서)."""
+
+    def __init__(self):
+        self.prev = None        # 직전 스냅샷 tile_index
+        self.t_last = None
+        self.interval = 0.05    # 스냅샷 수신 간격 (지수 평균, 초)
+
+    def push(self, tile_index, now) -> Motion:
+        if self.t_last is not None:
+            gap = min(max(now - self.t_last, 1 / 60), STEP_TIME)
+            self.interval = self.interval * 0.8 + gap * 0.2
+        self.t_last = now
+        prev = self.prev
+        self.prev = tile_index
+        slides = {}
+        if prev is not None:
+            used = set()
+            for key, rec in tile_index.items():
+                u = rec.get("unit")
+                if not u or u["is_pinpoint"] or "unit" in prev.get(key, {}):
+                    continue
+                for nb in neighbor_keys(key):
+                    old = prev.get(nb, {}).get("unit")
+                    if (nb not in used and old and old["owner"] == u["owner"] and old["name"] == u["name"]
+                            and "unit" not in tile_index.get(nb, {})):
+                        slides[key] = nb
+                        used.add(nb)
+                        break
+        return Motion(slides, now, self.interval)
@@ -0,0 +1,510 @@
+# server_main.py
+import argparse
+import asyncio
+import base64
+import os
+import socket
+import threading
+import time
+from collections import deque
+
+from game.match import Match, SIDES
+from game.replay import ReplayRecorder
+from game.rules import find_pinpoint_tile
+from net_common import send_json, JsonReader, Outbox, read_json
+from net_delta import DeltaEncoder, PeerVersion, ViewEncoder
+from net_codec import encode_game
+
+HOST = "0.0.0.0"
+SERVER_PORT = 50000      # client_main.py 와 동일
+
+TICK_RATE = 20           # 고정 스텝(Hz)
+TICK_DT = 1.0 / TICK_RATE
+MAX_CATCHUP_TICKS = 5    # 밀렸을 때 한 번에 따라잡는 최대 틱 수
+REPORT_INTERVAL = 10.0   # 틱 통계 출력 주기(초)
+
+
+# =========================================================
+# 틱 시간 통계 (최근 N개 샘플의 백분위수)
+# =========================================================
+class TickStats:
+    def __init__(self, maxlen=4096):
+        self.samples = deque(maxlen=maxlen)
+        self.count = 0
+
+    def record(self, seconds):
+        self.samples.append(seconds)
+        self.count += 1
+
+    def percentiles(self, ps=(50, 95, 99)):
+        if not self.samples:
+            return {p: 0.0 for p in ps}
+        data = sorted(self.samples)
+        n = len(data)
+        return {p: data[min(n - 1, int(n * p / 100))] for p in ps}
+
+    def summary(self, label="tick"):
+        pc = self.percentiles((50, 95, 99))
+        mx = max(self.samples) if self.samples else 0.0
+        return (f"{label}: n={self.count} "
+                f"p50={pc[50] * 1000:.3f}ms p95={pc[95] * 1000:.3f}ms "
+                f"p99={pc[99] * 1000:.3f}ms max={mx * 1000:.3f}ms")
+
+
+def matches_per_core(stats, tick_rate=TICK_RATE):
+    """p99 매치 틱 비용 기준으로 한 코어가 감당 가능한 매치 수 추정."""
+    p99 = stats.percentiles((99,))[99]
+    if p99 <= 0:
+        return 0
+    return int(1.0 / (p99 * tick_rate))
+
+
+# =========================================================
+# 접속 클라이언트
+# =========================================================
+class ClientConn:
+    def __init__(self, sock, addr, match, side):
+        self.sock = sock
+        self.addr = addr
+        self.match = match
+        self.side = side
+        self.alive = True
+        self.send_lock = threading.Lock()
+        self.peer = PeerVersion()     # 델타 프로토콜 ack 상태
+
+    def send(self, data):
+        if not self.alive:
+            return
+        try:
+            with self.send_lock:
+                send_json(self.sock, data)
+        except OSError:
+            self.alive = False
+
+    def send_state(self, data):
+        # 블로킹 소켓: 느린 클라이언트면 틱 스레드가 여기서 기다린다 (asyncio 서버는 AsyncClientConn)
+        self.send(data)
+
+    def close(self):
+        self.alive = False
+        try:
+            self.sock.close()
+        except OSError:
+            pass
+
+
+class AsyncClientConn:
+    """asyncio 서버용 연결. 송신은 Outbox에 넣기만 하므로 틱 루프가 막히지 않는다."""
+
+    def __init__(self, reader, writer, match, side):
+        self.reader = reader
+        self.outbox = Outbox(writer)
+        self.addr = writer.get_extra_info("peername")
+        self.match = match
+        self.side = side
+        self.peer = PeerVersion()
+
+    @property
+    def alive(self):
+        return not self.outbox.closed
+
+    def send(self, data):
+        self.outbox.put(data)
+
+    def send_state(self, data):
+        self.outbox.put_state(data)
+
+    def close(self):
+        self.outbox.close()
+
+
+# =========================================================
+# 한 프로세스에서 여러 매치를 고정 스텝으로 구동
+# =========================================================
+class MatchHost:
+    def __init__(self, map_size=6, tick_rate=TICK_RATE, binary_keyframes=False, record_dir=None,
+                 fog=True):
+        self.map_size = map_size
+        self.fog = fog                   # 진영별 시야 밖 타일을 가려서 전송
+        self.record_dir = record_dir     # 지정하면 매치마다 리플레이 기록
+        self.binary_keyframes = binary_keyframes
+        self.tick_rate = tick_rate
+        self.tick_dt = 1.0 / tick_rate
+        self.matches = []
+        self.clients = {}             # {match_id: [ClientConn]}
+        self.encoders = {}            # {match_id: DeltaEncoder}
+        self.views = {}               # {match_id: {side: ViewEncoder}} (fog일 때)
+        self.waiting = set()          # 아직 상대를 기다리는 (한 번도 다 차지 않은) 매치 id
+        self.lock = threading.Lock()
+        self.match_stats = TickStats()   # 매치 1개당 (step + 송신) 시간
+        self.frame_stats = TickStats()   # 전체 매치 한 바퀴 시간
+        self._next_id = 0
+        self.running = True
+
+    def new_match(self):
+        with self.lock:
+            m = Match(match_id=self._next_id, map_size=self.map_size)
+            if self.record_dir is not None:
+                ReplayRecorder(m, self.tick_dt)
+            self._next_id += 1
+            self.matches.append(m)
+            self.clients[m.match_id] = []
+            self.waiting.add(m.match_id)
+            enc = self.encoders[m.match_id] = DeltaEncoder()
+            if self.fog:
+                vision = m.game.vision
+                self.views[m.match_id] = {
+                    side: ViewEncoder(enc, side,
+                                      lambda key, side=side: vision.is_visible(side, *key),
+                                      lambda side=side: vision.drain(side))
+                    for side in SIDES
+                }
+            return m
+
+    def join(self, sock, addr):
+        """빈 진영이 있는 매치에 배정, 없으면 새 매치 생성."""
+        return self.attach(lambda m, side: ClientConn(sock, addr, m, side))
+
+    def attach(self, make_conn):
+        """
+        make_conn(match, side)로 만든 연결을 상대를 기다리는 매치의 빈 진영에 배정
+        (스레드/asyncio 공용). 진행 중에 한쪽이 나간 매치에는 새로 넣지 않는다.
+        """
+        with self.lock:
+            for m in self.matches:
+                if m.match_id not in self.waiting:
+                    continue
+                taken = {c.side for c in self.clients[m.match_id] if c.alive}
+                free = [s for s in SIDES if s not in taken]
+                if free:
+                    conn = make_conn(m, free[0])
+                    self.clients[m.match_id].append(conn)
+                    if len(free) == 1:
+                        self.waiting.discard(m.match_id)
+                    return conn
+        m = self.new_match()
+        conn = make_conn(m, SIDES[0])
+        with self.lock:
+            self.clients[m.match_id].append(conn)
+        return conn
+
+    def on_message(self, conn, data):
+        """클라이언트 → 서버 메시지 하나 처리 (입력은 큐에 쌓기만 한다)."""
+        if not isinstance(data, dict):
+            return      # 객체가 아닌 JSON은 무시
+        kind = data.get("type")
+        if kind == "input":
+            conn.match.inputs.append((conn.side, data.get("cmd")))
+        elif kind == "stats":
+            conn.send({"type": "stats", **self.stats()})
+        else:
+            conn.peer.on_message(data)
+
+    def stats(self):
+        """틱 통계 (부하 측정 도구가 stats 메시지로 받아 감)."""
+        def ms(st):
+            out = {f"p{p}": round(v * 1000, 3) for p, v in st.percentiles((50, 95, 99)).items()}
+            out["max"] = round(max(st.samples, default=0.0) * 1000, 3)
+            return out
+        with self.lock:
+            n_clients = sum(1 for cs in self.clients.values() for c in cs if c.alive)
+        return {
+            "matches": len(self.matches),
+            "clients": n_clients,
+            "tick_rate": self.tick_rate,
+            "frames": self.frame_stats.count,
+            "match_tick_ms": ms(self.match_stats),
+            "frame_ms": ms(self.frame_stats),
+        }
+
+    def leave(self, conn):
+        """연결 정리. 매치에 살아 있는 연결이 하나도 없으면 매치도 내린다."""
+        conn.close()
+        match_id = conn.match.match_id
+        with self.lock:
+            conns = self.clients.get(match_id)
+            if conns is None:
+                return
+            if conn in conns:
+                conns.remove(conn)
+            if any(c.alive for c in conns):
+                return
+            self.matches.remove(conn.match)
+            del self.clients[match_id]
+            del self.encoders[match_id]
+            self.views.pop(match_id, None)
+            self.waiting.discard(match_id)
+        self.save_replay(conn.match)
+
+    # -------------------------------------------------
+    # 틱
+    # -------------------------------------------------
+    def tick_all(self):
+        t_frame = time.perf_counter()
+        with self.lock:
+            # 인코더도 여기서 잡아 둔다 (틱 도중 leave가 매치를 내려도 이번 틱은 끝까지)
+            work = [(m, list(self.clients[m.match_id]), self.encoders[m.match_id],
+                     self.views.get(m.match_id)) for m in self.matches]
+        for m, conns, enc, views in work:
+            t0 = time.perf_counter()
+            m.step(self.tick_dt)
+            if conns:
+                self.broadcast(m, conns, enc, views)
+            self.match_stats.record(time.perf_counter() - t0)
+        self.frame_stats.record(time.perf_counter() - t_frame)
+
+    def broadcast(self, match, conns, enc, views):
+        enc.update(match.to_state())
+        if views is not None:
+            # 진영별 뷰는 이번 틱 변경분 + 시야 변경분만 다시 판정
+            for view in views.values():
+                view.sync()
+        bin_keyframe = None
+        seqs = match.input_seq
+        for c in conns:
+            if views is not None:
+                msg = views[c.side].message_for(c.peer)
+            else:
+                msg = enc.message_for(c.peer)
+            # 바이너리 키프레임은 전체 맵 + 양 진영 정보라 시야 필터가 없을 때만 쓴다
+            if self.binary_keyframes and views is None and msg["type"] == "state":
+                if bin_keyframe is None:
+                    bin_keyframe = {
+                        "type": "state_bin",
+                        "version": enc.version,
+                        "tick": enc.tick,
+                        "data": base64.b64encode(encode_game(match.game)).decode("ascii"),
+                        "players": enc.players,
+                        "battles": enc.battles,
+                        # 바이너리 스냅샷에 없는 점령 진행도는 인코더 레코드에서
+                        "captures": [[rec["q"], rec["r"], rec["capture_remain"]]
+                                     for rec in enc.records.values() if "capture_remain" in rec],
+                    }
+                msg = bin_keyframe
+            seq = seqs.get(c.side)
+            if seq is not None:
+                # 메시지는 인코더 캐시와 공유하므로 복사해서 이 진영의 마지막 적용 입력 번호를 붙인다.
+                # 최근 거절 목록은 매번 통째로 보내므로 state를 건너뛴 클라이언트도 놓치지 않는다
+                rejected = match.input_rejected.get(c.side)
+                if rejected:
+                    msg = dict(msg, input_seq=seq, input_rejected=list(rejected))
+                else:
+                    msg = dict(msg, input_seq=seq)
+            c.send_state(msg)
+
+    def _loop(self, duration, report_interval):
+        """고정 스텝 루프. 밀린 틱을 돌린 뒤 다음 틱까지 쉴 시간(초)을 내놓는다."""
+        start = last = next_report = time.perf_counter()
+        next_report += report_interval
+        acc = 0.0
+        while self.running:
+            now = time.perf_counter()
+            acc = min(acc + (now - last), self.tick_dt * MAX_CATCHUP_TICKS)
+            last = now
+            while acc >= self.tick_dt:
+                self.tick_all()
+                acc -= self.tick_dt
+            if now >= next_report:
+                print(self.report())
+                next_report = now + report_interval
+            if duration is not None and now - start >= duration:
+                break
+            yield max(0.0, self.tick_dt - acc)
+
+    def run(self, duration=None, report_interval=REPORT_INTERVAL):
+        for wait in self._loop(duration, report_interval):
+            time.sleep(wait)
+
+    async def run_async(self, duration=None, report_interval=REPORT_INTERVAL):
+        """run()과 같은 루프를 이벤트 루프 위에서 (쉬는 동안 송수신 태스크가 돈다)."""
+        for wait in self._loop(duration, report_interval):
+            await asyncio.sleep(wait)
+
+    def save_replay(self, m):
+        if self.record_dir is None:
+            return
+        os.makedirs(self.record_dir, exist_ok=True)
+        path = os.path.join(self.record_dir, f"match_{m.match_id}.replay")
+        m.recorder.replay.save(path)
+        print(f"[SERVER] 리플레이 저장: {path} (seed={m.game.seed}, ticks={m.tick})")
+
+    def save_replays(self):
+        """아직 진행 중인 매치 리플레이 저장 (끝난 매치는 leave에서 이미 저장)."""
+        with self.lock:
+            matches = list(self.matches)
+        for m in matches:
+            self.save_replay(m)
+
+    def report(self):
+        return (f"[SERVER] matches={len(self.matches)} "
+                f"{self.match_stats.summary('match_tick')} | "
+                f"{self.frame_stats.summary('frame')} | "
+                f"est_matches_per_core={matches_per_core(self.match_stats, self.tick_rate)}")
+
+
+# =========================================================
+# 네트워크
+# =========================================================
+def client_thread_main(host, conn):
+    reader = JsonReader(conn.sock)
+    try:
+        while conn.alive:
+            data = reader.read()
+            if data is None:
+                break
+            host.on_message(conn, data)
+    except (OSError, ValueError) as e:
+        print("[SERVER] 클라이언트 예외:", conn.addr, e)
+    finally:
+        print("[SERVER] 연결 종료:", conn.addr)
+        host.leave(conn)
+
+
+def accept_thread_main(host, listener):
+    while host.running:
+        try:
+            sock, addr = listener.accept()
+        except OSError:
+            break
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        conn = host.join(sock, addr)
+        print(f"[SERVER] 접속: {addr} → match {conn.match.match_id} / {conn.side}")
+        conn.send({"type": "hello", "side": conn.side, "match": conn.match.match_id})
+        threading.Thread(target=client_thread_main, args=(host, conn), daemon=True).start()
+
+
+def serve(port=SERVER_PORT, map_size=6, tick_rate=TICK_RATE, binary_keyframes=False,
+          record_dir=None, fog=True):
+    host = MatchHost(map_size=map_size, tick_rate=tick_rate, binary_keyframes=binary_keyframes,
+                     record_dir=record_dir, fog=fog)
+    listener = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    listener.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    listener.bind((HOST, port))
+    listener.listen()
+    print(f"[SERVER] 대기 중: {HOST}:{port} ({tick_rate}Hz)")
+    threading.Thread(target=accept_thread_main, args=(host, listener), daemon=True).start()
+    try:
+        host.run()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        host.running = False
+        listener.close()
+        print(host.report())
+        host.save_replays()
+
+
+# =========================================================
+# asyncio 서버: 스레드 없이 한 이벤트 루프에서 틱 + 모든 연결 송수신
+# =========================================================
+async def handle_async_client(host, reader, writer):
+    sock = writer.get_extra_info("socket")
+    if sock is not None:
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+    conn = host.attach(lambda m, side: AsyncClientConn(reader, writer, m, side))
+    print(f"[SERVER] 접속: {conn.addr} → match {conn.match.match_id} / {conn.side}")
+    conn.send({"type": "hello", "side": conn.side, "match": conn.match.match_id})
+    sender = asyncio.create_task(conn.outbox.run())
+    try:
+        while conn.alive:
+            data = await read_json(reader)
+            if data is None:
+                break
+            host.on_message(conn, data)
+    except (OSError, ValueError) as e:
+        print("[SERVER] 클라이언트 예외:", conn.addr, e)
+    finally:
+        print("[SERVER] 연결 종료:", conn.addr)
+        host.leave(conn)
+        await sender
+
+
+async def serve_async(host, port=SERVER_PORT, duration=None, bind=HOST):
+    server = await asyncio.start_server(lambda r, w: handle_async_client(host, r, w), bind, port)
+    print(f"[SERVER] 대기 중(asyncio): {bind}:{port} ({host.tick_rate}Hz)")
+    try:
+        await host.run_async(duration)
+    finally:
+        server.close()
+        with host.lock:
+            conns = [c for cs in host.clients.values() for c in cs]
+        for c in conns:
+            c.close()
+
+
+# =========================================================
+# 헤드리스 부하 측정: 네트워크 없이 N개 매치를 돌려 틱 백분위수 출력
+# =========================================================
+def seed_bench_inputs(match):
+    """양 진영에 병/셋포인트를 배치하고 상대 진영으로 진격시킨다."""
+    game = match.game
+    for side in SIDES:
+        pinpoint = find_pinpoint_tile(game, side)
+        for _ in range(4):
+            match.inputs.append((side, {"kind": "purchase", "unit_type": "soldier"}))
+        match.inputs.append((side, {"kind": "purchase", "unit_type": "setpoint"}))
+        front = game.map.boundary_tiles(side)[:4]
+        for t in front:
+            match.inputs.append((side, {"kind": "place", "unit_type": "soldier", "q": t.q, "r": t.r}))
+        step = 2 if side == "ally" else -2
+        match.inputs.append((side, {"kind": "place", "unit_type": "setpoint",
+                                    "q": pinpoint.q + step, "r": pinpoint.r}))
+        for t in front:
+            match.inputs.append((side, {"kind": "move", "from": [t.q, t.r], "to": [t.q + step, t.r]}))
+
+
+def bench(n_matches, seconds, map_size=6, tick_rate=TICK_RATE, record_dir=None):
+    host = MatchHost(map_size=map_size, tick_rate=tick_rate, record_dir=record_dir)
+    for _ in range(n_matches):
+        seed_bench_inputs(host.new_match())
+    # 실시간 대기 없이 최대 속도로 틱을 돌린다.
+    end = time.perf_counter() + seconds
+    ticks = 0
+    while time.perf_counter() < end:
+        host.tick_all()
+        ticks += 1
+    print(f"[BENCH] cpus={os.cpu_count()} map_size={map_size} ticks={ticks} "
+          f"sim_seconds={ticks * host.tick_dt:.1f}")
+    print(host.report())
+    host.save_replays()
+    return host
+
+
+def main():
+    ap = argparse.ArgumentParser(description="국가전쟁 헤드리스 매치 서버")
+    ap.add_argument("--port", type=int, default=SERVER_PORT)
+    ap.add_argument("--map-size", type=int, default=6)
+    ap.add_argument("--tick-rate", type=int, default=TICK_RATE)
+    ap.add_argument("--binary-keyframes", action="store_true",
+                    help="키프레임을 net_codec 바이너리 스냅샷(state_bin)으로 전송 (--no-fog일 때만)")
+    ap.add_argument("--asyncio", action="store_true",
+                    help="스레드 대신 asyncio 전송 (연결별 비차단 송신 큐, 느린 클라이언트는 최신 state만)")
+    ap.add_argument("--no-fog", action="store_true",
+                    help="시야 필터 없이 모든 클라이언트에 전체 맵 전송")
+    ap.add_argument("--bench-matches", type=int, default=0,
+                    help="N>0 이면 네트워크 없이 N개 매치를 돌려 틱 통계만 출력")
+    ap.add_argument("--bench-seconds", type=float, default=5.0)
+    ap.add_argument("--record", metavar="DIR", default=None,
+                    help="매치별 리플레이(시드 + 입력 로그)를 DIR에 저장 (python -m game.replay로 검증)")
+    args = ap.parse_args()
+
+    if args.bench_matches > 0:
+        bench(args.bench_matches, args.bench_seconds, args.map_size, args.tick_rate, args.record)
+    elif args.asyncio:
+        host = MatchHost(map_size=args.map_size, tick_rate=args.tick_rate,
+                         binary_keyframes=args.binary_keyframes, record_dir=args.record,
+                         fog=not args.no_fog)
+        try:
+            asyncio.run(serve_async(host, args.port))
+        except KeyboardInterrupt:
+            pass
+        finally:
+            print(host.report())
+            host.save_replays()
+    else:
+        serve(args.port, args.map_size, args.tick_rate, args.binary_keyframes, args.record,
+              fog=not args.no_fog)
+
+
+if __name__ == "__main__":
+    main()
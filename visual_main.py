@@ -1,16 +1,20 @@
 import pygame
+import argparse
+import os
+import random
 import sys
-import math
+import time
 from collections import deque
 
 from game.game_logic import Game
-from game.unit import create_soldier, create_setpoint, create_medical
+from game.geometry import HexLayout
+from game.rules import can_place_unit_on_tile
+from game.unit import create_soldier
 
 # ================== 화면/상수 ==================
 SCREEN_WIDTH, SCREEN_HEIGHT = 1200, 800
 FPS = 60
 HEX_SIZE = 28
-SQRT3 = math.sqrt(3)
 
 COLOR_BG = (35, 36, 40)
 COLOR_GRID = (92, 96, 105)
@@ -27,7 +31,9 @@ COLOR_ERR = (255, 80, 80)
 COLOR_OK = (140, 220, 140)
 COLOR_CAPTURE = (255, 230, 120)
 
-STEP_TIME = 0.4          # 적 진영으로 들어갈 때 한 칸 이동 시간(초)
+MAP_ORIGIN = (SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 + 20)
+HUD_PANEL_SIZE = (640, 320)
+
 CAPTURE_TIME = 8.0       # 적/아군 타일 점령에 필요한 시간(초)
 
 # ================== 폰트 ==================
@@ -50,111 +56,147 @@ def load_korean_font(size=20):
         return pygame.font.SysFont(None, size)
 
 # ================== 좌표/도형 ==================
-def axial_to_pixel(q, r, size=HEX_SIZE, origin=(SCREEN_WIDTH//2, SCREEN_HEIGHT//2)):
-    ox, oy = origin
-    x = size * 1.5 * q
-    y = size * (SQRT3 * (r + q/2))
-    return int(ox + x), int(oy + y)
-
-def hex_polygon(cx, cy, size=HEX_SIZE):
-    pts = []
-    for i in range(6):
-        ang = math.radians(60 * i - 30)  # pointy-top
-        pts.append((cx + size * math.cos(ang), cy + size * math.sin(ang)))
-    return pts
-
-def nearest_tile_from_pos(game, pos, origin):
-    mx, my = pos
-    best = None
-    best_d2 = 1e18
-    for (q, r), tile in game.map.tiles.items():
-        cx, cy = axial_to_pixel(q, r, origin=origin)
-        d2 = (mx - cx) ** 2 + (my - cy) ** 2
-        if d2 < best_d2:
-            best_d2 = d2
-            best = tile
-    return best
-
-def hex_neighbors(game, q, r):
-    return game.map.neighbors(q, r)
-
-def hex_distance(q1, r1, q2, r2):
-    dq = q1 - q2
-    dr = r1 - r2
-    ds = -(q1 + r1) - (-(q2 + r2))
-    return max(abs(dq), abs(dr), abs(ds))
-
-def draw_panel(surface, x, y, w, h, color_rgba):
-    panel = pygame.Surface((w, h), pygame.SRCALPHA)
-    pygame.draw.rect(panel, color_rgba, (0, 0, w, h), border_radius=12)
-    surface.blit(panel, (x, y))
-
-# ================== BFS (좌표 튜플 기반) ==================
-def bfs_path(game, start_tile, goal_tile):
-    start = (start_tile.q, start_tile.r)
-    goal = (goal_tile.q, goal_tile.r)
-    if start == goal:
-        return [start_tile]
-
-    q = deque([start])
-    prev = {start: None}
-    while q:
-        cq, cr = q.popleft()
-        for nb in game.map.neighbors(cq, cr):
-            key = (nb.q, nb.r)
-            if key in prev:
-                continue
-            # 중간 칸은 비어 있어야 통과 (목표 칸은 key==goal일 때만 예외)
-            if nb.unit is not None and key != goal:
-                continue
-            prev[key] = (cq, cr)
-            if key == goal:
-                # 경로 복원
-                path_coords = []
-                cur = goal
-                while cur is not None:
-                    path_coords.append(cur)
-                    cur = prev[cur]
-                path_coords.reverse()
-                return [game.map.get_tile(q, r) for (q, r) in path_coords]
-            q.append(key)
-    return None
-
-# ================== 규칙/도우미 ==================
-def find_pinpoint_tile(game, owner='ally'):
-    for t in game.map.tiles.values():
-        if t.unit and t.unit.is_pinpoint and t.unit.owner == owner:
-            return t
-    return None
-
-def recompute_boundaries(game):
-    for tile in game.map.tiles.values():
-        tile.boundary = False
-    for (q, r), tile in game.map.tiles.items():
-        for nb in game.map.neighbors(q, r):
-            if nb.owner != tile.owner:
-                tile.boundary = True
-                break
-
-def can_place_unit_on_tile(game, unit, tile):
-    if tile.unit is not None:
-        return False, "이미 유닛이 있습니다."
-    if tile.owner != unit.owner:
-        return False, "해당 진영 타일에만 설치할 수 있습니다."
-    for nb in game.map.neighbors(tile.q, tile.r):
-        if nb.unit and nb.unit.is_pinpoint and unit.name != "Soldier":
-            return False, "핀포인트 인접 타일에는 병 유닛만 설치 가능."
-    if unit.is_setpoint:
-        pp = find_pinpoint_tile(game, owner=unit.owner)
-        if not pp:
-            return False, "핀포인트를 찾을 수 없습니다."
-        if hex_distance(tile.q, tile.r, pp.q, pp.r) > 4:
-            return False, "셋포인트는 핀포인트로부터 4칸 이내에만 설치 가능."
-    if unit.is_medical:
-        for t in game.map.tiles.values():
-            if t.unit and t.unit.is_medical and t.unit.owner == unit.owner:
-                return False, "보건소는 각 진영 1개만 설치 가능."
-    return True, "설치 가능"
+def nearest_tile_from_pos(game, pos, layout):
+    """화면 좌표 → 타일 (큐브 반올림, 맵 밖이면 None)."""
+    qr = layout.pick(pos)
+    return game.map.get_tile(*qr) if qr is not None else None
+
+# ================== 렌더러 ==================
+class MapRenderer:
+    """
+    정적 레이어(배경/진영 채우기/그리드/경계/금광)를 한 장의 Surface에 구워 두고
+    game.map.version(소유/경계 변경)이 바뀔 때만 다시 굽는다.
+    매 프레임에는 지난 프레임에 동적 요소(유닛/점령 링/하이라이트/HUD/토스트)가
+    그려졌던 영역만 정적 레이어로 되돌린 뒤 다시 그리고, 바뀐 사각형만 화면에 올린다.
+    """
+    TEXT_CACHE_MAX = 256
+
+    def __init__(self, screen, layout, font, font_small):
+        self.screen = screen
+        self.layout = layout
+        self.font = font
+        self.font_small = font_small
+        self.static = pygame.Surface(screen.get_size()).convert()
+        self._version = None
+        self._dirty = []          # 지난 프레임 동적 요소 영역
+        self._text = {}
+        self._panels = {}
+        self.bakes = 0
+        # 반투명 채우기용 작업 판: 폴리곤을 원래 화면 좌표에 그려 그 영역만 옮기고 지운다
+        # (타일마다 전체 화면 Surface를 새로 만들던 것과 픽셀 단위로 같은 결과).
+        self._scratch = pygame.Surface(screen.get_size(), pygame.SRCALPHA)
+
+    # ----- 캐시 -----
+    def center(self, q, r):
+        return self.layout.center(q, r)
+
+    def poly(self, q, r):
+        return self.layout.polygon(q, r, 1)
+
+    def sel_poly(self, q, r):
+        return self.layout.polygon(q, r, 3)
+
+    def text(self, font, msg, color):
+        key = (id(font), msg, color)
+        surf = self._text.get(key)
+        if surf is None:
+            if len(self._text) >= self.TEXT_CACHE_MAX:
+                self._text.clear()
+            surf = self._text[key] = font.render(msg, True, color)
+        return surf
+
+    def panel(self, w, h, color_rgba):
+        key = (w, h, color_rgba)
+        surf = self._panels.get(key)
+        if surf is None:
+            surf = self._panels[key] = pygame.Surface((w, h), pygame.SRCALPHA)
+            pygame.draw.rect(surf, color_rgba, (0, 0, w, h), border_radius=12)
+        return surf
+
+    # ----- 정적 레이어 -----
+    def bake(self, game):
+        s = self.static
+        s.fill(COLOR_BG)
+        scratch = self._scratch
+        for (q, r), tile in game.map.tiles.items():
+            poly = self.poly(q, r)
+            fill = COLOR_ALLY if tile.owner == 'ally' else COLOR_ENEMY
+            rect = pygame.draw.polygon(scratch, (*fill, 42), poly)
+            s.blit(scratch, rect, rect)
+            scratch.fill((0, 0, 0, 0), rect)
+            pygame.draw.polygon(s, COLOR_GRID, poly, 1)
+        for owner in game.players:
+            for tile in game.map.boundary_tiles(owner):
+                pygame.draw.polygon(s, COLOR_BOUNDARY, self.poly(tile.q, tile.r), 2)
+        for tile in game.map.gold_tiles:
+            pygame.draw.circle(s, COLOR_GOLD, self.center(tile.q, tile.r), HEX_SIZE // 3)
+        self._version = game.map.version
+        self.bakes += 1
+
+    # ----- 프레임 -----
+    def draw(self, game, capture_states, hover, selected_tile, hud_lines, toasts, panel_size):
+        screen = self.screen
+        full = game.map.version != self._version
+        if full:
+            self.bake(game)
+            screen.blit(self.static, (0, 0))
+        else:
+            for rect in self._dirty:
+                screen.blit(self.static, rect, rect)
+
+        rects = []
+        font_small = self.font_small
+
+        # 금광 쿨다운 / 유닛
+        for tile in game.map.gold_tiles:
+            cd_left = game.gold_cooldown_left(tile)
+            if cd_left > 0:
+                cx, cy = self.center(tile.q, tile.r)
+                cd = self.text(font_small, f"{cd_left:.0f}s", COLOR_TEXT)
+                rects.append(screen.blit(cd, (cx - cd.get_width() // 2, cy - HEX_SIZE)))
+        for tile in game.map.tiles.values():
+            u = tile.unit
+            if u:
+                c = self.center(tile.q, tile.r)
+                if u.is_pinpoint:
+                    col = COLOR_PINPOINT_ALLY if u.owner == 'ally' else COLOR_PINPOINT_ENEMY
+                    rects.append(pygame.draw.circle(screen, col, c, HEX_SIZE // 2))
+                else:
+                    rects.append(pygame.draw.circle(screen, COLOR_TEXT, c, HEX_SIZE // 3, 2))
+
+        # 점령 진행 링
+        for (q, r), state in capture_states.items():
+            cx, cy = self.center(q, r)
+            rects.append(pygame.draw.circle(screen, COLOR_CAPTURE, (cx, cy), HEX_SIZE - 4, 3))
+            txt = self.text(font_small, f"{state['remain']:.1f}s", COLOR_CAPTURE)
+            rects.append(screen.blit(txt, (cx - txt.get_width() // 2, cy - HEX_SIZE)))
+
+        # 하이라이트
+        if hover:
+            rects.append(pygame.draw.polygon(screen, COLOR_HL, self.poly(hover.q, hover.r), 2))
+        if selected_tile:
+            rects.append(pygame.draw.polygon(screen, COLOR_OK,
+                                             self.sel_poly(selected_tile.q, selected_tile.r), 3))
+
+        # HUD
+        panel_w, panel_h = panel_size
+        rects.append(screen.blit(self.panel(panel_w, panel_h, COLOR_PANEL), (12, 12)))
+        y = 24
+        for ln in hud_lines:
+            rects.append(screen.blit(self.text(self.font, ln, COLOR_TEXT), (28, y))); y += 26
+
+        # 토스트
+        base_y = panel_h + 24
+        for i, (msg, ts, ok) in enumerate(toasts):
+            col = COLOR_OK if ok else COLOR_ERR
+            rects.append(screen.blit(self.text(font_small, ("✔ " if ok else "✖ ") + msg, col),
+                                     (28, base_y + i * 22)))
+
+        if full:
+            pygame.display.flip()
+        else:
+            pygame.display.update(self._dirty + rects)
+        self._dirty = rects
 
 # ================== 메인 ==================
 def main():
@@ -167,7 +209,8 @@ def main():
     font_small = load_korean_font(18)
 
     game = Game()
-    origin = (SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 + 20)
+    layout = HexLayout(HEX_SIZE, MAP_ORIGIN, radius=game.map.size)
+    renderer = MapRenderer(screen, layout, font, font_small)
 
     # 인벤토리: 양 진영 분리
     reserve = {
@@ -179,8 +222,6 @@ def main():
 
     # 지도 위 유닛 선택/이동 (진영별)
     selected_unit_tile = None          # 현재 조종 진영의 선택된 병 유닛이 있는 타일
-    active_moves = []                  # 진행 중 이동: dict(path, idx, acc, unit)
-    capture_states = {}                # {(q,r): {"owner":"ally"|"enemy","remain":float,"unit_id":id(unit)}}
 
     # 토스트 메시지
     toasts = deque(maxlen=6)
@@ -242,7 +283,7 @@ def main():
                         toast(str(e), False)
 
             elif event.type == pygame.MOUSEBUTTONDOWN:
-                mouse_tile = nearest_tile_from_pos(game, pygame.mouse.get_pos(), origin)
+                mouse_tile = nearest_tile_from_pos(game, pygame.mouse.get_pos(), layout)
                 if not mouse_tile:
                     continue
 
@@ -252,7 +293,8 @@ def main():
                         selected_unit_tile = None
                         toast("선택 해제", True)
                     elif mouse_tile.unit and mouse_tile.unit.owner == control_side and not mouse_tile.unit.is_pinpoint:
-                        u = mouse_tile.unit; mouse_tile.unit = None
+                        u = mouse_tile.remove_unit()
+                        game.moves.cancel(u)
                         if u.is_setpoint: reserve[control_side]["setpoint"].append(u)
                         elif u.is_medical: reserve[control_side]["medical"].append(u)
                         else: reserve[control_side]["soldier"].append(u)
@@ -275,22 +317,16 @@ def main():
 
                         # 같은 진영 내부 이동은 순간이동
                         if mouse_tile.owner == control_side and selected_unit_tile.owner == control_side:
-                            mouse_tile.unit = soldier
-                            selected_unit_tile.unit = None
+                            game.moves.cancel(soldier)
+                            mouse_tile.place_unit(selected_unit_tile.remove_unit())
                             selected_unit_tile = mouse_tile
                             toast("순간이동 완료", True)
                         else:
-                            path = bfs_path(game, selected_unit_tile, mouse_tile)
+                            path = game.paths.find_path(selected_unit_tile, mouse_tile)
                             if not path:
                                 toast("경로가 없습니다.", False)
                             else:
-                                active_moves.append({
-                                    "path": path,
-                                    "idx": 0,
-                                    "acc": 0.0,
-                                    "unit": soldier
-                                })
-                                selected_unit_tile.unit = None
+                                game.moves.start(soldier, path)
                                 selected_unit_tile = None
                                 toast("이동 시작", True)
                         continue
@@ -320,120 +356,24 @@ def main():
                         toast(f"[{control_side}] {candidate.name} 설치 완료", True)
 
         # ===== 이동 업데이트 =====
-        for mv in list(active_moves):
-            mv["acc"] += dt
-            idx = mv["idx"]
-            path = mv["path"]
-            if idx == 0 and path[0].unit is None:
-                path[0].unit = mv["unit"]
-
-            while mv["acc"] >= STEP_TIME:
-                mv["acc"] -= STEP_TIME
-                if mv["idx"] + 1 < len(path):
-                    cur = path[mv["idx"]]
-                    nxt = path[mv["idx"] + 1]
-                    if nxt.unit is not None:
-                        toast("이동이 차단되었습니다.", False)
-                        active_moves.remove(mv)
-                        break
-                    nxt.unit = cur.unit
-                    cur.unit = None
-                    mv["idx"] += 1
-                else:
-                    active_moves.remove(mv)
-                    break
+        game.moves.update(dt)
+        if game.moves.stopped:
+            toast("이동이 차단되었습니다.", False)
 
-        # ===== 점령 로직 (양 진영 공통) =====
-        # 진행 중 상태 업데이트
-        remove_keys = []
-        for (q, r), state in capture_states.items():
-            tile = game.map.get_tile(q, r)
-            unit = tile.unit
-            if not unit or unit.name != "Soldier" or unit.owner != state["owner"]:
-                remove_keys.append((q, r))
-                continue
-            state["remain"] -= dt
-            if state["remain"] <= 0:
-                tile.owner = state["owner"]
-                remove_keys.append((q, r))
-                recompute_boundaries(game)
-                toast(f"타일(q={q}, r={r}) {state['owner']} 점령 완료!", True)
-        for k in remove_keys:
-            capture_states.pop(k, None)
-
-        # 새로 점령 시작/취소 판정
-        for tile in game.map.tiles.values():
-            if tile.unit and tile.unit.name == "Soldier" and tile.owner != tile.unit.owner:
-                key = (tile.q, tile.r)
-                if key not in capture_states:
-                    capture_states[key] = {"owner": tile.unit.owner, "remain": CAPTURE_TIME, "unit_id": id(tile.unit)}
-            else:
-                capture_states.pop((tile.q, tile.r), None)
+        # ===== 점령 (양 진영 공통) =====
+        game.captures.update(dt)
+        for tile, owner in game.captures.completed:
+            toast(f"타일(q={tile.q}, r={tile.r}) {owner} 점령 완료!", True)
 
         # ===== 렌더 =====
-        screen.fill(COLOR_BG)
-        mouse_pos = pygame.mouse.get_pos()
-        hover = nearest_tile_from_pos(game, mouse_pos, origin)
-
-        # 타일/그리드
-        for (q, r), tile in game.map.tiles.items():
-            cx, cy = axial_to_pixel(q, r, origin=origin)
-            poly = hex_polygon(cx, cy, HEX_SIZE - 1)
-            fill = COLOR_ALLY if tile.owner == 'ally' else COLOR_ENEMY
-            fill_surface = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.SRCALPHA)
-            pygame.draw.polygon(fill_surface, (*fill, 42), poly)
-            screen.blit(fill_surface, (0, 0))
-            pygame.draw.polygon(screen, COLOR_GRID, poly, 1)
-
-        # 경계 강조
-        for tile in game.map.tiles.values():
-            if tile.boundary:
-                cx, cy = axial_to_pixel(tile.q, tile.r, origin=origin)
-                pygame.draw.polygon(screen, COLOR_BOUNDARY, hex_polygon(cx, cy, HEX_SIZE - 1), 2)
-
-        # 금광/유닛
-        for tile in game.map.tiles.values():
-            cx, cy = axial_to_pixel(tile.q, tile.r, origin=origin)
-            if tile.terrain == 'gold':
-                pygame.draw.circle(screen, COLOR_GOLD, (cx, cy), HEX_SIZE // 3)
-                if tile.gold_cooldown > 0:
-                    cd = font_small.render(f"{tile.gold_cooldown}s", True, COLOR_TEXT)
-                    screen.blit(cd, (cx - cd.get_width() // 2, cy - HEX_SIZE))
-            if tile.unit:
-                if tile.unit.is_pinpoint:
-                    col = COLOR_PINPOINT_ALLY if tile.unit.owner == 'ally' else COLOR_PINPOINT_ENEMY
-                    pygame.draw.circle(screen, col, (cx, cy), HEX_SIZE // 2)
-                else:
-                    pygame.draw.circle(screen, COLOR_TEXT, (cx, cy), HEX_SIZE // 3, 2)
-
-        # 점령 진행 링
-        for (q, r), state in capture_states.items():
-            cx, cy = axial_to_pixel(q, r, origin=origin)
-            pygame.draw.circle(screen, COLOR_CAPTURE, (cx, cy), HEX_SIZE - 4, 3)
-            txt = font_small.render(f"{state['remain']:.1f}s", True, COLOR_CAPTURE)
-            screen.blit(txt, (cx - txt.get_width() // 2, cy - HEX_SIZE))
-
-        # 하이라이트
-        if hover:
-            cx, cy = axial_to_pixel(hover.q, hover.r, origin=origin)
-            pygame.draw.polygon(screen, COLOR_HL, hex_polygon(cx, cy, HEX_SIZE - 1), 2)
-        if selected_unit_tile:
-            cx, cy = axial_to_pixel(selected_unit_tile.q, selected_unit_tile.r, origin=origin)
-            pygame.draw.polygon(screen, COLOR_OK, hex_polygon(cx, cy, HEX_SIZE - 3), 3)
-
-        # HUD
-        panel_w, panel_h = 640, 320
-        draw_panel(screen, 12, 12, panel_w, panel_h, COLOR_PANEL)
-
-        ally_money = game.players['ally'].money
-        enemy_money = game.players['enemy'].money
+        hover = nearest_tile_from_pos(game, pygame.mouse.get_pos(), layout)
 
         inv = reserve[control_side]
         inv_s = len(inv["soldier"]); inv_t = len(inv["setpoint"]); inv_m = len(inv["medical"])
 
         lines = [
             f"[CTRL] 조종 진영: {control_side.upper()}  |  (TAB으로 전환)",
-            f"ALLY MONEY: {ally_money}   ENEMY MONEY: {enemy_money}",
+            f"ALLY MONEY: {game.players['ally'].money}   ENEMY MONEY: {game.players['enemy'].money}",
             f"현재 진영 예비: 병 {inv_s} / 셋포인트 {inv_t} / 보건소 {inv_m}",
             f"선택 유형: { {'soldier':'병', 'setpoint':'셋포인트', 'medical':'보건소'}[selected_type] }",
             "",
@@ -443,20 +383,61 @@ def main():
             "G: 금광 수급(현재 진영)   SPACE: 1초 경과   T: 12초 경과   ESC: 종료",
             "병 이동: 아군→아군 즉시 / 적 진영 연속 이동, 적/아군 타일 8초 점령",
         ]
-        y = 24
-        for ln in lines:
-            screen.blit(font.render(ln, True, COLOR_TEXT), (28, y)); y += 26
-
-        # 토스트
-        base_y = panel_h + 24
-        for i, (msg, ts, ok) in enumerate(toasts):
-            col = COLOR_OK if ok else COLOR_ERR
-            screen.blit(font_small.render(("✔ " if ok else "✖ ") + msg, True, col), (28, base_y + i * 22))
-
-        pygame.display.flip()
+        renderer.draw(game, game.captures.states, hover, selected_unit_tile, lines, toasts, HUD_PANEL_SIZE)
 
     pygame.quit()
     sys.exit()
 
+# ================== 프레임 시간 벤치마크 ==================
+def bench_render(frames=600, map_size=6, seed=0):
+    """
+    창 없이(SDL dummy 드라이버) MapRenderer 프레임 시간을 잰다.
+    병 유닛/점령 링/토스트를 띄우고 60프레임마다 타일 소유를 바꿔 재굽기도 포함한다.
+    """
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    pygame.init()
+    screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+    font, font_small = load_korean_font(22), load_korean_font(18)
+
+    game = Game(map_size=map_size, seed=seed)
+    rng = random.Random(seed)
+    tiles = list(game.map.tiles.values())
+    for t in tiles:
+        if t.unit is None and rng.random() < 0.3:
+            t.place_unit(create_soldier(rng.choice(("ally", "enemy"))))
+    capture_states = {(t.q, t.r): {"owner": t.unit.owner, "remain": CAPTURE_TIME}
+                      for t in game.map.unit_index.tiles_of_name("Soldier")
+                      if t.unit.owner != t.owner}
+    toasts = deque([(f"toast {i}", 0, i % 2 == 0) for i in range(6)], maxlen=6)
+    renderer = MapRenderer(screen, HexLayout(HEX_SIZE, MAP_ORIGIN, radius=map_size), font, font_small)
+
+    times = []
+    for i in range(frames):
+        if i % 60 == 59:
+            t = rng.choice(tiles)
+            game.map.set_owner(t, "enemy" if t.owner == "ally" else "ally")
+        for state in capture_states.values():
+            state["remain"] = max(0.0, state["remain"] - 1.0 / FPS)
+        hover = tiles[i % len(tiles)]
+        lines = [f"frame {i}", f"ALLY MONEY: {game.players['ally'].money}"]
+        t0 = time.perf_counter()
+        renderer.draw(game, capture_states, hover, None, lines, toasts, HUD_PANEL_SIZE)
+        times.append(time.perf_counter() - t0)
+    pygame.quit()
+
+    times.sort()
+    pct = lambda p: times[min(len(times) - 1, int(len(times) * p / 100))] * 1000
+    print(f"[RENDER] map_size={map_size} tiles={len(tiles)} frames={frames} bakes={renderer.bakes} "
+          f"p50={pct(50):.3f}ms p95={pct(95):.3f}ms p99={pct(99):.3f}ms max={times[-1] * 1000:.3f}ms")
+    return times
+
 if __name__ == "__main__":
-    main()
+    ap = argparse.ArgumentParser(description="국가전쟁 로컬 시각화")
+    ap.add_argument("--bench-frames", type=int, default=0,
+                    help="N>0 이면 창 없이 N프레임 렌더링 시간을 측정하고 종료")
+    ap.add_argument("--map-size", type=int, default=6)
+    args = ap.parse_args()
+    if args.bench_frames > 0:
+        bench_render(args.bench_frames, args.map_size)
+    else:
+        main()